@@ -123,6 +123,12 @@ status_daemon() {
 
             if echo "${PING_RESULT}" | grep -q "PONG"; then
                 echo "✅ Daemon respondiendo correctamente"
+                STATUS_RESULT=$("${VENV_PYTHON}" -c "import asyncio; from v2m.client import send_command; print(asyncio.run(send_command('STATUS')))" 2>&1)
+                if echo "${STATUS_RESULT}" | grep -q "READY"; then
+                    echo "✅ Modelos cargados y calentados"
+                else
+                    echo "⏳ Calentando modelos (${STATUS_RESULT})"
+                fi
             else
                 echo "⚠️  Daemon no responde a PING:"
                 echo "${PING_RESULT}"
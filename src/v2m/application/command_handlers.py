@@ -11,15 +11,64 @@ y la lógica de negocio real
 """
 
 import asyncio
-from typing import Type
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Set, Type
 from v2m.core.cqrs.command import Command
 from v2m.core.cqrs.command_handler import CommandHandler
-from v2m.application.commands import StartRecordingCommand, StopRecordingCommand, ProcessTextCommand
+from v2m.application.commands import StartRecordingCommand, StopRecordingCommand, ProcessTextCommand, RecoverRecordingCommand, TranscribeFileCommand, RetranscribeCommand
 from v2m.application.transcription_service import TranscriptionService
+from v2m.application.transcription_scheduler import Priority, TranscriptionScheduler
 from v2m.application.llm_service import LLMService
 from v2m.core.interfaces import NotificationInterface, ClipboardInterface
+from v2m.core.logging import logger
 from v2m.config import config
 
+async def _run_transcription(
+    scheduler: Optional[TranscriptionScheduler],
+    fn: Callable[..., Any],
+    *args,
+    priority: Priority = Priority.INTERACTIVE,
+    bounded: bool = True,
+) -> Any:
+    """
+    ejecuta una transcripción bloqueante en el planificador o en un hilo si no hay
+
+    args:
+        scheduler: planificador de trabajos de transcripción (opcional)
+        fn: función bloqueante del servicio de transcripción
+        priority: prioridad del trabajo en la cola
+        bounded: false no rechaza el trabajo con la cola llena
+
+    returns:
+        el valor devuelto por `fn`
+    """
+    if scheduler is None:
+        return await asyncio.to_thread(fn, *args)
+    return await scheduler.submit(fn, *args, priority=priority, bounded=bounded)
+
+async def _replace_if_unchanged(clipboard_service: ClipboardInterface, expected: str, replacement: str) -> bool:
+    """
+    sustituye el portapapeles solo si todavía contiene el texto esperado
+
+    si el usuario copió otra cosa o empezó otro dictado no se toca la
+    comparación ignora los saltos de línea finales que añaden algunos
+    backends al pegar (`wl-paste` sin `-n`)
+
+    args:
+        clipboard_service: el servicio para interactuar con el portapapeles
+        expected: el texto que se copió antes
+        replacement: el texto que lo sustituye
+
+    returns:
+        true si se sustituyó
+    """
+    current = await asyncio.to_thread(clipboard_service.paste)
+    if (current or "").rstrip("\r\n") != expected.rstrip("\r\n"):
+        logger.info("el portapapeles cambió desde la primera copia no se sustituye")
+        return False
+    clipboard_service.copy(replacement)
+    return True
+
 class StartRecordingHandler(CommandHandler):
     """
     manejador para el comando `StartRecordingCommand`
@@ -70,8 +119,19 @@ class StopRecordingHandler(CommandHandler):
 
     este handler detiene la grabación obtiene la transcripción del audio
     la copia al portapapeles y notifica al usuario del resultado
+
+    con `dispatch` (`whisper.delivery.llm`) la transcripción definitiva se
+    envía al LLM justo después de copiarla así el resultado refinado nunca
+    queda tapado por la copia del texto original
     """
-    def __init__(self, transcription_service: TranscriptionService, notification_service: NotificationInterface, clipboard_service: ClipboardInterface) -> None:
+    def __init__(
+        self,
+        transcription_service: TranscriptionService,
+        notification_service: NotificationInterface,
+        clipboard_service: ClipboardInterface,
+        scheduler: Optional[TranscriptionScheduler] = None,
+        dispatch: Optional[Callable[[Command], Awaitable[Any]]] = None,
+    ) -> None:
         """
         inicializa el handler con sus dependencias
 
@@ -79,10 +139,29 @@ class StopRecordingHandler(CommandHandler):
             transcription_service: el servicio responsable de la grabación y transcripción
             notification_service: el servicio para enviar notificaciones al usuario
             clipboard_service: el servicio para interactuar con el portapapeles
+            scheduler: planificador que ordena las transcripciones concurrentes
+            dispatch: despacha `processtextcommand` por el bus (none no refina con el LLM)
         """
         self.transcription_service = transcription_service
         self.notification_service = notification_service
         self.clipboard_service = clipboard_service
+        self.scheduler = scheduler
+        self.dispatch = dispatch
+        # referencias a las pasadas de refinado en curso para que no las recoja el gc
+        self._refine_tasks: Set[asyncio.Task] = set()
+
+    def _spawn(self, coro: Awaitable[Any]) -> None:
+        """lanza una tarea de fondo conservando su referencia hasta que termine"""
+        task = asyncio.ensure_future(coro)
+        self._refine_tasks.add(task)
+        task.add_done_callback(self._refine_tasks.discard)
+
+    def _send_to_llm(self, text: str) -> None:
+        """envía la transcripción ya copiada al LLM sin esperar al refinado"""
+        if self.dispatch is None:
+            return
+        logger.info("enviando la transcripción al LLM")
+        self._spawn(self.dispatch(ProcessTextCommand(text)))
 
     async def handle(self, command: StopRecordingCommand) -> None:
         """
@@ -100,8 +179,12 @@ class StopRecordingHandler(CommandHandler):
 
         self.notification_service.notify("⚡ V2M Processing", "Procesando...")
 
-        # la transcripción es pesada (CPU/GPU bound) debe correr en un hilo aparte
-        transcription = await asyncio.to_thread(self.transcription_service.stop_and_transcribe)
+        # el micrófono se detiene ya aunque los trabajadores estén ocupados
+        transcribe = await asyncio.to_thread(self.transcription_service.stop_recording)
+
+        # la transcripción es pesada (CPU/GPU bound) se encola como trabajo interactivo
+        # fuera del límite de la cola un rechazo perdería el dictado ya grabado
+        transcription, refine = await _run_transcription(self.scheduler, transcribe, bounded=False)
 
         # si la transcripción está vacía no tiene sentido copiarla
         if not transcription.strip():
@@ -110,7 +193,41 @@ class StopRecordingHandler(CommandHandler):
 
         self.clipboard_service.copy(transcription)
         preview = transcription[:80] # se muestra una vista previa para no saturar la notificación
-        self.notification_service.notify(f"✅ Whisper - Copiado", f"{preview}...")
+        if refine is None:
+            self.notification_service.notify(f"✅ Whisper - Copiado", f"{preview}...")
+            self._send_to_llm(transcription)
+            return
+
+        # el borrador ya está en el portapapeles la pasada completa no bloquea la respuesta
+        self.notification_service.notify(f"📝 Whisper - Borrador copiado", f"{preview}...")
+        self._spawn(self._replace_draft(transcription, refine))
+
+    async def _replace_draft(self, draft: str, refine: Callable[[], str]) -> None:
+        """
+        sustituye el borrador del portapapeles por la transcripción definitiva
+
+        si el portapapeles ya no contiene el borrador (el usuario copió otra
+        cosa o empezó otro dictado) no se toca
+
+        args:
+            draft: el texto provisional copiado
+            refine: función bloqueante que devuelve la transcripción definitiva
+        """
+        try:
+            # el borrador ya está entregado el refinado no debe retrasar el siguiente dictado
+            final = await _run_transcription(self.scheduler, refine, priority=Priority.BACKGROUND)
+        except Exception as e:
+            logger.error(f"fallo en la pasada de refinado se conserva el borrador {e}")
+            self._send_to_llm(draft)
+            return
+
+        if not final.strip() or final == draft:
+            self._send_to_llm(draft)
+            return
+
+        if await _replace_if_unchanged(self.clipboard_service, draft, final):
+            self.notification_service.notify("✅ Whisper - Refinado", f"{final[:80]}...")
+            self._send_to_llm(final)
 
     def listen_to(self) -> Type[Command]:
         """
@@ -121,14 +238,188 @@ class StopRecordingHandler(CommandHandler):
         """
         return StopRecordingCommand
 
+class RecoverRecordingHandler(CommandHandler):
+    """
+    manejador para el comando `RecoverRecordingCommand`
+
+    transcribe la grabación que quedó en el diario tras una caída del daemon
+    y copia el resultado al portapapeles igual que una parada normal
+    """
+    def __init__(
+        self,
+        transcription_service: TranscriptionService,
+        notification_service: NotificationInterface,
+        clipboard_service: ClipboardInterface,
+        scheduler: Optional[TranscriptionScheduler] = None,
+    ) -> None:
+        """
+        inicializa el handler con sus dependencias
+
+        args:
+            transcription_service: el servicio responsable de la grabación y transcripción
+            notification_service: el servicio para enviar notificaciones al usuario
+            clipboard_service: el servicio para interactuar con el portapapeles
+            scheduler: planificador que ordena las transcripciones concurrentes
+        """
+        self.transcription_service = transcription_service
+        self.notification_service = notification_service
+        self.clipboard_service = clipboard_service
+        self.scheduler = scheduler
+
+    async def handle(self, command: RecoverRecordingCommand) -> None:
+        """
+        ejecuta la lógica para transcribir la grabación recuperada
+
+        args:
+            command: el comando que activa este handler
+        """
+        self.notification_service.notify("⚡ V2M Processing", "Recuperando grabación...")
+
+        transcription = await _run_transcription(self.scheduler, self.transcription_service.transcribe_recovered)
+
+        if not transcription.strip():
+            self.notification_service.notify("❌ Whisper", "No se detectó voz en la grabación recuperada")
+            return
+
+        self.clipboard_service.copy(transcription)
+        self.notification_service.notify("✅ Whisper - Recuperado", f"{transcription[:80]}...")
+
+    def listen_to(self) -> Type[Command]:
+        """
+        se suscribe al tipo de comando `RecoverRecordingCommand`
+
+        returns:
+            el tipo de comando que este handler puede manejar
+        """
+        return RecoverRecordingCommand
+
+class RetranscribeHandler(CommandHandler):
+    """
+    manejador para el comando `RetranscribeCommand`
+
+    vuelve a transcribir una grabación conservada y copia el resultado al
+    portapapeles igual que una parada normal
+    """
+    def __init__(
+        self,
+        transcription_service: TranscriptionService,
+        notification_service: NotificationInterface,
+        clipboard_service: ClipboardInterface,
+        scheduler: Optional[TranscriptionScheduler] = None,
+    ) -> None:
+        """
+        inicializa el handler con sus dependencias
+
+        args:
+            transcription_service: el servicio responsable de la transcripción
+            notification_service: el servicio para enviar notificaciones al usuario
+            clipboard_service: el servicio para interactuar con el portapapeles
+            scheduler: planificador que ordena las transcripciones concurrentes
+        """
+        self.transcription_service = transcription_service
+        self.notification_service = notification_service
+        self.clipboard_service = clipboard_service
+        self.scheduler = scheduler
+
+    async def handle(self, command: RetranscribeCommand) -> None:
+        """
+        ejecuta la retranscripción con prioridad interactiva el usuario espera el resultado
+
+        args:
+            command: el comando con la grabación y los parámetros a cambiar
+        """
+        self.notification_service.notify("⚡ V2M Processing", "Retranscribiendo...")
+
+        transcription = await _run_transcription(
+            self.scheduler, self.transcription_service.retranscribe,
+            command.index, command.beam_size, command.language, command.model,
+        )
+
+        if not transcription.strip():
+            self.notification_service.notify("❌ Whisper", "No se detectó voz en la grabación")
+            return
+
+        self.clipboard_service.copy(transcription)
+        self.notification_service.notify("✅ Whisper - Retranscrito", f"{transcription[:80]}...")
+
+    def listen_to(self) -> Type[Command]:
+        """
+        se suscribe al tipo de comando `RetranscribeCommand`
+
+        returns:
+            el tipo de comando que este handler puede manejar
+        """
+        return RetranscribeCommand
+
+class TranscribeFileHandler(CommandHandler):
+    """
+    manejador para el comando `TranscribeFileCommand`
+
+    transcribe un archivo como trabajo de fondo y guarda el texto junto a él
+    """
+    def __init__(
+        self,
+        transcription_service: TranscriptionService,
+        notification_service: NotificationInterface,
+        scheduler: Optional[TranscriptionScheduler] = None,
+    ) -> None:
+        """
+        inicializa el handler con sus dependencias
+
+        args:
+            transcription_service: el servicio responsable de la transcripción
+            notification_service: el servicio para enviar notificaciones al usuario
+            scheduler: planificador que ordena las transcripciones concurrentes
+        """
+        self.transcription_service = transcription_service
+        self.notification_service = notification_service
+        self.scheduler = scheduler
+
+    async def handle(self, command: TranscribeFileCommand) -> None:
+        """
+        ejecuta la transcripción del archivo con prioridad de fondo
+
+        args:
+            command: el comando con la ruta del archivo
+        """
+        source = Path(command.path).expanduser()
+        transcription = await _run_transcription(
+            self.scheduler, self.transcription_service.transcribe_file, str(source), priority=Priority.BACKGROUND
+        )
+
+        target = source.with_suffix(".txt")
+        await asyncio.to_thread(target.write_text, transcription, encoding="utf-8")
+        self.notification_service.notify("✅ Whisper - Archivo", f"{source.name} -> {target.name}")
+
+    def listen_to(self) -> Type[Command]:
+        """
+        se suscribe al tipo de comando `TranscribeFileCommand`
+
+        returns:
+            el tipo de comando que este handler puede manejar
+        """
+        return TranscribeFileCommand
+
 class ProcessTextHandler(CommandHandler):
     """
     manejador para el comando `ProcessTextCommand`
 
     este handler utiliza un servicio de LLM (large language model) para
     procesar y refinar un texto dado el resultado se copia al portapapeles
+
+    el refinado tiene un presupuesto de tiempo de extremo a extremo (intentos
+    y esperas entre reintentos incluidos) si se agota el texto original se
+    copia en el acto y opcionalmente el resultado tardío lo sustituye si el
+    portapapeles no cambió
     """
-    def __init__(self, llm_service: LLMService, notification_service: NotificationInterface, clipboard_service: ClipboardInterface) -> None:
+    def __init__(
+        self,
+        llm_service: LLMService,
+        notification_service: NotificationInterface,
+        clipboard_service: ClipboardInterface,
+        deadline_seconds: float = 0.0,
+        late_replace: bool = False,
+    ) -> None:
         """
         inicializa el handler con sus dependencias
 
@@ -136,10 +427,28 @@ class ProcessTextHandler(CommandHandler):
             llm_service: el servicio que interactúa con el LLM (ej gemini)
             notification_service: el servicio para enviar notificaciones al usuario
             clipboard_service: el servicio para interactuar con el portapapeles
+            deadline_seconds: presupuesto total del refinado (0 sin límite)
+            late_replace: un resultado posterior al plazo sustituye al texto original
         """
         self.llm_service = llm_service
         self.notification_service = notification_service
         self.clipboard_service = clipboard_service
+        self.deadline_seconds = deadline_seconds
+        self.late_replace = late_replace
+        # referencias a los refinados que siguen tras el plazo para que no los recoja el gc
+        self._late_tasks: Set[asyncio.Task] = set()
+
+    async def _refine(self, text: str) -> str:
+        # asumimos que llm_service.process_text será async pronto
+        # si no lo es asyncio.to_thread lo manejaría pero queremos async nativo
+        # por ahora usaremos await si es corutina o to_thread si no
+        if asyncio.iscoroutinefunction(self.llm_service.process_text):
+            return await self.llm_service.process_text(text)
+        return await asyncio.to_thread(self.llm_service.process_text, text)
+
+    def _copy_raw(self, text: str) -> None:
+        self.clipboard_service.copy(text)
+        self.notification_service.notify("✅ Whisper - Copiado (Raw)", f"{text[:80]}...")
 
     async def handle(self, command: ProcessTextCommand) -> None:
         """
@@ -148,23 +457,51 @@ class ProcessTextHandler(CommandHandler):
         args:
             command: el comando que contiene el texto a procesar
         """
+        task = asyncio.ensure_future(self._refine(command.text))
         try:
-            # asumimos que llm_service.process_text será async pronto
-            # si no lo es asyncio.to_thread lo manejaría pero queremos async nativo
-            # por ahora usaremos await si es corutina o to_thread si no
-            if asyncio.iscoroutinefunction(self.llm_service.process_text):
-                refined_text = await self.llm_service.process_text(command.text)
+            if self.deadline_seconds > 0:
+                # shield el plazo corta la espera no necesariamente el refinado
+                refined_text = await asyncio.wait_for(asyncio.shield(task), self.deadline_seconds)
             else:
-                refined_text = await asyncio.to_thread(self.llm_service.process_text, command.text)
+                refined_text = await task
 
             self.clipboard_service.copy(refined_text)
             self.notification_service.notify("✅ Gemini - Copiado", f"{refined_text[:80]}...")
 
+        except asyncio.TimeoutError:
+            logger.warning(f"el refinado superó el plazo de {self.deadline_seconds}s se copia el texto original")
+            self.notification_service.notify("⏱️ Gemini Lento", "Usando texto original...")
+            self._copy_raw(command.text)
+            if self.late_replace:
+                late = asyncio.create_task(self._replace_late(task, command.text))
+                self._late_tasks.add(late)
+                late.add_done_callback(self._late_tasks.discard)
+            else:
+                task.cancel()
+
         except Exception as e:
             # fallback si falla el llm copiamos el texto original
             self.notification_service.notify("⚠️ Gemini Falló", "Usando texto original...")
-            self.clipboard_service.copy(command.text)
-            self.notification_service.notify("✅ Whisper - Copiado (Raw)", f"{command.text[:80]}...")
+            self._copy_raw(command.text)
+
+    async def _replace_late(self, task: "asyncio.Future[str]", raw: str) -> None:
+        """
+        sustituye el texto original por el refinado que llegó tarde
+
+        si el portapapeles ya no contiene el texto original no se toca
+
+        args:
+            task: el refinado en curso
+            raw: el texto original copiado al agotarse el plazo
+        """
+        try:
+            refined = await task
+        except Exception as e:
+            logger.error(f"el refinado tardío falló se conserva el texto original {e}")
+            return
+
+        if await _replace_if_unchanged(self.clipboard_service, raw, refined):
+            self.notification_service.notify("✅ Gemini - Refinado (tarde)", f"{refined[:80]}...")
 
     def listen_to(self) -> Type[Command]:
         """
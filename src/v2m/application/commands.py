@@ -6,6 +6,7 @@ puede realizar estos objetos son despachados por el `commandbus` y no
 contienen lógica de negocio solo los datos necesarios para ejecutar la acción
 """
 
+from typing import Optional
 from v2m.core.cqrs.command import Command
 
 class StartRecordingCommand(Command):
@@ -26,6 +27,60 @@ class StopRecordingCommand(Command):
     """
     pass
 
+class TranscribeFileCommand(Command):
+    """
+    comando para transcribir un archivo de audio como trabajo de fondo
+
+    el resultado se guarda junto al archivo con extensión `.txt` el trabajo
+    tiene prioridad baja para no retrasar el dictado interactivo
+    """
+    def __init__(self, path: str) -> None:
+        """
+        inicializa el comando con la ruta del archivo
+
+        args:
+            path: ruta del archivo de audio (cualquier formato que decodifique `av`)
+        """
+        self.path = path
+
+class RetranscribeCommand(Command):
+    """
+    comando para volver a transcribir una grabación reciente con otros parámetros
+
+    el audio ya pasado por el VAD sigue en memoria así que no hay que volver
+    a dictar los parámetros que no se indican usan los de `config.toml`
+    """
+    def __init__(
+        self,
+        index: int = 0,
+        beam_size: Optional[int] = None,
+        language: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        """
+        inicializa el comando con los parámetros a cambiar
+
+        args:
+            index: 0 la última grabación 1 la anterior
+            beam_size: ancho de búsqueda
+            language: idioma forzado (ej `en`)
+            model: modelo a usar (ej `large-v3`)
+        """
+        self.index = index
+        self.beam_size = beam_size
+        self.language = language
+        self.model = model
+
+class RecoverRecordingCommand(Command):
+    """
+    comando para transcribir una grabación interrumpida por un fallo del daemon
+
+    cuando el diario de grabación está activo el audio de una sesión que no
+    llegó a transcribirse sigue en disco este comando lo transcribe y copia
+    el resultado al portapapeles
+    """
+    pass
+
 class ProcessTextCommand(Command):
     """
     comando para procesar y refinar un bloque de texto usando un LLM
@@ -27,3 +27,21 @@ class LLMService(ABC):
             el texto procesado y refinado por el LLM
         """
         raise NotImplementedError
+
+    def cache_identity(self) -> str:
+        """
+        describe todo lo que además del texto determina la respuesta
+
+        returns:
+            cadena con modelo parámetros y prompt que forma parte de la clave de caché
+        """
+        return type(self).__name__
+
+    def metrics(self) -> dict:
+        """
+        devuelve las métricas de latencia del servicio
+
+        returns:
+            diccionario serializable a json (vacío si el servicio no mide nada)
+        """
+        return {}
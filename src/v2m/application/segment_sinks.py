@@ -0,0 +1,33 @@
+"""
+módulo con los suscriptores de segmentos de la capa de aplicación
+
+reciben los segmentos de `segmentstream` a medida que WHISPER los decodifica
+para que el trabajo posterior empiece antes de que termine la transcripción
+"""
+
+from typing import List
+from v2m.core.interfaces import ClipboardInterface, SegmentSubscriber
+
+class ClipboardSegmentSink(SegmentSubscriber):
+    """
+    copia al portapapeles el texto acumulado tras cada segmento
+
+    en dictados largos permite pegar lo ya decodificado sin esperar al final
+    el texto final lo sigue copiando el handler de parada
+    """
+    def __init__(self, clipboard_service: ClipboardInterface) -> None:
+        """
+        args:
+            clipboard_service: el servicio para interactuar con el portapapeles
+        """
+        self.clipboard_service = clipboard_service
+        self._parts: List[str] = []
+
+    def on_segment(self, text: str) -> None:
+        if not text:
+            return
+        self._parts.append(text)
+        self.clipboard_service.copy(" ".join(self._parts))
+
+    def on_complete(self, text: str) -> None:
+        self._parts = []
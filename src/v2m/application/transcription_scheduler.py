@@ -0,0 +1,177 @@
+"""
+módulo que implementa el planificador de trabajos de transcripción
+
+antes cada handler llamaba a `asyncio.to_thread` por su cuenta y las
+transcripciones concurrentes (parada recuperación archivos refinado) competían
+sin orden por el mismo modelo el `transcriptionscheduler` las encola con
+prioridad y las reparte entre un pool de hilos de trabajo que se corresponde
+con las réplicas de CTranslate2 (`whisper.num_workers`)
+
+el dictado interactivo siempre se atiende antes que el trabajo de fondo y con
+`reserve_interactive` uno de los hilos solo atiende trabajos interactivos así
+un archivo largo en segundo plano nunca retrasa la siguiente parada
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, List, Optional
+from v2m.core.logging import logger
+from v2m.domain.errors import TranscriptionQueueFullError
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+class _Job:
+    """trabajo encolado"""
+    def __init__(self, name: str, priority: Priority, fn: Callable[..., Any], args: tuple) -> None:
+        self.name = name
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+class TranscriptionScheduler:
+    """
+    cola acotada con prioridades y pool de hilos de transcripción
+    """
+    def __init__(self, workers: int = 2, max_queue: int = 8, reserve_interactive: bool = True) -> None:
+        """
+        args:
+            workers: hilos de trabajo (igual o menor que `whisper.num_workers` para paralelismo real)
+            max_queue: trabajos en espera a partir de los que se rechazan nuevos
+            reserve_interactive: con más de un hilo uno solo atiende trabajos interactivos
+        """
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self._queues: Dict[Priority, Deque[_Job]] = {p: deque() for p in Priority}
+        self._cond = threading.Condition()
+        self._running = 0
+        # estadísticas de espera por prioridad (trabajos completados espera total espera máxima)
+        self._stats: Dict[Priority, List[float]] = {p: [0, 0.0, 0.0] for p in Priority}
+
+        reserved = 1 if reserve_interactive and self.workers > 1 else 0
+        self._threads = [
+            threading.Thread(target=self._work, args=(i < reserved,), name=f"v2m-transcriber-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def depth(self) -> int:
+        """trabajos en espera"""
+        return sum(len(q) for q in self._queues.values())
+
+    def submit_nowait(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        priority: Priority = Priority.INTERACTIVE,
+        name: Optional[str] = None,
+        bounded: bool = True,
+    ) -> Future:
+        """
+        encola un trabajo bloqueante
+
+        args:
+            fn: función a ejecutar en un hilo de trabajo
+            priority: prioridad del trabajo
+            name: nombre para logs (por defecto el de la función)
+            bounded: false lo encola aunque la cola esté llena (la parada del
+                dictado debe liberar el micrófono siempre)
+
+        returns:
+            un `future` con el resultado
+
+        raises:
+            transcriptionqueuefullerror: si la cola está llena
+        """
+        job = _Job(name or getattr(fn, "__name__", "job"), priority, fn, args)
+        with self._cond:
+            if bounded and self.depth >= self.max_queue:
+                raise TranscriptionQueueFullError(f"cola de transcripción llena ({self.max_queue} trabajos)")
+            self._queues[priority].append(job)
+            depth = self.depth
+            self._cond.notify_all()
+        logger.info(f"trabajo {job.name} encolado prioridad {priority.name.lower()} cola {depth}")
+        return job.future
+
+    async def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        priority: Priority = Priority.INTERACTIVE,
+        name: Optional[str] = None,
+        bounded: bool = True,
+    ) -> Any:
+        """
+        encola un trabajo y espera su resultado sin bloquear el loop
+
+        args:
+            fn: función bloqueante a ejecutar
+            priority: prioridad del trabajo
+            name: nombre para logs
+            bounded: false lo encola aunque la cola esté llena
+
+        returns:
+            el valor devuelto por `fn`
+        """
+        return await asyncio.wrap_future(self.submit_nowait(fn, *args, priority=priority, name=name, bounded=bounded))
+
+    def _next_job(self, interactive_only: bool) -> _Job:
+        with self._cond:
+            while True:
+                for priority in Priority:
+                    if interactive_only and priority != Priority.INTERACTIVE:
+                        break
+                    if self._queues[priority]:
+                        self._running += 1
+                        return self._queues[priority].popleft()
+                self._cond.wait()
+
+    def _work(self, interactive_only: bool) -> None:
+        while True:
+            job = self._next_job(interactive_only)
+            wait = time.monotonic() - job.enqueued_at
+            with self._cond:
+                stats = self._stats[job.priority]
+                stats[0] += 1
+                stats[1] += wait
+                stats[2] = max(stats[2], wait)
+            logger.info(f"trabajo {job.name} iniciado tras {wait:.3f}s en cola (quedan {self.depth})")
+
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.fn(*job.args))
+                except BaseException as e:
+                    job.future.set_exception(e)
+            with self._cond:
+                self._running -= 1
+
+    def metrics(self) -> dict:
+        """
+        devuelve profundidad de cola y tiempos de espera
+
+        returns:
+            diccionario con trabajos en espera en ejecución y espera media y máxima por prioridad
+        """
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": {p.name.lower(): len(q) for p, q in self._queues.items()},
+                "wait": {
+                    p.name.lower(): {
+                        "jobs": int(count),
+                        "avg_seconds": round(total / count, 4) if count else 0.0,
+                        "max_seconds": round(worst, 4),
+                    }
+                    for p, (count, total, worst) in self._stats.items()
+                },
+            }
@@ -8,6 +8,7 @@ intercambiada sin afectar la lógica de negocio
 """
 
 from abc import ABC, abstractmethod
+from typing import Callable, Optional, Tuple
 
 class TranscriptionService(ABC):
     """
@@ -32,3 +33,97 @@ class TranscriptionService(ABC):
             el texto transcrito del audio grabado
         """
         raise NotImplementedError
+
+    def stop_and_transcribe_speculative(self) -> Tuple[str, Optional[Callable[[], str]]]:
+        """
+        detiene la grabación y devuelve una transcripción provisional rápida
+
+        junto al borrador se devuelve una función bloqueante que produce la
+        transcripción definitiva la implementación por defecto no hace
+        segunda pasada
+
+        returns:
+            tupla (texto refinado) donde refinado es none si el texto ya es definitivo
+        """
+        return self.stop_and_transcribe(), None
+
+    def stop_recording(self) -> Callable[[], Tuple[str, Optional[Callable[[], str]]]]:
+        """
+        detiene la grabación en el acto y devuelve la transcripción diferida
+
+        la parada no espera a que haya un hueco para decodificar la función
+        devuelta es la que se encola la implementación por defecto no separa
+        ambos pasos y detiene la grabación al ejecutarla
+
+        returns:
+            función bloqueante con el resultado de `stop_and_transcribe_speculative`
+        """
+        return self.stop_and_transcribe_speculative
+
+    def set_auto_stop_callback(self, callback: Optional[Callable[[], None]]) -> None:
+        """
+        registra una función a invocar cuando el servicio detecta por sí mismo
+        el final del habla (modo manos libres)
+
+        la implementación por defecto no soporta endpointing y la ignora
+
+        args:
+            callback: función no bloqueante o none para desactivarlo
+        """
+        pass
+
+    def has_recoverable_recording(self) -> bool:
+        """
+        indica si quedó una grabación sin transcribir de una sesión interrumpida
+
+        la implementación por defecto no conserva grabaciones entre sesiones
+
+        returns:
+            true si hay una grabación recuperable
+        """
+        return False
+
+    @abstractmethod
+    def transcribe_file(self, path: str) -> str:
+        """
+        transcribe un archivo de audio sin pasar por el micrófono
+
+        args:
+            path: ruta del archivo de audio
+
+        returns:
+            el texto transcrito
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def retranscribe(
+        self,
+        index: int = 0,
+        beam_size: Optional[int] = None,
+        language: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        """
+        vuelve a transcribir una grabación reciente con otros parámetros
+
+        args:
+            index: 0 la última grabación 1 la anterior
+            beam_size: ancho de búsqueda (por defecto `whisper.beam_size`)
+            language: idioma forzado (por defecto `whisper.language`)
+            model: modelo a usar (por defecto el que elija el enrutador)
+
+        returns:
+            el texto transcrito
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def transcribe_recovered(self) -> str:
+        """
+        transcribe la grabación dejada por una sesión interrumpida
+
+        returns:
+            el texto transcrito
+        """
+        raise NotImplementedError
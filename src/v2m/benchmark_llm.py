@@ -0,0 +1,59 @@
+"""
+comparación de latencia entre los backends de LLM
+
+`python -m v2m.benchmark_llm` refina el mismo texto varias veces con cada
+backend (sin la caché de respuestas) y muestra la mediana del tiempo hasta el
+primer token y del tiempo total para decidir entre `[llm] backend = "gemini"`
+y `"local"`
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+from v2m.infrastructure.llm_factory import LLM_BACKENDS, build_llm_service
+
+SAMPLE_TEXT = (
+    "bueno entonces lo que quería decir es que la reunión de mañana se mueve a las diez "
+    "y eh hay que revisar el presupuesto antes porque el cliente pidió cambios en la parte de logística"
+)
+
+async def benchmark(backend: str, text: str, repeats: int) -> None:
+    service = build_llm_service(backend)
+    await service.process_text(text)  # calentamiento (conexión y carga del modelo)
+    for _ in range(repeats):
+        await service.process_text(text)
+    if hasattr(service, "aclose"):
+        await service.aclose()
+
+    # la primera solicitud fue el calentamiento
+    samples = service.latency.samples()[1:]
+    totals = [total for _, total in samples]
+    firsts = [first for first, _ in samples if first is not None]
+    first = f"{statistics.median(firsts):.3f}s" if firsts else "n/a"
+    print(f"{backend:<8} first token p50 {first:>8}   total p50 {statistics.median(totals):.3f}s   (n={len(totals)})")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare refinement latency across LLM backends")
+    parser.add_argument("--backends", nargs="+", default=list(LLM_BACKENDS), choices=LLM_BACKENDS, help="Backends to measure")
+    parser.add_argument("--repeats", type=int, default=5, help="Measured requests per backend")
+    parser.add_argument("--text-file", help="File with the text to refine (default: a short sample dictation)")
+    args = parser.parse_args()
+
+    text = SAMPLE_TEXT
+    if args.text_file:
+        with open(args.text_file, "r", encoding="utf-8") as f:
+            text = f.read()
+
+    failed = False
+    for backend in args.backends:
+        try:
+            asyncio.run(benchmark(backend, text, max(1, args.repeats)))
+        except Exception as e:
+            print(f"{backend:<8} failed: {e}", file=sys.stderr)
+            failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
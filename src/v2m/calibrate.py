@@ -0,0 +1,76 @@
+"""
+comando de calibración de WHISPER para esta máquina
+
+`python -m v2m.calibrate` mide las combinaciones de `compute_type`
+`cpu_threads` y `num_workers` sobre un clip de referencia y guarda la más
+rápida en `whisper.calibration.cache_file` el daemon la usa en los siguientes
+arranques si `whisper.calibration.enabled` está activo
+
+no necesita el daemon en marcha pero conviene detenerlo para que no compita
+por la CPU/GPU durante las mediciones
+"""
+
+import argparse
+import sys
+import ctranslate2
+from faster_whisper import WhisperModel, decode_audio
+from v2m.config import config
+from v2m.core.logging import logger
+from v2m.infrastructure.calibration import Calibrator, candidate_settings, save_calibration, synthetic_clip
+from v2m.infrastructure.model_store import ModelStore
+from v2m.infrastructure.thread_budget import ThreadBudget
+
+def main() -> None:
+    whisper_config = config.whisper
+    calibration_config = whisper_config.calibration
+
+    parser = argparse.ArgumentParser(description="Calibrate Whisper compute settings for this machine")
+    parser.add_argument("--model", default=whisper_config.model, help="Model to calibrate")
+    parser.add_argument("--device", default=whisper_config.device, choices=["cuda", "cpu"], help="CTranslate2 device")
+    parser.add_argument("--synthetic", action="store_true", help="Use the synthetic tone when no clip_path is configured")
+    args = parser.parse_args()
+
+    if args.device == "cuda" and ctranslate2.get_cuda_device_count() == 0:
+        print("Error: no CUDA device available, use --device cpu", file=sys.stderr)
+        sys.exit(1)
+
+    if calibration_config.clip_path:
+        clip = decode_audio(str(calibration_config.clip_path), sampling_rate=16000)
+    elif args.synthetic:
+        # el tono no es voz cada compute_type alucina un número distinto de
+        # tokens y el coste del decodificador varía con ellos
+        print("Warning: the synthetic tone makes a noisy benchmark, set clip_path to a real recording", file=sys.stderr)
+        clip = synthetic_clip(calibration_config.clip_seconds)
+    else:
+        print("Error: set [whisper.calibration] clip_path to a speech recording or pass --synthetic", file=sys.stderr)
+        sys.exit(1)
+
+    # los núcleos de WHISPER son los que deja libres el presupuesto de `[threads]`
+    budget = ThreadBudget.from_config(config.threads)
+    candidates = candidate_settings(args.device, budget.whisper, ctranslate2.get_supported_compute_types(args.device))
+
+    # misma resolución que el daemon para no descargar el modelo en cada combinación
+    store_config = whisper_config.store
+    source = args.model
+    if store_config.enabled:
+        source = ModelStore(store_config.root, offline=store_config.offline).resolve(args.model)
+
+    def build_model(settings: dict) -> WhisperModel:
+        return WhisperModel(source, device=args.device, device_index=whisper_config.device_index, **settings)
+
+    logger.info(f"calibrando {args.model} en {args.device} con {len(candidates)} combinaciones")
+    language = None if whisper_config.language == "auto" else whisper_config.language
+    calibrator = Calibrator(build_model, repeats=calibration_config.repeats, concurrency=calibration_config.concurrency)
+    best = calibrator.run(candidates, clip, language=language or "es")
+    if best is None:
+        print("Error: no candidate configuration could be loaded", file=sys.stderr)
+        sys.exit(1)
+
+    save_calibration(calibration_config.cache_file, args.model, args.device, best)
+    print(f"Fastest: {best}")
+    print(f"Saved to {calibration_config.cache_file.expanduser()}")
+    if not calibration_config.enabled:
+        print("Set [whisper.calibration] enabled = true in config.toml to use it")
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,8 @@ async def send_command(command: str):
         writer.write(command.encode())
         await writer.drain()
 
-        data = await reader.read(1024)
+        # el daemon cierra la conexión tras responder (las métricas pueden superar 1 KB)
+        data = await reader.read()
         response = data.decode()
         # print(f"Response: {response}")
 
@@ -24,6 +25,23 @@ async def send_command(command: str):
         print("Error: Connection refused. Daemon might be dead.", file=sys.stderr)
         sys.exit(1)
 
+async def subscribe():
+    # recibe los segmentos de cada transcripción según se decodifican
+    try:
+        reader, writer = await asyncio.open_unix_connection(SOCKET_PATH)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("Error: Daemon is not running. Start it with 'python -m v2m.daemon'", file=sys.stderr)
+        sys.exit(1)
+
+    writer.write(IPCCommand.SUBSCRIBE.value.encode())
+    await writer.drain()
+
+    try:
+        async for line in reader:
+            print(line.decode().rstrip("\n"), flush=True)
+    finally:
+        writer.close()
+
 def main():
     parser = argparse.ArgumentParser(description="Whisper Dictation Client")
     parser.add_argument("command", choices=[e.value for e in IPCCommand], help="Command to send to daemon")
@@ -31,6 +49,13 @@ def main():
 
     args = parser.parse_args()
 
+    if args.command == IPCCommand.SUBSCRIBE:
+        try:
+            asyncio.run(subscribe())
+        except KeyboardInterrupt:
+            pass
+        return
+
     full_command = args.command
     if args.payload:
         full_command += " " + " ".join(args.payload)
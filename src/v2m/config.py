@@ -2,8 +2,9 @@
 módulo para la carga y gestión de la configuración de la aplicación utilizando pydantic settings
 """
 
+import os
 from pathlib import Path
-from typing import Optional, Tuple, Type
+from typing import List, Optional, Tuple, Type
 from pydantic import BaseModel, Field
 from pydantic_settings import (
     BaseSettings,
@@ -15,19 +16,169 @@ from pydantic_settings import (
 # --- ruta base del proyecto ---
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
+def _state_dir() -> Path:
+    """
+    directorio de estado persistente de la aplicación
+
+    returns:
+        `$XDG_STATE_HOME/v2m` o `~/.local/state/v2m`
+    """
+    return Path(os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state") / "v2m"
+
 class PathsConfig(BaseModel):
     recording_flag: Path = Field(default=Path("/tmp/v2m_recording.pid"))
     audio_file: Path = Field(default=Path("/tmp/v2m_audio.wav"))
     log_file: Path = Field(default=Path("/tmp/v2m_debug.log"))
+    # en disco y no en /tmp (tmpfs en muchas distros) las páginas del diario
+    # no ocupan RAM y el audio sobrevive a un reinicio
+    recording_journal: Path = Field(default_factory=lambda: _state_dir() / "recording.journal")
     venv_path: Path = Field(default=Path("~/v2m/venv"))
 
     def __getitem__(self, item):
         return getattr(self, item)
 
+class AudioConfig(BaseModel):
+    warm_stream: bool = False
+    preroll_ms: int = 500
+    idle_close_seconds: float = 300.0
+    max_minutes: float = 10.0
+    journal: bool = False
+    journal_max_minutes: float = 120.0
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class ThreadsConfig(BaseModel):
+    total: int = 0
+    whisper: int = 0
+    vad: int = 1
+    numpy: int = 1
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class ResidencyConfig(BaseModel):
+    idle_ttl_seconds: float = 0.0
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class SchedulerConfig(BaseModel):
+    workers: int = 2
+    max_queue: int = 8
+    reserve_interactive: bool = True
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class VadConfig(BaseModel):
+    backend: str = "torch"
+    load_timeout: float = 10.0
+    energy_gate: bool = True
+    energy_margin_db: float = 10.0
+    energy_min_active_ms: int = 100
+    energy_pad_ms: int = 200
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
 class VadParametersConfig(BaseModel):
     threshold: float = 0.5
     min_speech_duration_ms: int = 250
     min_silence_duration_ms: int = 500
+    speech_pad_ms: int = 30
+    merge_gap_ms: int = 300
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class StreamingConfig(BaseModel):
+    enabled: bool = False
+    window_seconds: float = 10.0
+    prompt_chars: int = 200
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class EndpointingConfig(BaseModel):
+    enabled: bool = False
+    silence_ms: int = 800
+    min_speech_ms: int = 250
+    energy_threshold: float = 0.01
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class RouterTierConfig(BaseModel):
+    model: str
+    max_speech_seconds: float = 0.0
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class RouterConfig(BaseModel):
+    enabled: bool = False
+    busy_downgrade: bool = True
+    tiers: List[RouterTierConfig] = Field(default_factory=list)
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class SpeculativeConfig(BaseModel):
+    enabled: bool = False
+    draft_model: str = "base"
+    min_speech_seconds: float = 8.0
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class WarmupConfig(BaseModel):
+    enabled: bool = True
+    clip_seconds: float = 2.0
+    clip_path: Optional[Path] = None
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class DeliveryConfig(BaseModel):
+    clipboard: bool = False
+    llm: bool = False
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class LanguagePriorConfig(BaseModel):
+    enabled: bool = True
+    history: int = 5
+    min_probability: float = 0.8
+    min_avg_logprob: float = -1.0
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class CalibrationConfig(BaseModel):
+    enabled: bool = False
+    cache_file: Path = Field(default=Path("~/.cache/v2m/calibration.json"))
+    clip_path: Optional[Path] = None
+    clip_seconds: float = 8.0
+    repeats: int = 2
+    concurrency: int = 2
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class RetentionConfig(BaseModel):
+    enabled: bool = False
+    recordings: int = 3
+    max_seconds: float = 300.0
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class ModelStoreConfig(BaseModel):
+    enabled: bool = False
+    root: Path = Field(default=Path("~/.local/share/v2m/models"))
+    offline: bool = False
 
     def __getitem__(self, item):
         return getattr(self, item)
@@ -44,6 +195,16 @@ class WhisperConfig(BaseModel):
     temperature: float = 0.0
     vad_filter: bool = True
     vad_parameters: VadParametersConfig = Field(default_factory=VadParametersConfig)
+    streaming: StreamingConfig = Field(default_factory=StreamingConfig)
+    endpointing: EndpointingConfig = Field(default_factory=EndpointingConfig)
+    router: RouterConfig = Field(default_factory=RouterConfig)
+    speculative: SpeculativeConfig = Field(default_factory=SpeculativeConfig)
+    warmup: WarmupConfig = Field(default_factory=WarmupConfig)
+    delivery: DeliveryConfig = Field(default_factory=DeliveryConfig)
+    language_prior: LanguagePriorConfig = Field(default_factory=LanguagePriorConfig)
+    calibration: CalibrationConfig = Field(default_factory=CalibrationConfig)
+    store: ModelStoreConfig = Field(default_factory=ModelStoreConfig)
+    retention: RetentionConfig = Field(default_factory=RetentionConfig)
 
     def __getitem__(self, item):
         return getattr(self, item)
@@ -53,7 +214,9 @@ class GeminiConfig(BaseModel):
     temperature: float = 0.3
     max_tokens: int = 2048
     max_input_chars: int = 6000
+    max_concurrent_chunks: int = 4
     request_timeout: int = 30
+    stream: bool = True
     retry_attempts: int = 3
     retry_min_wait: int = 2
     retry_max_wait: int = 10
@@ -62,10 +225,51 @@ class GeminiConfig(BaseModel):
     def __getitem__(self, item):
         return getattr(self, item)
 
+class LLMCacheConfig(BaseModel):
+    enabled: bool = True
+    path: Path = Field(default=Path("~/.cache/v2m/llm_cache.sqlite3"))
+    memory_entries: int = 128
+    max_entries: int = 2000
+    ttl_seconds: float = 7 * 24 * 3600
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class LocalLLMConfig(BaseModel):
+    base_url: str = "http://127.0.0.1:8080/v1"
+    model: str = "local"
+    api_key: Optional[str] = None
+    temperature: float = 0.3
+    max_tokens: int = 2048
+    max_input_chars: int = 6000
+    max_concurrent_chunks: int = 1
+    request_timeout: float = 30.0
+    stream: bool = True
+    max_connections: int = 4
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+class LLMConfig(BaseModel):
+    backend: str = "gemini"
+    deadline_seconds: float = 8.0
+    late_replace: bool = True
+    local: LocalLLMConfig = Field(default_factory=LocalLLMConfig)
+    cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
 class Settings(BaseSettings):
     paths: PathsConfig = Field(default_factory=PathsConfig)
+    audio: AudioConfig = Field(default_factory=AudioConfig)
+    vad: VadConfig = Field(default_factory=VadConfig)
+    threads: ThreadsConfig = Field(default_factory=ThreadsConfig)
+    residency: ResidencyConfig = Field(default_factory=ResidencyConfig)
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig)
     whisper: WhisperConfig = Field(default_factory=WhisperConfig)
     gemini: GeminiConfig = Field(default_factory=GeminiConfig)
+    llm: LLMConfig = Field(default_factory=LLMConfig)
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -11,17 +11,25 @@ depende de abstracciones (interfaces)
 """
 
 from v2m.core.cqrs.command_bus import CommandBus
-from v2m.application.command_handlers import StartRecordingHandler, StopRecordingHandler, ProcessTextHandler
+from v2m.application.command_handlers import StartRecordingHandler, StopRecordingHandler, ProcessTextHandler, RecoverRecordingHandler, TranscribeFileHandler, RetranscribeHandler
+from v2m.application.transcription_scheduler import TranscriptionScheduler
 from v2m.infrastructure.whisper_transcription_service import WhisperTranscriptionService
-from v2m.infrastructure.gemini_llm_service import GeminiLLMService
+from v2m.infrastructure.cached_llm_service import CachedLLMService
+from v2m.infrastructure.llm_factory import build_llm_service
 from v2m.infrastructure.linux_adapters import LinuxNotificationAdapter, LinuxClipboardAdapter
 from v2m.application.transcription_service import TranscriptionService
 from v2m.application.llm_service import LLMService
 from v2m.core.interfaces import NotificationInterface, ClipboardInterface
+from v2m.core.segment_stream import SegmentStream
+from v2m.application.segment_sinks import ClipboardSegmentSink
 
 from v2m.infrastructure.vad_service import VADService
+from v2m.infrastructure.energy_gate import EnergyGate
+from v2m.infrastructure.thread_budget import ThreadBudget
+from v2m.infrastructure.model_residency import ModelResidencyManager, warm_up_in_background
+from v2m.infrastructure.model_store import ModelStore
 from v2m.core.logging import logger
-import threading
+from v2m.config import config
 
 class Container:
     """
@@ -44,24 +52,120 @@ class Container:
             registran todos los handlers para que el bus sepa a quién despachar
             cada comando
         """
+        # --- 0 repartir los núcleos antes de que se creen los pools de hilos ---
+        self.thread_budget = ThreadBudget.from_config(config.threads, num_workers=config.whisper.num_workers)
+        self.thread_budget.apply()
+
         # --- 1 instanciar servicios (como singletons) ---
         # aquí se decide qué implementación concreta usar para cada interfaz
         # si quisiéramos cambiar de GEMINI a OPENAI solo cambiaríamos esta línea
-        self.vad_service = VADService()
-        self.transcription_service: TranscriptionService = WhisperTranscriptionService(vad_service=self.vad_service)
-        # precargar el modelo whisper en un hilo para evitar bloqueo al primer uso
-        def _preload_whisper():
+        vad_config = config.vad
+        energy_gate = None
+        if vad_config.energy_gate:
+            energy_gate = EnergyGate(
+                margin_db=vad_config.energy_margin_db,
+                min_active_ms=vad_config.energy_min_active_ms,
+                pad_ms=vad_config.energy_pad_ms,
+            )
+        self.vad_service = VADService(
+            backend=vad_config.backend,
+            load_timeout=vad_config.load_timeout,
+            parameters=config.whisper.vad_parameters.model_dump(),
+            energy_gate=energy_gate,
+            num_threads=self.thread_budget.vad
+        )
+        self.residency = ModelResidencyManager(idle_ttl_seconds=config.residency.idle_ttl_seconds)
+        self.segment_stream = SegmentStream()
+        # los modelos se cargan desde disco sin resolver el nombre contra el hub
+        store_config = config.whisper.store
+        self.model_store = ModelStore(store_config.root, offline=store_config.offline) if store_config.enabled else None
+        self.transcription_service: TranscriptionService = WhisperTranscriptionService(
+            vad_service=self.vad_service,
+            thread_budget=self.thread_budget,
+            residency=self.residency,
+            segment_stream=self.segment_stream,
+            model_store=self.model_store
+        )
+        whisper_service = self.transcription_service
+        self.residency.register(
+            "whisper",
+            load=lambda: whisper_service.model,
+            unload=whisper_service.unload_model,
+            is_loaded=lambda: whisper_service.is_model_loaded,
+        )
+        if config.whisper.speculative.enabled:
+            # el borrador debe salir en cientos de ms no tras cargar su modelo
+            self.residency.register(
+                "whisper_draft",
+                load=lambda: whisper_service.draft_model,
+                unload=whisper_service.unload_draft_model,
+                is_loaded=lambda: whisper_service.is_draft_model_loaded,
+            )
+        router_config = config.whisper.router
+        if router_config.enabled:
+            # los niveles del enrutador se precargan igual que el modelo principal
+            # así el primer dictado que cae en un nivel no paga su carga
+            managed = {config.whisper.model}
+            if config.whisper.speculative.enabled:
+                managed.add(config.whisper.speculative.draft_model)
+            for model_name in dict.fromkeys(tier.model for tier in router_config.tiers):
+                if model_name in managed:
+                    continue
+                self.residency.register(
+                    f"whisper_{model_name}",
+                    load=lambda name=model_name: whisper_service.load_tier_model(name),
+                    unload=lambda name=model_name: whisper_service.unload_tier_model(name),
+                    is_loaded=lambda name=model_name: whisper_service.is_tier_model_loaded(name),
+                )
+        self.residency.register(
+            "vad",
+            load=lambda: self.vad_service.load_model(self.vad_service.load_timeout),
+            unload=self.vad_service.unload_model,
+            is_loaded=lambda: self.vad_service.model is not None,
+        )
+        # precargar los modelos en un hilo para evitar bloqueo al primer uso
+        self.residency.prefetch()
+        # el daemon solo se declara listo cuando la primera inferencia ya se pagó
+        self.ready = warm_up_in_background(
+            self.transcription_service.warm_up if config.whisper.warmup.enabled else None
+        )
+        # abrir el micrófono durante el arranque para que la primera grabación
+        # ya cuente con stream caliente y pre-roll
+        if config.audio.warm_stream:
             try:
-                _ = self.transcription_service.model
-                logger.info("Whisper precargado correctamente")
+                self.transcription_service.recorder.open()
             except Exception as e:
-                logger.warning(f"No se pudo precargar Whisper: {e}")
-        threading.Thread(target=_preload_whisper, daemon=True).start()
-        self.llm_service: LLMService = GeminiLLMService()
+                logger.warning(f"No se pudo abrir el stream de captura: {e}")
+        scheduler_config = config.scheduler
+        self.scheduler = TranscriptionScheduler(
+            workers=scheduler_config.workers,
+            max_queue=scheduler_config.max_queue,
+            reserve_interactive=scheduler_config.reserve_interactive,
+        )
+        if scheduler_config.workers > config.whisper.num_workers:
+            logger.warning(
+                f"scheduler.workers={scheduler_config.workers} supera whisper.num_workers="
+                f"{config.whisper.num_workers} los trabajos extra esperarán a una réplica libre"
+            )
+        # los fragmentos del refinado en streaming se difunden aparte de los de WHISPER
+        self.llm_stream = SegmentStream()
+        self.llm_service: LLMService = build_llm_service(config.llm.backend, self.llm_stream)
+        cache_config = config.llm.cache
+        if cache_config.enabled:
+            self.llm_service = CachedLLMService(
+                self.llm_service,
+                cache_config.path,
+                memory_entries=cache_config.memory_entries,
+                max_entries=cache_config.max_entries,
+                ttl_seconds=cache_config.ttl_seconds,
+                partial_stream=self.llm_stream,
+            )
 
         # adaptadores de sistema
         self.notification_service: NotificationInterface = LinuxNotificationAdapter()
         self.clipboard_service: ClipboardInterface = LinuxClipboardAdapter()
+        if config.whisper.delivery.clipboard:
+            self.segment_stream.subscribe(ClipboardSegmentSink(self.clipboard_service))
 
         # --- 2 instanciar manejadores de comandos ---
         # se inyectan las dependencias en el constructor de cada handler
@@ -69,15 +173,38 @@ class Container:
             self.transcription_service,
             self.notification_service
         )
+        # el refinado con el LLM se lanza desde la parada tras copiar el texto original
+        dispatch = (lambda command: self.command_bus.dispatch(command)) if config.whisper.delivery.llm else None
         self.stop_recording_handler = StopRecordingHandler(
             self.transcription_service,
             self.notification_service,
-            self.clipboard_service
+            self.clipboard_service,
+            self.scheduler,
+            dispatch=dispatch
+        )
+        self.recover_recording_handler = RecoverRecordingHandler(
+            self.transcription_service,
+            self.notification_service,
+            self.clipboard_service,
+            self.scheduler
+        )
+        self.retranscribe_handler = RetranscribeHandler(
+            self.transcription_service,
+            self.notification_service,
+            self.clipboard_service,
+            self.scheduler
+        )
+        self.transcribe_file_handler = TranscribeFileHandler(
+            self.transcription_service,
+            self.notification_service,
+            self.scheduler
         )
         self.process_text_handler = ProcessTextHandler(
             self.llm_service,
             self.notification_service,
-            self.clipboard_service
+            self.clipboard_service,
+            deadline_seconds=config.llm.deadline_seconds,
+            late_replace=config.llm.late_replace
         )
 
         # --- 3 instanciar y configurar el bus de comandos ---
@@ -86,6 +213,9 @@ class Container:
         self.command_bus = CommandBus()
         self.command_bus.register(self.start_recording_handler)
         self.command_bus.register(self.stop_recording_handler)
+        self.command_bus.register(self.recover_recording_handler)
+        self.command_bus.register(self.transcribe_file_handler)
+        self.command_bus.register(self.retranscribe_handler)
         self.command_bus.register(self.process_text_handler)
 
     def get_command_bus(self) -> CommandBus:
@@ -97,6 +227,23 @@ class Container:
         """
         return self.command_bus
 
+    def get_metrics(self) -> dict:
+        """
+        reúne las métricas de ejecución del daemon
+
+        returns:
+            diccionario serializable a json
+        """
+        metrics = {
+            "residency": self.residency.metrics(),
+            "scheduler": self.scheduler.metrics(),
+            "llm": self.llm_service.metrics(),
+        }
+        language_prior = getattr(self.transcription_service, "language_prior", None)
+        if language_prior is not None:
+            metrics["language_prior"] = language_prior.metrics()
+        return metrics
+
 # --- instancia global del contenedor ---
 # se crea una única instancia del contenedor que será accesible desde toda la
 # aplicación (principalmente desde `main.py`)
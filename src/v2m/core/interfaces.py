@@ -16,3 +16,21 @@ class NotificationInterface(ABC):
     def notify(self, title: str, message: str) -> None:
         """envía una notificación al sistema"""
         pass
+
+class SegmentSubscriber(ABC):
+    @abstractmethod
+    def on_segment(self, text: str) -> None:
+        """recibe un segmento en cuanto el decodificador lo produce"""
+        pass
+
+    def on_complete(self, text: str) -> None:
+        """recibe el texto final completo de la transcripción"""
+        pass
+
+    def on_reset(self) -> None:
+        """descarta los segmentos recibidos hasta ahora (un reintento empieza de cero)"""
+        pass
+
+    def on_error(self, message: str) -> None:
+        """recibe el fallo definitivo cuando no habrá texto final"""
+        pass
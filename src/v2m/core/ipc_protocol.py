@@ -4,6 +4,12 @@ class IPCCommand(str, Enum):
     START_RECORDING = "START_RECORDING"
     STOP_RECORDING = "STOP_RECORDING"
     PROCESS_TEXT = "PROCESS_TEXT"
+    RECOVER_RECORDING = "RECOVER_RECORDING"
+    TRANSCRIBE_FILE = "TRANSCRIBE_FILE"
+    RETRANSCRIBE = "RETRANSCRIBE"
+    METRICS = "METRICS"
+    STATUS = "STATUS"
+    SUBSCRIBE = "SUBSCRIBE"
     PING = "PING"
     SHUTDOWN = "SHUTDOWN"
 
@@ -0,0 +1,107 @@
+"""
+módulo que difunde los segmentos de una transcripción a medida que se decodifican
+
+`faster-whisper` devuelve un generador perezoso cada segmento está disponible
+en cuanto el decodificador lo produce `segmentstream` lo reparte a los
+suscriptores (cliente IPC portapapeles etapa de LLM) sin esperar al final
+
+la entrega ocurre en un hilo propio y en orden un suscriptor lento (ej el
+portapapeles que lanza un proceso) nunca frena la decodificación
+"""
+
+import queue
+import threading
+from typing import List, Optional
+from v2m.core.interfaces import SegmentSubscriber
+from v2m.core.logging import logger
+
+class SegmentStream:
+    """
+    difusor de segmentos con entrega asíncrona y ordenada
+    """
+    def __init__(self) -> None:
+        self._subscribers: List[SegmentSubscriber] = []
+        self._lock = threading.Lock()
+        self._events: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+
+    def subscribe(self, subscriber: SegmentSubscriber) -> None:
+        """
+        añade un suscriptor
+
+        args:
+            subscriber: receptor de los segmentos y del texto final
+        """
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: SegmentSubscriber) -> None:
+        """
+        retira un suscriptor (no falla si ya no estaba)
+
+        args:
+            subscriber: el suscriptor a retirar
+        """
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, text: str) -> None:
+        """
+        encola un segmento para los suscriptores
+
+        args:
+            text: texto del segmento
+        """
+        self._put("on_segment", text)
+
+    def complete(self, text: str) -> None:
+        """
+        encola el texto final de la transcripción
+
+        args:
+            text: el texto completo ya concatenado
+        """
+        self._put("on_complete", text)
+
+    def reset(self) -> None:
+        """
+        anuncia que los segmentos publicados hasta ahora se descartan
+
+        lo usa un productor que reintenta desde el principio (ej el streaming
+        del LLM) para que los suscriptores no concatenen dos intentos
+        """
+        self._put("on_reset")
+
+    def fail(self, message: str) -> None:
+        """
+        encola el fallo definitivo en lugar del texto final
+
+        args:
+            message: descripción del error
+        """
+        self._put("on_error", message)
+
+    def _put(self, method: str, *args: str) -> None:
+        with self._lock:
+            if not self._subscribers:
+                return
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._deliver, daemon=True)
+                self._worker.start()
+        self._events.put((method, args))
+
+    def _deliver(self) -> None:
+        while True:
+            method, args = self._events.get()
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for subscriber in subscribers:
+                try:
+                    getattr(subscriber, method)(*args)
+                except Exception as e:
+                    logger.error(f"error entregando segmento a {type(subscriber).__name__} {e}")
@@ -1,14 +1,72 @@
 import asyncio
+import json
 import os
 import signal
 import sys
 from pathlib import Path
-from typing import Callable, Dict
+from typing import Callable, Dict, Tuple
 
 from v2m.core.logging import logger
 from v2m.core.ipc_protocol import SOCKET_PATH, IPCCommand
+from v2m.core.interfaces import SegmentSubscriber
 from v2m.core.di.container import container
-from v2m.application.commands import StartRecordingCommand, StopRecordingCommand, ProcessTextCommand
+from v2m.application.commands import StartRecordingCommand, StopRecordingCommand, ProcessTextCommand, RecoverRecordingCommand, TranscribeFileCommand, RetranscribeCommand
+
+class IPCSegmentSubscriber(SegmentSubscriber):
+    """
+    reenvía los segmentos a un cliente IPC suscrito
+
+    los eventos llegan desde el hilo de entrega y se pasan al loop del
+    daemon como líneas `SEGMENT <texto>` `FINAL <texto>` `RESET` y
+    `ERROR <mensaje>` (o `REFINED_PARTIAL` `REFINED` `REFINED_RESET` y
+    `REFINED_ERROR` para los fragmentos del LLM) tras un `RESET` el cliente
+    descarta los parciales recibidos
+    """
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        kinds: Tuple[str, str, str, str] = ("SEGMENT", "FINAL", "RESET", "ERROR"),
+    ) -> None:
+        self.loop = loop
+        self.queue = queue
+        self.kinds = kinds
+
+    def _send(self, kind: str, text: str) -> None:
+        line = f"{kind} {' '.join(text.splitlines())}\n" if text else f"{kind}\n"
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, line)
+
+    def on_segment(self, text: str) -> None:
+        self._send(self.kinds[0], text)
+
+    def on_complete(self, text: str) -> None:
+        self._send(self.kinds[1], text)
+
+    def on_reset(self) -> None:
+        self._send(self.kinds[2], "")
+
+    def on_error(self, message: str) -> None:
+        self._send(self.kinds[3], message)
+
+def parse_retranscribe(message: str) -> RetranscribeCommand:
+    """
+    convierte `RETRANSCRIBE [indice] [beam=N] [language=xx] [model=nombre]` en un comando
+
+    raises:
+        valueerror: si alguna opción no se reconoce o no es válida
+    """
+    options = {"index": 0}
+    for token in message.split()[1:]:
+        key, sep, value = token.partition("=")
+        if not sep and key.isdigit():
+            options["index"] = int(key)
+        elif key == "beam" and value.isdigit() and int(value) > 0:
+            options["beam_size"] = int(value)
+        elif key in ("language", "model") and value:
+            options[key] = value
+        else:
+            raise ValueError(f"Invalid RETRANSCRIBE option: {token}")
+    return RetranscribeCommand(**options)
 
 class Daemon:
     def __init__(self):
@@ -21,6 +79,10 @@ class Daemon:
         message = data.decode().strip()
         logger.info(f"Received IPC message: {message}")
 
+        if message == IPCCommand.SUBSCRIBE:
+            await self.stream_segments(writer)
+            return
+
         response = "OK"
 
         try:
@@ -30,6 +92,21 @@ class Daemon:
             elif message == IPCCommand.STOP_RECORDING:
                 await self.command_bus.dispatch(StopRecordingCommand())
 
+            elif message == IPCCommand.RECOVER_RECORDING:
+                await self.command_bus.dispatch(RecoverRecordingCommand())
+
+            elif message.startswith(IPCCommand.TRANSCRIBE_FILE):
+                # el trabajo entra en la cola con prioridad de fondo la respuesta llega al terminar
+                parts = message.split(" ", 1)
+                if len(parts) > 1:
+                    await self.command_bus.dispatch(TranscribeFileCommand(parts[1]))
+                else:
+                    response = "ERROR: Missing file path"
+
+            elif message.startswith(IPCCommand.RETRANSCRIBE):
+                # RETRANSCRIBE [indice] [beam=N] [language=xx] [model=nombre]
+                await self.command_bus.dispatch(parse_retranscribe(message))
+
             elif message.startswith(IPCCommand.PROCESS_TEXT):
                 # extraer payload
                 parts = message.split(" ", 1)
@@ -39,6 +116,12 @@ class Daemon:
                 else:
                     response = "ERROR: Missing text payload"
 
+            elif message == IPCCommand.METRICS:
+                response = json.dumps(container.get_metrics())
+
+            elif message == IPCCommand.STATUS:
+                response = "READY" if container.ready.is_set() else "WARMING_UP"
+
             elif message == IPCCommand.PING:
                 response = "PONG"
 
@@ -61,6 +144,36 @@ class Daemon:
         if message == IPCCommand.SHUTDOWN:
             self.stop()
 
+    async def stream_segments(self, writer: asyncio.StreamWriter):
+        # la conexión queda abierta y recibe cada segmento hasta que el cliente se va
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        subscriber = IPCSegmentSubscriber(loop, queue)
+        llm_subscriber = IPCSegmentSubscriber(loop, queue, kinds=("REFINED_PARTIAL", "REFINED", "REFINED_RESET", "REFINED_ERROR"))
+        container.segment_stream.subscribe(subscriber)
+        container.llm_stream.subscribe(llm_subscriber)
+        logger.info("IPC client subscribed to transcription segments")
+        try:
+            while True:
+                line = await queue.get()
+                writer.write(line.encode())
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            container.segment_stream.unsubscribe(subscriber)
+            container.llm_stream.unsubscribe(llm_subscriber)
+            writer.close()
+            logger.info("IPC segment subscriber disconnected")
+
+    async def auto_stop(self):
+        # el endpointer detectó silencio final: misma ruta que STOP_RECORDING
+        logger.info("Auto stop triggered by silence endpointing")
+        try:
+            await self.command_bus.dispatch(StopRecordingCommand())
+        except Exception as e:
+            logger.error(f"Error handling auto stop: {e}")
+
     async def start_server(self):
         if self.socket_path.exists():
             # verificar si el socket está realmente vivo
@@ -74,11 +187,25 @@ class Daemon:
                 # el socket existe pero nadie está escuchando es seguro eliminarlo
                 self.socket_path.unlink()
 
+        # el callback llega desde el hilo de audio programar la parada en el loop
+        loop = asyncio.get_running_loop()
+        container.transcription_service.set_auto_stop_callback(
+            lambda: asyncio.run_coroutine_threadsafe(self.auto_stop(), loop)
+        )
+
         server = await asyncio.start_unix_server(self.handle_client, str(self.socket_path))
         logger.info(f"Daemon listening on {self.socket_path}")
 
         self.running = True
 
+        # ofrecer la recuperación de una grabación que quedó sin transcribir
+        if container.transcription_service.has_recoverable_recording():
+            logger.warning("Leftover recording journal found, send RECOVER_RECORDING to transcribe it")
+            container.notification_service.notify(
+                "🎤 Voice2Machine",
+                "Grabación interrumpida encontrada usa RECOVER_RECORDING para recuperarla"
+            )
+
         # mantener el servidor en funcionamiento
         async with server:
             await server.serve_forever()
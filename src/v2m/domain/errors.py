@@ -42,6 +42,15 @@ class TranscriptionError(ApplicationError):
     """
     pass
 
+class TranscriptionQueueFullError(TranscriptionError):
+    """
+    excepción lanzada cuando la cola de trabajos de transcripción está llena
+
+    el planificador rechaza trabajos nuevos en lugar de acumular latencia
+    sin límite el cliente puede reintentar más tarde
+    """
+    pass
+
 class LLMError(ApplicationError):
     """
     excepción lanzada cuando hay un error en la comunicación con el LLM
@@ -0,0 +1,174 @@
+"""
+módulo que implementa los buffers de audio preasignados usados por `audiorecorder`
+
+los buffers reservan toda su capacidad de una sola vez al crearse y el callback
+de portaudio escribe cada bloque con una única asignación por slice de esta
+forma el hilo de tiempo real no realiza asignaciones de memoria y al detener
+la grabación se devuelve una vista sin copias del audio capturado
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+class AudioBuffer:
+    """
+    buffer lineal de capacidad fija para muestras de audio
+
+    almacena las muestras con forma (capacity channels) para que cada bloque
+    entregado por `sounddevice` se copie directamente sin redimensionar
+    """
+    def __init__(self, capacity: int, channels: int = 1, dtype: np.dtype = np.float32) -> None:
+        """
+        inicializa el buffer reservando toda la memoria necesaria
+
+        `np.empty` solo reserva el espacio virtual las páginas se materializan
+        a medida que se escriben así que una capacidad de varios minutos no
+        consume memoria residente hasta que se usa
+
+        args:
+            capacity: número máximo de fotogramas (muestras por canal)
+            channels: número de canales de audio
+            dtype: tipo de dato de las muestras
+        """
+        if capacity <= 0:
+            raise ValueError("la capacidad del buffer debe ser mayor que cero")
+        self._data = np.empty((capacity, channels), dtype=dtype)
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """número máximo de fotogramas que caben en el buffer"""
+        return self._data.shape[0]
+
+    @property
+    def size(self) -> int:
+        """número de fotogramas escritos hasta el momento"""
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        """indica si el buffer alcanzó su capacidad"""
+        return self._size >= self.capacity
+
+    def write(self, block: np.ndarray) -> int:
+        """
+        copia un bloque de audio al final del buffer
+
+        está pensado para llamarse desde el callback de portaudio solo realiza
+        una asignación por slice sobre la memoria ya reservada
+
+        args:
+            block: array con forma (frames channels) o (frames)
+
+        returns:
+            el número de fotogramas escritos puede ser menor que el tamaño del
+            bloque si el buffer se llenó
+        """
+        start = self._size
+        n = min(block.shape[0], self.capacity - start)
+        if n <= 0:
+            return 0
+        self._data[start:start + n] = block[:n].reshape(n, -1)
+        self._size = start + n
+        return n
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """
+        devuelve el audio escrito como array unidimensional sin copiarlo
+
+        un slice de filas consecutivas es contiguo en memoria por lo que
+        `reshape` devuelve una vista sobre el mismo buffer como el buffer solo
+        crece las filas ya escritas no cambian y la vista puede leerse mientras
+        la grabación continúa
+
+        args:
+            start: primer fotograma a incluir
+            end: fotograma final (exclusivo) por defecto lo escrito hasta ahora
+
+        returns:
+            vista de numpy con las muestras intercaladas por canal
+        """
+        end = self._size if end is None else min(end, self._size)
+        start = min(max(start, 0), end)
+        return self._data[start:end].reshape(-1)
+
+    def reset(self) -> None:
+        """descarta el contenido sin liberar la memoria reservada"""
+        self._size = 0
+
+class RingBuffer:
+    """
+    buffer circular de capacidad fija que conserva los últimos fotogramas
+
+    se usa como pre-roll mientras el stream de captura permanece abierto entre
+    grabaciones así el inicio de la grabación incluye el audio inmediatamente
+    anterior a la pulsación de la tecla y no se corta la primera sílaba
+    """
+    def __init__(self, capacity: int, channels: int = 1, dtype: np.dtype = np.float32) -> None:
+        """
+        inicializa el buffer circular reservando toda la memoria necesaria
+
+        args:
+            capacity: número de fotogramas más recientes que se conservan
+            channels: número de canales de audio
+            dtype: tipo de dato de las muestras
+        """
+        if capacity <= 0:
+            raise ValueError("la capacidad del buffer debe ser mayor que cero")
+        self._data = np.empty((capacity, channels), dtype=dtype)
+        self._pos = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """número máximo de fotogramas que se conservan"""
+        return self._data.shape[0]
+
+    @property
+    def size(self) -> int:
+        """número de fotogramas válidos en el buffer"""
+        return self._size
+
+    def write(self, block: np.ndarray) -> None:
+        """
+        añade un bloque sobrescribiendo los fotogramas más antiguos
+
+        a lo sumo realiza dos asignaciones por slice (antes y después del
+        punto de vuelta) sin reservar memoria
+
+        args:
+            block: array con forma (frames channels) o (frames)
+        """
+        capacity = self.capacity
+        n = block.shape[0]
+        if n == 0:
+            return
+        if n >= capacity:
+            # el bloque cubre todo el buffer solo interesa su final
+            self._data[:] = block[n - capacity:].reshape(capacity, -1)
+            self._pos = 0
+            self._size = capacity
+            return
+
+        first = min(n, capacity - self._pos)
+        self._data[self._pos:self._pos + first] = block[:first].reshape(first, -1)
+        if first < n:
+            self._data[:n - first] = block[first:].reshape(n - first, -1)
+        self._pos = (self._pos + n) % capacity
+        self._size = min(self._size + n, capacity)
+
+    def parts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        devuelve el contenido en orden cronológico como dos vistas sin copia
+
+        returns:
+            tupla (parte más antigua parte más reciente) con forma (frames channels)
+        """
+        if self._size < self.capacity:
+            return self._data[:0], self._data[:self._size]
+        return self._data[self._pos:], self._data[:self._pos]
+
+    def clear(self) -> None:
+        """descarta el contenido sin liberar la memoria reservada"""
+        self._pos = 0
+        self._size = 0
@@ -0,0 +1,88 @@
+"""
+módulo que implementa la detección de fin de habla (endpointing) por silencio
+
+el `silenceendpointer` es un vad de energía muy ligero que se ejecuta sobre
+cada bloque del callback de portaudio cuando detecta voz seguida de un
+silencio de al menos `silence_ms` avisa una única vez para que el daemon
+detenga la grabación y empiece a transcribir sin esperar a la tecla
+"""
+
+import numpy as np
+
+class SilenceEndpointer:
+    """
+    detector de silencio final tras voz basado en la energía rms por bloque
+    """
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        silence_ms: int = 800,
+        min_speech_ms: int = 250,
+        energy_threshold: float = 0.01,
+    ) -> None:
+        """
+        inicializa el detector
+
+        args:
+            sample_rate: frecuencia de muestreo de los bloques
+            silence_ms: silencio continuo tras la voz que marca el final
+            min_speech_ms: voz continua necesaria antes de armar el detector
+                evita que un clic o un golpe en la mesa dispare el corte
+            energy_threshold: nivel rms (escala float32 -1..1) a partir del cual
+                un bloque se considera voz
+        """
+        self.silence_samples = int(sample_rate * silence_ms / 1000)
+        self.min_speech_samples = int(sample_rate * min_speech_ms / 1000)
+        # se compara la energía media al cuadrado para evitar la raíz
+        self._threshold_sq = energy_threshold * energy_threshold
+        self.reset()
+
+    def reset(self) -> None:
+        """reinicia el estado para una nueva grabación"""
+        self._speech_run = 0
+        self._silence_run = 0
+        self._speech_detected = False
+        self._fired = False
+
+    @property
+    def speech_detected(self) -> bool:
+        """indica si ya se detectó voz en la grabación actual"""
+        return self._speech_detected
+
+    def process(self, block: np.ndarray) -> bool:
+        """
+        analiza un bloque de audio del callback
+
+        no reserva memoria `np.dot` sobre la vista aplanada calcula la energía
+        sin crear arrays intermedios por lo que es seguro en el hilo de tiempo real
+
+        args:
+            block: bloque con forma (frames channels) o (frames)
+
+        returns:
+            true solo en el bloque en que se detecta el final del habla
+        """
+        if self._fired:
+            return False
+
+        frames = block.shape[0]
+        samples = block.reshape(-1)
+        if samples.size == 0:
+            return False
+
+        energy = float(np.dot(samples, samples)) / samples.size
+
+        if energy >= self._threshold_sq:
+            self._speech_run += frames
+            self._silence_run = 0
+            if self._speech_run >= self.min_speech_samples:
+                self._speech_detected = True
+        else:
+            self._silence_run += frames
+            if not self._speech_detected:
+                self._speech_run = 0
+
+        if self._speech_detected and self._silence_run >= self.silence_samples:
+            self._fired = True
+            return True
+        return False
@@ -0,0 +1,137 @@
+"""
+módulo que implementa el diario de grabación en disco mapeado en memoria
+
+el `recordingjournal` es un `audiobuffer` cuyas muestras viven en un archivo
+mapeado con `np.memmap` en lugar de en la memoria del proceso esto permite
+sesiones de dictado de horas con memoria residente casi nula (el kernel puede
+descartar las páginas ya escritas) y que una grabación sobreviva a un cierre
+inesperado del daemon
+
+formato del archivo
+-   cabecera de 4096 bytes con magic frecuencia canales y fotogramas escritos
+-   muestras float32 intercaladas por canal a partir del byte 4096
+
+el archivo se crea disperso (sparse) por lo que reservar horas de capacidad
+no ocupa disco hasta que se escribe las páginas modificadas quedan en la caché
+del kernel así que sobreviven a la caída del proceso sin necesidad de `flush`
+en la ruta crítica de la parada
+"""
+
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from v2m.infrastructure.audio.buffer import AudioBuffer
+
+JOURNAL_MAGIC = b"V2MJRNL1"
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("sample_rate", "<i8"),
+    ("channels", "<i8"),
+    ("frames", "<i8"),
+])
+# los datos empiezan alineados a página para que el mapeo sea directo
+DATA_OFFSET = 4096
+SAMPLE_DTYPE = np.dtype("<f4")
+
+class RecordingJournal(AudioBuffer):
+    """
+    buffer de grabación respaldado por un archivo mapeado en memoria
+    """
+    def __init__(self, path: Path, capacity: int, sample_rate: int, channels: int = 1) -> None:
+        """
+        crea un diario nuevo en `path` sustituyendo cualquier diario anterior
+
+        el archivo previo se desvincula antes de crear el nuevo así una vista
+        de la grabación anterior que aún se esté transcribiendo sigue siendo
+        válida (el mapeo mantiene vivo el inodo original)
+
+        args:
+            path: ruta del archivo del diario
+            capacity: número máximo de fotogramas
+            sample_rate: frecuencia de muestreo que se guarda en la cabecera
+            channels: número de canales de audio
+        """
+        if capacity <= 0:
+            raise ValueError("la capacidad del buffer debe ser mayor que cero")
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+
+        with open(self.path, "wb") as f:
+            f.truncate(DATA_OFFSET + capacity * channels * SAMPLE_DTYPE.itemsize)
+
+        self._header = np.memmap(self.path, dtype=HEADER_DTYPE, mode="r+", shape=(1,))
+        self._header["magic"] = JOURNAL_MAGIC
+        self._header["sample_rate"] = sample_rate
+        self._header["channels"] = channels
+        self._header["frames"] = 0
+        # vista del campo precalculada para actualizarlo desde el callback sin crear objetos
+        self._frames_field = self._header["frames"]
+
+        self._data = np.memmap(
+            self.path, dtype=SAMPLE_DTYPE, mode="r+", offset=DATA_OFFSET, shape=(capacity, channels)
+        )
+        self._size = 0
+
+    def write(self, block: np.ndarray) -> int:
+        """
+        escribe un bloque en el archivo mapeado y actualiza la cabecera
+
+        la cabecera se actualiza después de los datos para que tras un cierre
+        inesperado nunca apunte a muestras sin escribir
+
+        args:
+            block: array con forma (frames channels) o (frames)
+
+        returns:
+            el número de fotogramas escritos
+        """
+        n = super().write(block)
+        if n:
+            self._frames_field[0] = self._size
+        return n
+
+    @staticmethod
+    def recover(path: Path) -> Optional[np.ndarray]:
+        """
+        abre en solo lectura un diario dejado por una sesión anterior
+
+        args:
+            path: ruta del archivo del diario
+
+        returns:
+            vista `np.memmap` unidimensional con el audio recuperado o none si
+            no existe un diario válido con audio
+        """
+        path = Path(path).expanduser()
+        try:
+            if not path.exists() or path.stat().st_size < DATA_OFFSET:
+                return None
+            header = np.memmap(path, dtype=HEADER_DTYPE, mode="r", shape=(1,))[0]
+        except (OSError, ValueError):
+            return None
+
+        if header["magic"] != JOURNAL_MAGIC:
+            return None
+
+        frames = int(header["frames"])
+        channels = int(header["channels"])
+        if channels <= 0:
+            return None
+        available = (path.stat().st_size - DATA_OFFSET) // (channels * SAMPLE_DTYPE.itemsize)
+        frames = min(frames, available)
+        if frames <= 0:
+            return None
+
+        data = np.memmap(path, dtype=SAMPLE_DTYPE, mode="r", offset=DATA_OFFSET, shape=(frames, channels))
+        return data.reshape(-1)
+
+    @staticmethod
+    def discard(path: Path) -> None:
+        """
+        elimina el diario una vez que su audio ya fue transcrito
+
+        args:
+            path: ruta del archivo del diario
+        """
+        Path(path).expanduser().unlink(missing_ok=True)
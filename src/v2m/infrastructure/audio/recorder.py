@@ -3,75 +3,252 @@ import numpy as np
 import threading
 import wave
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Optional
 from v2m.core.logging import logger
 from v2m.domain.errors import RecordingError
+from v2m.infrastructure.audio.buffer import AudioBuffer, RingBuffer
+from v2m.infrastructure.audio.endpointer import SilenceEndpointer
+from v2m.infrastructure.audio.journal import RecordingJournal
 
 class AudioRecorder:
-    def __init__(self, sample_rate: int = 16000, channels: int = 1):
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        endpointer: Optional[SilenceEndpointer] = None,
+        warm_stream: bool = False,
+        preroll_ms: int = 500,
+        idle_close_seconds: float = 0.0,
+        max_seconds: float = 10 * 60,
+        journal_path: Optional[Path] = None,
+    ):
+        """
+        inicializa el grabador
+
+        args:
+            sample_rate: frecuencia de muestreo de la captura
+            channels: número de canales de audio
+            endpointer: detector opcional de fin de habla
+            warm_stream: mantener el stream de captura abierto entre grabaciones
+                abrir el dispositivo en pulseaudio/pipewire cuesta decenas o
+                cientos de ms y suele cortar la primera sílaba
+            preroll_ms: audio previo al inicio que se conserva con el stream abierto
+            idle_close_seconds: cerrar el stream tras este tiempo sin grabar (0 nunca)
+            max_seconds: duración máxima de una grabación el resto se descarta
+            journal_path: si se indica las muestras se escriben en un diario
+                mapeado en memoria en esa ruta en lugar de en RAM
+        """
         self.sample_rate = sample_rate
         self.channels = channels
+        # detector opcional de fin de habla cuando dispara se invoca on_endpoint
+        # desde el hilo de audio por lo que el callback debe ser no bloqueante
+        self.endpointer = endpointer
+        self.on_endpoint: Optional[Callable[[], None]] = None
+        self.warm_stream = warm_stream
+        self.idle_close_seconds = idle_close_seconds
         self._recording = False
-        self._frames: List[np.ndarray] = []
+        self._buffer: Optional[AudioBuffer] = None
+        self._preroll: Optional[RingBuffer] = None
+        if warm_stream and preroll_ms > 0:
+            self._preroll = RingBuffer(int(sample_rate * preroll_ms / 1000), channels)
         self._stream: Optional[sd.InputStream] = None
+        self._idle_timer: Optional[threading.Timer] = None
         self._lock = threading.Lock()
-        # duración máxima para evitar oom 10 minutos
-        self.max_samples = 10 * 60 * sample_rate
-        self.current_samples = 0
+        # duración máxima para evitar oom (10 minutos por defecto en RAM)
+        self.max_samples = int(max_seconds * sample_rate)
+        self.journal_path = journal_path
 
-    def start(self):
-        if self._recording:
-            raise RecordingError("grabación ya en progreso")
+    @property
+    def current_samples(self) -> int:
+        """número de fotogramas capturados en la grabación actual"""
+        return self._buffer.size if self._buffer else 0
 
-        self._recording = True
-        self._frames = []
-        self.current_samples = 0
+    @property
+    def is_recording(self) -> bool:
+        """indica si hay una grabación en curso"""
+        return self._recording
 
-        def callback(indata, frames, time, status):
-            if status:
-                logger.warning(f"estado de la grabación de audio {status}")
-            with self._lock:
-                if self._recording:
-                    if self.current_samples < self.max_samples:
-                        self._frames.append(indata.copy())
-                        self.current_samples += frames
-                    else:
-                        # detener la grabación si se alcanza la duración máxima (o simplemente dejar de añadir)
-                        pass
+    def peek(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """
+        devuelve una vista del audio capturado sin detener la grabación
+
+        permite que consumidores en segundo plano (ej la transcripción en
+        streaming) lean ventanas ya completas mientras el callback sigue
+        escribiendo más adelante en el buffer
+
+        args:
+            start: primer fotograma a incluir
+            end: fotograma final (exclusivo) por defecto lo capturado hasta ahora
+
+        returns:
+            vista de numpy sin copia vacía si no hay grabación
+        """
+        with self._lock:
+            buffer = self._buffer
+            if buffer is None:
+                return np.array([], dtype=np.float32)
+            return buffer.view(start, end)
+
+    def _callback(self, indata, frames, time, status):
+        if status:
+            logger.warning(f"estado de la grabación de audio {status}")
+        with self._lock:
+            if not self._recording:
+                # stream caliente entre grabaciones solo se alimenta el pre-roll
+                if self._preroll is not None:
+                    self._preroll.write(indata)
+                return
+            # una única asignación por slice sin copias ni listas intermedias
+            # al alcanzar la duración máxima simplemente se deja de añadir
+            self._buffer.write(indata)
+        endpointer = self.endpointer
+        if endpointer and endpointer.process(indata) and self.on_endpoint:
+            logger.info("silencio final detectado deteniendo grabación automáticamente")
+            self.on_endpoint()
+
+    def open(self):
+        """
+        abre el stream de captura si no lo está
+
+        con `warm_stream` se llama al arrancar el daemon para que la primera
+        grabación no pague la apertura del dispositivo
 
+        raises:
+            recordingerror: si no se pudo abrir el dispositivo
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+        if self._stream is not None:
+            return
         try:
-            self._stream = sd.InputStream(
+            stream = sd.InputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                callback=callback,
+                callback=self._callback,
                 dtype="float32"
             )
-            self._stream.start()
-            logger.info("grabación de audio iniciada")
+            stream.start()
         except Exception as e:
-            self._recording = False
             raise RecordingError(f"falló al iniciar la grabación {e}") from e
+        self._stream = stream
+        if self.warm_stream:
+            logger.info("stream de captura abierto en modo caliente")
 
-    def stop(self, save_path: Optional[Path] = None) -> np.ndarray:
-        if not self._recording:
-             # si los fotogramas están vacíos y no se está grabando entonces no ha pasado nada
-             if not self._frames and not self._stream:
-                 raise RecordingError("no hay grabación en curso")
+    def close(self):
+        """
+        cierra el stream de captura y descarta el pre-roll
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._recording:
+                return
+            stream, self._stream = self._stream, None
+            if self._preroll is not None:
+                self._preroll.clear()
+        if stream:
+            stream.stop()
+            stream.close()
+            if self.warm_stream:
+                logger.info("stream de captura cerrado")
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
 
+    def _schedule_idle_close(self):
+        if self.idle_close_seconds <= 0:
+            return
         with self._lock:
+            self._cancel_idle_timer()
+            self._idle_timer = threading.Timer(self.idle_close_seconds, self.close)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _new_buffer(self) -> AudioBuffer:
+        if self.journal_path is not None:
+            return RecordingJournal(self.journal_path, self.max_samples, self.sample_rate, self.channels)
+        return AudioBuffer(self.max_samples, self.channels)
+
+    def recover_journal(self) -> Optional[np.ndarray]:
+        """
+        devuelve el audio de un diario dejado por una sesión anterior
+
+        returns:
+            vista `np.memmap` del audio o none si no hay diario recuperable
+        """
+        if self.journal_path is None or self._recording:
+            return None
+        return RecordingJournal.recover(self.journal_path)
+
+    def discard_journal(self) -> None:
+        """
+        elimina el diario de la última grabación una vez transcrito
+
+        las vistas ya abiertas siguen siendo válidas hasta que se liberan
+        """
+        if self.journal_path is not None and not self._recording:
+            RecordingJournal.discard(self.journal_path)
+
+    def start(self):
+        if self._recording:
+            raise RecordingError("grabación ya en progreso")
+
+        # se reserva un buffer nuevo en cada grabación para que la vista devuelta
+        # por la grabación anterior siga siendo válida mientras se transcribe
+        try:
+            buffer = self._new_buffer()
+        except OSError as e:
+            raise RecordingError(f"falló al crear el diario de grabación {e}") from e
+        if self.endpointer:
+            self.endpointer.reset()
+
+        with self._lock:
+            self._cancel_idle_timer()
+            # con el stream caliente el inicio solo marca el punto de corte e
+            # incorpora el pre-roll acumulado antes de la pulsación
+            if self._preroll is not None:
+                for part in self._preroll.parts():
+                    buffer.write(part)
+                self._preroll.clear()
+            self._buffer = buffer
+            self._recording = True
+
+        # se abre después de marcar la grabación para que un cierre por
+        # inactividad concurrente no pueda cerrar el stream recién usado
+        try:
+            self.open()
+        except RecordingError:
+            with self._lock:
+                self._recording = False
+                self._buffer = None
+            raise
+
+        logger.info("grabación de audio iniciada")
+
+    def stop(self, save_path: Optional[Path] = None) -> np.ndarray:
+        with self._lock:
+            if not self._recording and self._buffer is None:
+                raise RecordingError("no hay grabación en curso")
             self._recording = False
+            buffer, self._buffer = self._buffer, None
 
-        if self._stream:
-            self._stream.stop()
-            self._stream.close()
-            self._stream = None
+        if self.warm_stream:
+            # el stream sigue abierto solo se marca el final de la grabación
+            self._schedule_idle_close()
+        else:
+            self.close()
 
         logger.info("grabación de audio detenida")
 
-        if not self._frames:
+        if buffer is None or buffer.size == 0:
             return np.array([], dtype=np.float32)
 
-        audio = np.concatenate(self._frames, axis=0).flatten()
+        if buffer.full:
+            logger.warning("se alcanzó la duración máxima de grabación el audio posterior se descartó")
+
+        # vista sin copia sobre el buffer preasignado (np.memmap con diario)
+        audio = buffer.view()
 
         if save_path:
             # convertir float32 a int16 para wav
@@ -0,0 +1,222 @@
+"""
+módulo que implementa la caché de respuestas del LLM
+
+volver a ejecutar `PROCESS_TEXT` sobre el mismo texto del portapapeles pagaba
+cada vez una llamada completa a GEMINI con sus reintentos
+`cachedllmservice` envuelve cualquier `llmservice` con una LRU en memoria
+respaldada por SQLite en disco
+
+la clave es el sha256 del texto normalizado y de la identidad del servicio
+(modelo temperatura y system prompt) así cambiar `refine_system.txt` o el
+modelo invalida la caché sin borrarla las entradas caducan por TTL y el
+archivo se poda por número de entradas
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from v2m.application.llm_service import LLMService
+from v2m.core.logging import logger
+from v2m.core.segment_stream import SegmentStream
+
+def normalize_text(text: str) -> str:
+    """colapsa los espacios para que el mismo dictado pegado de otra forma comparta entrada"""
+    return " ".join(text.split())
+
+class CachedLLMService(LLMService):
+    """
+    decorador de `llmservice` con caché en memoria y en disco
+    """
+    def __init__(
+        self,
+        inner: LLMService,
+        path: Path,
+        memory_entries: int = 128,
+        max_entries: int = 2000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        partial_stream: Optional[SegmentStream] = None,
+    ) -> None:
+        """
+        args:
+            inner: el servicio que atiende los fallos de caché
+            path: archivo SQLite de la caché persistente
+            memory_entries: entradas de la LRU en memoria
+            max_entries: entradas máximas en disco (se descartan las menos usadas)
+            ttl_seconds: antigüedad a partir de la que una entrada caduca
+            partial_stream: difusor del servicio envuelto donde se publican los aciertos
+        """
+        self.inner = inner
+        self.partial_stream = partial_stream
+        self.memory_entries = max(1, memory_entries)
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # la conexión se comparte entre hilos las consultas se serializan aparte
+        # de la LRU para que un acierto en memoria no espere al disco
+        self._db_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+
+    def key(self, text: str) -> str:
+        """
+        clave de caché de un texto para el servicio envuelto
+
+        args:
+            text: el texto de entrada
+
+        returns:
+            el sha256 en hexadecimal
+        """
+        digest = hashlib.sha256(self.inner.cache_identity().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        busca una respuesta en memoria y después en disco
+
+        args:
+            key: clave de `key`
+
+        returns:
+            la respuesta guardada o none si no existe o caducó
+        """
+        value = self._lookup_memory(key)
+        return value if value is not None else self._lookup_disk(key)
+
+    def _lookup_memory(self, key: str) -> Optional[str]:
+        """busca en la LRU en memoria (microsegundos se puede llamar desde el loop)"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            value, created = entry
+            if time.time() - created >= self.ttl_seconds:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return value
+
+    def _lookup_disk(self, key: str) -> Optional[str]:
+        """busca en SQLite (bloqueante se ejecuta fuera del loop)"""
+        now = time.time()
+        with self._db_lock:
+            row = self._db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] < self.ttl_seconds:
+                self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row is None or now - row[1] >= self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+        return row[0]
+
+    def store(self, key: str, value: str) -> None:
+        """
+        guarda una respuesta en memoria y en disco
+
+        args:
+            key: clave de `key`
+            value: respuesta del LLM
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        self._store_disk(key, value, now)
+
+    def _store_disk(self, key: str, value: str, created: float) -> None:
+        """escribe la entrada en SQLite y poda las menos usadas (bloqueante)"""
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, created, created),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    async def process_text(self, text: str) -> str:
+        """
+        devuelve la respuesta guardada o la pide al servicio envuelto
+
+        la LRU en memoria se consulta en el loop y SQLite en un hilo para que
+        el disco nunca bloquee al daemon un acierto también se publica en
+        `partial_stream` como texto final igual que una respuesta nueva
+
+        args:
+            text: el texto a procesar
+
+        returns:
+            el texto refinado
+        """
+        key = self.key(text)
+        cached = self._lookup_memory(key)
+        if cached is None:
+            cached = await asyncio.to_thread(self._lookup_disk, key)
+        if cached is not None:
+            logger.info("respuesta del LLM servida desde la caché")
+            if self.partial_stream is not None:
+                self.partial_stream.complete(cached)
+            return cached
+
+        result = await self.inner.process_text(text)
+        now = time.time()
+        with self._lock:
+            self._remember(key, result, now)
+        await asyncio.to_thread(self._store_disk, key, result, now)
+        return result
+
+    def cache_identity(self) -> str:
+        return self.inner.cache_identity()
+
+    def metrics(self) -> dict:
+        """
+        devuelve las métricas del servicio envuelto y las de la caché
+
+        returns:
+            diccionario con aciertos en memoria y disco fallos tasa de acierto y entradas
+        """
+        metrics = dict(self.inner.metrics())
+        with self._db_lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            metrics["cache"] = {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 3) if total else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": entries,
+            }
+        return metrics
@@ -0,0 +1,192 @@
+"""
+módulo que calibra `compute_type` `cpu_threads` y `num_workers` para esta máquina
+
+los valores de `[whisper]` en `config.toml` se ajustaron a mano para un equipo
+concreto la calibración (opcional) decodifica un clip de referencia con cada
+combinación candidata guarda la más rápida para la máquina y el modelo en un
+archivo de caché y el cargador del modelo la usa en los siguientes arranques
+
+la puntuación es el tiempo de pared de `concurrency` transcripciones
+simultáneas del clip que refleja el caso real del daemon (borrador y refinado
+o ventana de streaming y cola a la vez) y permite comparar `num_workers`
+"""
+
+import json
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from v2m.core.logging import logger
+
+# tipos preferidos por dispositivo se filtran con los que soporta CTranslate2
+COMPUTE_TYPE_CANDIDATES = {
+    "cuda": ("float16", "int8_float16", "bfloat16", "int8"),
+    "cpu": ("int8", "int8_float32", "float32"),
+}
+
+def synthetic_clip(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    """
+    genera un clip sintético con estructura parecida a la voz
+
+    armónicos de una fundamental de 140 Hz modulados a ritmo silábico (4 Hz)
+    sobre ruido de fondo suave es suficiente para recorrer el VAD y el
+    decodificador con formas de tensor realistas
+
+    args:
+        seconds: duración del clip
+        sample_rate: frecuencia de muestreo
+
+    returns:
+        array float32 mono
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    voiced = sum(np.sin(2 * np.pi * 140.0 * k * t) / k for k in range(1, 8))
+    envelope = 0.5 * (1.0 - np.cos(2 * np.pi * 4.0 * t))
+    clip = 0.1 * voiced * envelope + 0.003 * rng.standard_normal(t.size)
+    return clip.astype(np.float32)
+
+def machine_key(model: str, device: str) -> str:
+    """
+    clave de la caché una calibración solo vale para la misma máquina y modelo
+
+    args:
+        model: nombre o ruta del modelo
+        device: dispositivo de CTranslate2
+
+    returns:
+        la clave del archivo de caché
+    """
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}|{model}|{device}"
+
+def load_calibration(path: Path, model: str, device: str) -> Optional[dict]:
+    """
+    lee la configuración calibrada para esta máquina y modelo
+
+    args:
+        path: archivo de caché
+        model: nombre o ruta del modelo
+        device: dispositivo de CTranslate2
+
+    returns:
+        diccionario con `compute_type` `cpu_threads` y `num_workers` o none
+    """
+    try:
+        with open(Path(path).expanduser(), "r") as f:
+            return json.load(f).get(machine_key(model, device))
+    except (OSError, ValueError):
+        return None
+
+def save_calibration(path: Path, model: str, device: str, result: dict) -> None:
+    """
+    guarda la configuración calibrada conservando las de otras máquinas o modelos
+
+    args:
+        path: archivo de caché
+        model: nombre o ruta del modelo
+        device: dispositivo de CTranslate2
+        result: configuración ganadora
+    """
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache[machine_key(model, device)] = result
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, path)
+
+def candidate_settings(device: str, cpu_count: int, supported: Optional[set] = None) -> List[dict]:
+    """
+    combinaciones a medir
+
+    args:
+        device: dispositivo de CTranslate2
+        cpu_count: núcleos disponibles para WHISPER
+        supported: tipos soportados por CTranslate2 (none no filtra)
+
+    returns:
+        lista de diccionarios `compute_type` `cpu_threads` `num_workers`
+    """
+    compute_types = [c for c in COMPUTE_TYPE_CANDIDATES.get(device, ("default",)) if supported is None or c in supported]
+    candidates = []
+    for compute_type in compute_types:
+        for num_workers in (1, 2):
+            # los hilos se reparten entre las réplicas igual que en `threadbudget`
+            for total in sorted({cpu_count, max(1, cpu_count // 2)}, reverse=True):
+                candidates.append({
+                    "compute_type": compute_type,
+                    "cpu_threads": max(1, total // num_workers),
+                    "num_workers": num_workers,
+                })
+    return candidates
+
+class Calibrator:
+    """
+    mide las combinaciones candidatas sobre un clip de referencia
+    """
+    def __init__(self, build_model: Callable[[dict], object], repeats: int = 2, concurrency: int = 2) -> None:
+        """
+        args:
+            build_model: construye un `whispermodel` con una combinación candidata
+            repeats: mediciones por combinación (se toma la mejor)
+            concurrency: transcripciones simultáneas por medición
+        """
+        self.build_model = build_model
+        self.repeats = max(1, repeats)
+        self.concurrency = max(1, concurrency)
+
+    def _measure(self, model, clip: np.ndarray, language: Optional[str]) -> float:
+        """
+        tiempo de pared de `concurrency` transcripciones simultáneas del clip
+
+        raises:
+            exception: el error de cualquiera de las transcripciones (ej CUDA sin
+            memoria) una combinación que falla al decodificar no puede ganar
+        """
+        def decode():
+            segments, _ = model.transcribe(clip, language=language, beam_size=1, vad_filter=False)
+            list(segments)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [pool.submit(decode) for _ in range(self.concurrency)]
+            for future in futures:
+                future.result()
+        return time.perf_counter() - started
+
+    def run(self, candidates: List[dict], clip: np.ndarray, language: Optional[str] = None) -> Optional[dict]:
+        """
+        mide cada combinación y devuelve la más rápida
+
+        args:
+            candidates: combinaciones de `candidate_settings`
+            clip: audio de referencia
+            language: idioma fijo para no medir la detección
+
+        returns:
+            la combinación ganadora con su tiempo en `seconds` o none si ninguna cargó
+        """
+        best: Optional[dict] = None
+        for settings in candidates:
+            try:
+                model = self.build_model(settings)
+                self._measure(model, clip, language)  # calentamiento
+                seconds = min(self._measure(model, clip, language) for _ in range(self.repeats))
+            except Exception as e:
+                logger.warning(f"calibración descartó {settings} {e}")
+                continue
+            finally:
+                model = None
+
+            logger.info(f"calibración {settings} {seconds:.3f}s")
+            if best is None or seconds < best["seconds"]:
+                best = dict(settings, seconds=round(seconds, 4))
+        return best
@@ -0,0 +1,140 @@
+"""
+módulo que implementa la puerta de energía previa al VAD neuronal
+
+la `energygate` calcula la energía de tramas cortas de forma vectorizada y la
+compara con una estimación adaptativa del ruido de fondo en microsegundos
+decide si la grabación contiene algo que merezca pasar por silero y WHISPER
+(una pulsación accidental de la tecla se descarta sin cargar ningún modelo)
+y recorta el silencio inicial y final antes de las etapas pesadas
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+from v2m.core.logging import logger
+
+def _db_to_power(db: float) -> float:
+    return float(10.0 ** (db / 10.0))
+
+class EnergyGate:
+    """
+    puerta de energía rms con suelo de ruido adaptativo
+    """
+    # límites del suelo de ruido estimado (dBFS) el techo evita que una
+    # grabación compuesta solo de voz se tome como ruido y se descarte entera
+    MIN_NOISE_FLOOR_DB = -70.0
+    MAX_NOISE_FLOOR_DB = -45.0
+    # percentil de las tramas que se toma como ruido de fondo
+    NOISE_PERCENTILE = 10.0
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        margin_db: float = 10.0,
+        min_active_ms: int = 100,
+        pad_ms: int = 200,
+        adaptation: float = 0.2,
+    ) -> None:
+        """
+        inicializa la puerta
+
+        args:
+            sample_rate: frecuencia de muestreo del audio
+            frame_ms: duración de cada trama de análisis
+            margin_db: cuánto por encima del suelo de ruido debe estar una trama activa
+            min_active_ms: energía activa mínima para considerar que hay algo que transcribir
+            pad_ms: margen que se conserva antes y después de la actividad al recortar
+            adaptation: peso de cada grabación en la media móvil del suelo de ruido
+        """
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, int(sample_rate * frame_ms / 1000))
+        self.margin_db = margin_db
+        self.min_active_frames = max(1, int(min_active_ms / frame_ms))
+        self.pad_samples = int(sample_rate * pad_ms / 1000)
+        self.adaptation = adaptation
+        # suelo de ruido en potencia lineal (none hasta la primera grabación)
+        self.noise_floor: Optional[float] = None
+
+    @property
+    def noise_floor_db(self) -> Optional[float]:
+        """suelo de ruido estimado en dBFS"""
+        if self.noise_floor is None:
+            return None
+        return 10.0 * float(np.log10(max(self.noise_floor, 1e-12)))
+
+    def frame_energies(self, audio: np.ndarray) -> np.ndarray:
+        """
+        calcula la energía media de cada trama completa sin copiar el audio
+
+        args:
+            audio: array float32 unidimensional
+
+        returns:
+            array con la potencia media de cada trama
+        """
+        n = audio.shape[0] // self.frame_samples
+        if n == 0:
+            return np.empty(0, dtype=np.float32)
+        frames = audio[:n * self.frame_samples].reshape(n, self.frame_samples)
+        return np.einsum("ij,ij->i", frames, frames) / self.frame_samples
+
+    def _update_noise_floor(self, energies: np.ndarray) -> float:
+        """
+        actualiza la estimación del ruido de fondo con las tramas más silenciosas
+        """
+        estimate = float(np.percentile(energies, self.NOISE_PERCENTILE))
+        estimate = min(max(estimate, _db_to_power(self.MIN_NOISE_FLOOR_DB)), _db_to_power(self.MAX_NOISE_FLOOR_DB))
+        if self.noise_floor is None:
+            self.noise_floor = estimate
+        else:
+            self.noise_floor += self.adaptation * (estimate - self.noise_floor)
+        # el umbral usa el menor de ambos si el entorno se volvió más ruidoso
+        # la puerta recorta menos que es el lado seguro
+        return min(estimate, self.noise_floor)
+
+    def trim(self, audio: np.ndarray) -> Tuple[int, int]:
+        """
+        localiza la región con actividad en el audio
+
+        args:
+            audio: array float32 unidimensional
+
+        returns:
+            tupla (inicio fin) en muestras (0 0) si no hay actividad suficiente
+        """
+        energies = self.frame_energies(audio)
+        if energies.size == 0:
+            return 0, 0
+
+        noise = self._update_noise_floor(energies)
+        threshold = noise * _db_to_power(self.margin_db)
+        active = np.flatnonzero(energies > threshold)
+
+        if active.size < self.min_active_frames:
+            return 0, 0
+
+        start = max(int(active[0]) * self.frame_samples - self.pad_samples, 0)
+        end = min((int(active[-1]) + 1) * self.frame_samples + self.pad_samples, audio.shape[0])
+        return start, end
+
+    def apply(self, audio: np.ndarray) -> Tuple[np.ndarray, int]:
+        """
+        recorta el silencio inicial y final devolviendo una vista sin copia
+
+        args:
+            audio: array float32 unidimensional
+
+        returns:
+            tupla (vista recortada desplazamiento de inicio) la vista está vacía
+            si la puerta rechaza la grabación
+        """
+        start, end = self.trim(audio)
+        if end <= start:
+            logger.info("puerta de energía no detectó actividad sobre el ruido de fondo")
+            return audio[:0], 0
+        if start > 0 or end < audio.shape[0]:
+            logger.info(
+                f"puerta de energía recortó {start / self.sample_rate:.2f}s al inicio "
+                f"y {(audio.shape[0] - end) / self.sample_rate:.2f}s al final"
+            )
+        return audio[start:end], start
@@ -4,17 +4,36 @@ módulo que implementa el servicio de LLM utilizando la API de GOOGLE GEMINI
 esta es una implementación concreta de la interfaz `llmservice` es responsable
 de toda la lógica de comunicación con el servicio de GOOGLE GEMINI incluyendo
 la autenticación la construcción de la solicitud y el manejo de reintentos
+
+con `gemini.stream` la respuesta se consume en fragmentos con
+`generate_content_stream` cada fragmento se publica en cuanto llega y se
+registran por separado el tiempo hasta el primer token y el tiempo total si
+un intento falla a mitad se publica un `reset` antes del reintento y si
+fallan todos un `fail` como evento terminal
+
+un texto de más de `gemini.max_input_chars` caracteres se divide en párrafos
+o frases y los fragmentos se refinan en paralelo (como mucho
+`gemini.max_concurrent_chunks` a la vez) la latencia pasa a depender del
+fragmento más lento y no de la longitud total
 """
 
 from v2m.application.llm_service import LLMService
-from v2m.config import config, BASE_DIR
+from v2m.config import config
 from google import genai
+import asyncio
+import hashlib
 import os
 from dotenv import load_dotenv
+import time
 from pathlib import Path
+from typing import Optional, Tuple
 from tenacity import retry, stop_after_attempt, wait_exponential
 from v2m.domain.errors import LLMError
 from v2m.core.logging import logger
+from v2m.core.segment_stream import SegmentStream
+from v2m.infrastructure.llm_latency import LLMLatencyStats
+from v2m.infrastructure.refine_prompt import load_system_prompt
+from v2m.infrastructure.text_chunking import refine_chunks, split_text
 
 class GeminiLLMService(LLMService):
     """
@@ -23,7 +42,7 @@ class GeminiLLMService(LLMService):
     gestiona la configuración del cliente de la API la formulación de las
     peticiones y la lógica de reintentos para asegurar una comunicación robusta
     """
-    def __init__(self) -> None:
+    def __init__(self, partial_stream: Optional[SegmentStream] = None) -> None:
         """
         inicializa el servicio de GOOGLE GEMINI
 
@@ -32,6 +51,9 @@ class GeminiLLMService(LLMService):
         2.  configura e instancia el cliente de la API de GOOGLE
         3.  almacena los parámetros del modelo y la configuración de reintentos
 
+        args:
+            partial_stream: difusor al que se publica cada fragmento de la respuesta en streaming
+
         raises:
             llmerror: si la `GEMINI_API_KEY` no se encuentra en la configuración
         """
@@ -49,15 +71,44 @@ class GeminiLLMService(LLMService):
         self.model = gemini_config.model
         self.temperature = gemini_config.temperature
         self.max_tokens = gemini_config.max_tokens
+        self.request_timeout = gemini_config.request_timeout
+        self.max_input_chars = gemini_config.max_input_chars
+        self.max_concurrent_chunks = max(1, gemini_config.max_concurrent_chunks)
+        self.stream = gemini_config.stream
+        self.partial_stream = partial_stream
+        self.latency = LLMLatencyStats()
 
         # cargar system prompt
-        prompt_path = BASE_DIR / "prompts" / "refine_system.txt"
+        self.system_instruction = load_system_prompt()
+
+    async def process_text(self, text: str) -> str:
+        """
+        procesa un texto utilizando el modelo de GOOGLE GEMINI
+
+        los textos que superan `max_input_chars` se refinan por fragmentos
+        en paralelo y se vuelven a unir en orden
+
+        args:
+            text: el texto a procesar
+
+        returns:
+            el texto refinado por el LLM
+
+        raises:
+            llmerror: si la comunicación con la API falla después de todos los reintentos
+        """
+        chunks = split_text(text, self.max_input_chars)
         try:
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                self.system_instruction = f.read()
-        except FileNotFoundError:
-            logger.warning("system prompt no encontrado usando default")
-            self.system_instruction = "eres un editor de texto experto"
+            if len(chunks) == 1:
+                return await self._refine(text, publish=True)
+            return await refine_chunks(
+                chunks, lambda chunk: self._refine(chunk, publish=False), self.max_concurrent_chunks, self.partial_stream
+            )
+        except (Exception, asyncio.CancelledError) as e:
+            # los suscriptores siempre reciben un evento terminal
+            if self.partial_stream is not None:
+                self.partial_stream.fail(str(e) or type(e).__name__)
+            raise
 
     @retry(
         stop=stop_after_attempt(config.gemini.retry_attempts),
@@ -67,15 +118,16 @@ class GeminiLLMService(LLMService):
             max=config.gemini.retry_max_wait,
         ),
     )
-    async def process_text(self, text: str) -> str:
+    async def _refine(self, text: str, publish: bool = True) -> str:
         """
-        procesa un texto utilizando el modelo de GOOGLE GEMINI
+        envía una única solicitud a GEMINI
 
         implementa una estrategia de reintentos con `tenacity` para manejar
         errores transitorios de red o de la API de forma resiliente
 
         args:
             text: el texto a procesar
+            publish: publica los fragmentos del streaming en `partial_stream`
 
         returns:
             el texto refinado por el LLM
@@ -99,20 +151,96 @@ class GeminiLLMService(LLMService):
                 )
             ]
 
-            response = await self.client.aio.models.generate_content(
-                model=self.model,
-                contents=contents,
-                config=generation_config
-            )
+            started = time.perf_counter()
+            first_token = None
+            # `request_timeout` acota cada intento el plazo total lo impone `processtexthandler`
+            async with asyncio.timeout(self.request_timeout or None):
+                if self.stream:
+                    text, first_token = await self._generate_stream(contents, generation_config, started, publish)
+                else:
+                    response = await self.client.aio.models.generate_content(
+                        model=self.model,
+                        contents=contents,
+                        config=generation_config
+                    )
+                    text = response.text or ""
+            self.latency.record(first_token, time.perf_counter() - started, len(text))
+
             logger.info("procesamiento con GEMINI completado")
-            if response.text:
-                return response.text.strip()
-            else:
+            if not text.strip():
                 raise LLMError("respuesta vacía de GEMINI")
+            # el texto final se publica solo tras validar la respuesta un
+            # intento vacío que se reintenta no deja un resultado espurio
+            if publish and self.partial_stream is not None:
+                self.partial_stream.complete(text.strip())
+            return text.strip()
         except Exception as e:
+            self.latency.record_failure()
             # --- manejo de errores ---
             # se captura cualquier excepción de la librería de GOOGLE o de red
             # y se relanza como un error de dominio para no filtrar detalles
             # de la infraestructura a la capa de aplicación
             logger.error(f"error procesando texto con GEMINI {e}")
             raise LLMError("falló el procesamiento de texto con GEMINI") from e
+
+    async def _generate_stream(self, contents: list, generation_config: dict, started: float, publish: bool = True) -> Tuple[str, Optional[float]]:
+        """
+        consume la respuesta en streaming acumulando los fragmentos
+
+        args:
+            contents: el contenido de la solicitud
+            generation_config: parámetros de generación
+            started: instante (`perf_counter`) en que empezó la solicitud
+            publish: publica cada fragmento en `partial_stream`
+
+        returns:
+            tupla (texto completo segundos hasta el primer fragmento con texto)
+        """
+        parts = []
+        first_token = None
+        partial_stream = self.partial_stream if publish else None
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=generation_config
+        )
+        try:
+            async for chunk in stream:
+                delta = chunk.text
+                if not delta:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                parts.append(delta)
+                if partial_stream is not None:
+                    partial_stream.publish(delta)
+        except BaseException:
+            # `@retry` repite la solicitud entera los parciales de este intento sobran
+            if partial_stream is not None and parts:
+                partial_stream.reset()
+            raise
+
+        text = "".join(parts)
+        if partial_stream is not None and parts and not text.strip():
+            # solo llegaron espacios el intento se reintentará como respuesta vacía
+            partial_stream.reset()
+        return text, first_token
+
+    def cache_identity(self) -> str:
+        """
+        modelo parámetros de generación y huella del system prompt
+
+        returns:
+            la identidad para la clave de `cachedllmservice`
+        """
+        prompt = hashlib.sha256(self.system_instruction.encode("utf-8")).hexdigest()
+        return f"gemini|{self.model}|{self.temperature}|{self.max_tokens}|{prompt}"
+
+    def metrics(self) -> dict:
+        """
+        devuelve las latencias de GEMINI
+
+        returns:
+            diccionario de `llmlatencystats`
+        """
+        return self.latency.metrics()
@@ -0,0 +1,132 @@
+"""
+módulo que implementa la caché de idioma de la sesión
+
+con `language = "auto"` cada llamada a `transcribe` ejecuta la detección de
+idioma (una pasada extra del codificador) aunque el usuario dicte siempre en
+el mismo idioma `languageprior` recuerda las detecciones recientes con su
+probabilidad y cuando la confianza es alta propone el idioma directamente
+
+la suposición se verifica de forma barata con el primer segmento decodificado
+si su `avg_logprob` cae por debajo del umbral (síntoma típico de forzar el
+idioma equivocado) se descarta el prior y se vuelve a la detección
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from v2m.core.logging import logger
+
+class LanguagePrior:
+    """
+    historial de detecciones de idioma con estadísticas de acierto
+    """
+    def __init__(self, history: int = 5, min_probability: float = 0.8, min_avg_logprob: float = -1.0) -> None:
+        """
+        args:
+            history: número de detecciones recientes que se recuerdan
+            min_probability: confianza acumulada mínima para usar el prior
+            min_avg_logprob: `avg_logprob` mínimo del primer segmento para aceptar el prior
+        """
+        self.min_probability = min_probability
+        self.min_avg_logprob = min_avg_logprob
+        self._history: Deque[Tuple[str, float]] = deque(maxlen=max(1, history))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.detections = 0
+        self.rejections = 0
+        # coste medio de una detección medido en las detecciones reales
+        self._detect_seconds: Optional[float] = None
+
+    def likely(self) -> Optional[str]:
+        """
+        idioma que se puede pasar directamente a WHISPER
+
+        la confianza de cada idioma es la suma de probabilidades de sus
+        detecciones dividida por el tamaño del historial un idioma que no
+        domina el historial reciente no se propone
+
+        returns:
+            el código de idioma o none si hay que detectarlo
+        """
+        with self._lock:
+            if not self._history:
+                return None
+            scores: Dict[str, float] = {}
+            for language, probability in self._history:
+                scores[language] = scores.get(language, 0.0) + probability
+            language, score = max(scores.items(), key=lambda item: item[1])
+            if score / len(self._history) < self.min_probability:
+                return None
+            return language
+
+    def record(self, language: str, probability: float, seconds: float) -> None:
+        """
+        registra una detección real
+
+        args:
+            language: idioma detectado
+            probability: probabilidad de la detección
+            seconds: lo que tardó la detección
+        """
+        with self._lock:
+            self._history.append((language, probability))
+            self.detections += 1
+            if self._detect_seconds is None:
+                self._detect_seconds = seconds
+            else:
+                self._detect_seconds += 0.2 * (seconds - self._detect_seconds)
+
+    def accepts(self, segment) -> bool:
+        """
+        comprobación barata del prior sobre el primer segmento decodificado
+
+        args:
+            segment: segmento de `faster-whisper` con `avg_logprob`
+
+        returns:
+            true si el segmento es coherente con el idioma forzado
+        """
+        return segment.avg_logprob >= self.min_avg_logprob
+
+    def hit(self) -> None:
+        """registra una transcripción que usó el prior sin detección"""
+        with self._lock:
+            self.hits += 1
+
+    def reject(self, language: str) -> None:
+        """
+        descarta el historial tras una verificación fallida
+
+        args:
+            language: el idioma propuesto que no pasó la verificación
+        """
+        with self._lock:
+            self.rejections += 1
+            self._history.clear()
+        logger.info(f"prior de idioma {language} descartado el primer segmento no es coherente")
+
+    def metrics(self) -> dict:
+        """
+        devuelve las estadísticas de acierto
+
+        returns:
+            diccionario con aciertos detecciones rechazos tasa de acierto y tiempo ahorrado
+        """
+        with self._lock:
+            total = self.hits + self.detections
+            saved = self.hits * (self._detect_seconds or 0.0)
+            return {
+                "hits": self.hits,
+                "detections": self.detections,
+                "rejections": self.rejections,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "saved_seconds": round(saved, 3),
+            }
+
+    def log_stats(self) -> None:
+        """registra la tasa de acierto y el tiempo ahorrado"""
+        m = self.metrics()
+        logger.info(
+            f"prior de idioma aciertos {m['hits']}/{m['hits'] + m['detections']} ({m['hit_rate']:.0%}) "
+            f"rechazos {m['rejections']} ahorro estimado {m['saved_seconds']:.2f}s"
+        )
@@ -131,7 +131,7 @@ class LinuxClipboardAdapter(ClipboardInterface):
         if self._backend == "wayland":
             return (
                 ["wl-copy"],
-                ["wl-paste"]
+                ["wl-paste", "-n"]  # sin el salto de línea que añade wl-paste
             )
         else:  # x11
             return (
@@ -0,0 +1,48 @@
+"""
+módulo que construye el servicio de LLM elegido en `[llm] backend`
+
+separado del contenedor para que las herramientas de línea de comandos (ej
+`python -m v2m.benchmark_llm`) creen los mismos servicios sin arrancar el daemon
+"""
+
+from typing import Optional
+from v2m.application.llm_service import LLMService
+from v2m.config import config
+from v2m.core.segment_stream import SegmentStream
+from v2m.infrastructure.gemini_llm_service import GeminiLLMService
+from v2m.infrastructure.local_llm_service import LocalLLMService
+
+LLM_BACKENDS = ("gemini", "local")
+
+def build_llm_service(backend: str, partial_stream: Optional[SegmentStream] = None) -> LLMService:
+    """
+    construye el servicio de LLM elegido en `[llm] backend`
+
+    args:
+        backend: `gemini` o `local`
+        partial_stream: difusor de los fragmentos de la respuesta
+
+    returns:
+        el servicio de LLM
+
+    raises:
+        valueerror: si el backend no existe
+    """
+    if backend == "gemini":
+        return GeminiLLMService(partial_stream=partial_stream)
+    if backend == "local":
+        local_config = config.llm.local
+        return LocalLLMService(
+            base_url=local_config.base_url,
+            model=local_config.model,
+            api_key=local_config.api_key,
+            temperature=local_config.temperature,
+            max_tokens=local_config.max_tokens,
+            max_input_chars=local_config.max_input_chars,
+            max_concurrent_chunks=local_config.max_concurrent_chunks,
+            request_timeout=local_config.request_timeout,
+            stream=local_config.stream,
+            max_connections=local_config.max_connections,
+            partial_stream=partial_stream,
+        )
+    raise ValueError(f"backend de LLM desconocido {backend} (opciones {', '.join(LLM_BACKENDS)})")
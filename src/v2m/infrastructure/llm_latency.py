@@ -0,0 +1,89 @@
+"""
+módulo que registra la latencia de las respuestas del LLM
+
+el refinado tarda lo que tarda la respuesta completa pero ese tiempo tiene dos
+partes muy distintas la espera hasta el primer token (cola red y lectura del
+prompt) y la generación del resto `llmlatencystats` las guarda por separado
+para ver dónde se va realmente el tiempo
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from v2m.core.logging import logger
+
+class LLMLatencyStats:
+    """
+    estadísticas de tiempo hasta el primer token y tiempo total
+    """
+    def __init__(self, history: int = 100) -> None:
+        """
+        args:
+            history: mediciones recientes que se conservan para `samples`
+        """
+        self._lock = threading.Lock()
+        self._recent: Deque[Tuple[Optional[float], float]] = deque(maxlen=max(1, history))
+        self.requests = 0
+        self.failures = 0
+        # por métrica solicitudes medidas suma máximo y último valor
+        self._stats: Dict[str, List[float]] = {
+            "first_token": [0, 0.0, 0.0, 0.0],
+            "total": [0, 0.0, 0.0, 0.0],
+        }
+
+    def _add(self, name: str, seconds: float) -> None:
+        stats = self._stats[name]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+        stats[3] = seconds
+
+    def record(self, first_token_seconds: Optional[float], total_seconds: float, chars: int = 0) -> None:
+        """
+        registra una respuesta completa
+
+        args:
+            first_token_seconds: tiempo hasta el primer fragmento con texto (none sin streaming)
+            total_seconds: tiempo hasta la respuesta completa
+            chars: caracteres generados
+        """
+        with self._lock:
+            self.requests += 1
+            if first_token_seconds is not None:
+                self._add("first_token", first_token_seconds)
+            self._add("total", total_seconds)
+            self._recent.append((first_token_seconds, total_seconds))
+        ttft = f"{first_token_seconds:.3f}s" if first_token_seconds is not None else "n/d"
+        logger.info(f"LLM primer token {ttft} total {total_seconds:.3f}s ({chars} caracteres)")
+
+    def samples(self) -> List[Tuple[Optional[float], float]]:
+        """
+        mediciones recientes en orden
+
+        returns:
+            lista de tuplas (primer token total) en segundos
+        """
+        with self._lock:
+            return list(self._recent)
+
+    def record_failure(self) -> None:
+        """registra una solicitud fallida"""
+        with self._lock:
+            self.failures += 1
+
+    def metrics(self) -> dict:
+        """
+        devuelve las latencias acumuladas
+
+        returns:
+            diccionario con solicitudes fallos y media máximo y último valor de cada métrica
+        """
+        with self._lock:
+            metrics = {"requests": self.requests, "failures": self.failures}
+            for name, (count, total, worst, last) in self._stats.items():
+                metrics[f"{name}_seconds"] = {
+                    "avg": round(total / count, 4) if count else 0.0,
+                    "max": round(worst, 4),
+                    "last": round(last, 4),
+                }
+            return metrics
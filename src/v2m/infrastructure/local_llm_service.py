@@ -0,0 +1,204 @@
+"""
+módulo que implementa el servicio de LLM contra un servidor local compatible con OpenAI
+
+el refinado con GEMINI siempre sale a la red `localllmservice` habla con un
+servidor HTTP local que expone `/chat/completions` al estilo OpenAI (llama.cpp
+`llama-server` ollama vllm lm studio) así el refinado funciona sin conexión y
+sin la latencia de ida y vuelta a la nube
+
+usa un único `httpx.AsyncClient` con conexiones keep-alive reutilizadas entre
+solicitudes la respuesta se consume por SSE igual que el streaming de GEMINI
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Optional, Tuple
+import httpx
+from v2m.application.llm_service import LLMService
+from v2m.core.logging import logger
+from v2m.core.segment_stream import SegmentStream
+from v2m.domain.errors import LLMError
+from v2m.infrastructure.llm_latency import LLMLatencyStats
+from v2m.infrastructure.refine_prompt import load_system_prompt
+from v2m.infrastructure.text_chunking import refine_chunks, split_text
+
+class LocalLLMService(LLMService):
+    """
+    implementación del `llmservice` para servidores locales compatibles con OpenAI
+    """
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        api_key: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 2048,
+        max_input_chars: int = 6000,
+        max_concurrent_chunks: int = 1,
+        request_timeout: float = 30.0,
+        stream: bool = True,
+        max_connections: int = 4,
+        partial_stream: Optional[SegmentStream] = None,
+    ) -> None:
+        """
+        args:
+            base_url: raíz de la API (ej `http://127.0.0.1:8080/v1`)
+            model: nombre del modelo que espera el servidor
+            api_key: clave bearer si el servidor la pide
+            temperature: temperatura de muestreo
+            max_tokens: tokens máximos de la respuesta
+            max_input_chars: los textos más largos se refinan por fragmentos
+            max_concurrent_chunks: fragmentos simultáneos (los slots del servidor)
+            request_timeout: segundos máximos por solicitud
+            stream: consume la respuesta por SSE
+            max_connections: conexiones keep-alive del pool
+            partial_stream: difusor al que se publica cada fragmento de la respuesta
+        """
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.max_input_chars = max_input_chars
+        self.max_concurrent_chunks = max(1, max_concurrent_chunks)
+        self.stream = stream
+        self.partial_stream = partial_stream
+        self.latency = LLMLatencyStats()
+        self.system_instruction = load_system_prompt()
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=request_timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def process_text(self, text: str) -> str:
+        """
+        procesa un texto con el servidor local
+
+        args:
+            text: el texto a procesar
+
+        returns:
+            el texto refinado por el LLM
+
+        raises:
+            llmerror: si el servidor no responde o devuelve una respuesta vacía
+        """
+        chunks = split_text(text, self.max_input_chars)
+        try:
+            if len(chunks) == 1:
+                return await self._refine(text, publish=True)
+            return await refine_chunks(
+                chunks, lambda chunk: self._refine(chunk, publish=False), self.max_concurrent_chunks, self.partial_stream
+            )
+        except (Exception, asyncio.CancelledError) as e:
+            # los suscriptores siempre reciben un evento terminal
+            if self.partial_stream is not None:
+                self.partial_stream.fail(str(e) or type(e).__name__)
+            raise
+
+    async def _refine(self, text: str, publish: bool = True) -> str:
+        """
+        envía una única solicitud a `/chat/completions`
+
+        args:
+            text: el texto a procesar
+            publish: publica los fragmentos del streaming en `partial_stream`
+
+        returns:
+            el texto refinado
+        """
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_instruction},
+                {"role": "user", "content": text},
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": self.stream,
+        }
+        try:
+            logger.info(f"procesando texto con LLM local {self.model}...")
+            started = time.perf_counter()
+            first_token = None
+            if self.stream:
+                text, first_token = await self._generate_stream(payload, started, publish)
+            else:
+                response = await self.client.post("/chat/completions", json=payload)
+                response.raise_for_status()
+                text = response.json()["choices"][0]["message"].get("content") or ""
+            self.latency.record(first_token, time.perf_counter() - started, len(text))
+
+            if not text.strip():
+                raise LLMError("respuesta vacía del LLM local")
+            # el texto final se publica solo tras validar la respuesta
+            if publish and self.partial_stream is not None:
+                self.partial_stream.complete(text.strip())
+            return text.strip()
+        except Exception as e:
+            self.latency.record_failure()
+            logger.error(f"error procesando texto con el LLM local {e}")
+            raise LLMError("falló el procesamiento de texto con el LLM local") from e
+
+    async def _generate_stream(self, payload: dict, started: float, publish: bool) -> Tuple[str, Optional[float]]:
+        """
+        consume la respuesta SSE (`data: {...}` hasta `data: [DONE]`)
+
+        args:
+            payload: cuerpo de la solicitud
+            started: instante (`perf_counter`) en que empezó la solicitud
+            publish: publica cada fragmento en `partial_stream`
+
+        returns:
+            tupla (texto completo segundos hasta el primer fragmento con texto)
+        """
+        parts = []
+        first_token = None
+        partial_stream = self.partial_stream if publish else None
+        async with self.client.stream("POST", "/chat/completions", json=payload) as response:
+            response.raise_for_status()
+            # se lee hasta el final del cuerpo aunque llegue `[DONE]` así la
+            # conexión vuelve al pool en lugar de cerrarse
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    continue
+                choices = json.loads(data).get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if not delta:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                parts.append(delta)
+                if partial_stream is not None:
+                    partial_stream.publish(delta)
+
+        text = "".join(parts)
+        if partial_stream is not None and parts and not text.strip():
+            # solo llegaron espacios la respuesta se rechaza como vacía
+            partial_stream.reset()
+        return text, first_token
+
+    async def aclose(self) -> None:
+        """cierra las conexiones del pool"""
+        await self.client.aclose()
+
+    def cache_identity(self) -> str:
+        prompt = hashlib.sha256(self.system_instruction.encode("utf-8")).hexdigest()
+        return f"local|{self.base_url}|{self.model}|{self.temperature}|{self.max_tokens}|{prompt}"
+
+    def metrics(self) -> dict:
+        """
+        devuelve las latencias del LLM local
+
+        returns:
+            diccionario de `llmlatencystats`
+        """
+        return self.latency.metrics()
@@ -0,0 +1,247 @@
+"""
+módulo que gestiona la residencia en memoria de los modelos del daemon
+
+el daemon pasa la mayor parte del día inactivo pero mantiene cargados WHISPER
+(varios GB con large-v3-turbo) y silero vad el `modelresidencymanager`
+descarga los modelos registrados tras un periodo de inactividad configurable
+libera las cachés de los asignadores y los vuelve a cargar de forma proactiva
+en cuanto empieza una grabación para que la recarga se solape con el habla
+
+también expone métricas de memoria residente y de tiempos de recarga
+"""
+
+import ctypes
+import gc
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from v2m.core.logging import logger
+
+def resident_memory_mb() -> float:
+    """
+    memoria residente actual del proceso en MB (linux)
+
+    returns:
+        el rss leído de `/proc/self/statm` o 0 si no está disponible
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+def release_allocator_caches() -> None:
+    """
+    devuelve al sistema la memoria liberada por los modelos descargados
+
+    recoge ciclos de python vacía la caché de cuda de torch si está cargado y
+    pide a glibc que recorte el heap (`malloc_trim`)
+    """
+    gc.collect()
+
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception as e:
+            logger.debug(f"no se pudo vaciar la caché de cuda {e}")
+
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+def warm_up_in_background(warm_up: Optional[Callable[[], None]]) -> threading.Event:
+    """
+    ejecuta el calentamiento en un hilo y devuelve el evento de disponibilidad
+
+    el evento se activa al terminar aunque el calentamiento falle un daemon
+    que no pudo calentarse sigue atendiendo solo que la primera inferencia
+    será más lenta
+
+    args:
+        warm_up: función bloqueante de calentamiento o none si está desactivado
+
+    returns:
+        el evento que `STATUS` consulta para responder `READY`
+    """
+    ready = threading.Event()
+
+    def _run():
+        try:
+            if warm_up is not None:
+                warm_up()
+        except Exception as e:
+            logger.warning(f"No se pudo calentar la transcripción: {e}")
+        finally:
+            ready.set()
+
+    threading.Thread(target=_run, daemon=True).start()
+    return ready
+
+class _ResidentModel:
+    """estado y métricas de un modelo registrado"""
+    def __init__(self, load: Callable[[], None], unload: Callable[[], None], is_loaded: Callable[[], bool]) -> None:
+        self.load = load
+        self.unload = unload
+        self.is_loaded = is_loaded
+        # evita que la precarga y una transcripción carguen el mismo modelo a la vez
+        self.lock = threading.Lock()
+        self.loads = 0
+        self.unloads = 0
+        self.last_load_seconds: Optional[float] = None
+
+class ModelResidencyManager:
+    """
+    descarga los modelos tras un periodo de inactividad y los recarga bajo demanda
+    """
+    def __init__(self, idle_ttl_seconds: float = 0.0) -> None:
+        """
+        args:
+            idle_ttl_seconds: inactividad tras la que se descargan los modelos (0 nunca)
+        """
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._models: Dict[str, _ResidentModel] = {}
+        self._lock = threading.RLock()
+        self._active = 0
+        self._last_used = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+
+    def register(self, name: str, load: Callable[[], None], unload: Callable[[], None], is_loaded: Callable[[], bool]) -> None:
+        """
+        registra un modelo gestionado
+
+        args:
+            name: nombre del modelo en logs y métricas
+            load: función que carga el modelo (idempotente)
+            unload: función que suelta todas las referencias al modelo
+            is_loaded: función que indica si el modelo está en memoria
+        """
+        self._models[name] = _ResidentModel(load, unload, is_loaded)
+
+    def _load(self, name: str, model: _ResidentModel) -> None:
+        with model.lock:
+            if model.is_loaded():
+                return
+            started = time.perf_counter()
+            model.load()
+            if not model.is_loaded():
+                return
+            model.loads += 1
+            model.last_load_seconds = time.perf_counter() - started
+        logger.info(f"modelo {name} cargado en {model.last_load_seconds:.2f}s (rss {resident_memory_mb():.0f} MB)")
+
+    def prefetch(self) -> None:
+        """
+        carga en segundo plano los modelos que no estén en memoria
+
+        se llama al iniciar una grabación para que la recarga ocurra mientras
+        el usuario habla y no tras detener la grabación
+        """
+        self.touch()
+        pending = [(n, m) for n, m in self._models.items() if not m.is_loaded()]
+        if not pending:
+            return
+
+        def _run():
+            # cuenta como uso para que el temporizador no descargue a mitad de carga
+            with self.active():
+                for name, model in pending:
+                    try:
+                        self._load(name, model)
+                    except Exception as e:
+                        logger.warning(f"no se pudo precargar el modelo {name}: {e}")
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    @contextmanager
+    def active(self) -> Iterator[None]:
+        """
+        marca un tramo de uso de los modelos durante el que no se descargan
+        """
+        with self._lock:
+            self._active += 1
+            self._cancel_timer()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+            self.touch()
+
+    def touch(self) -> None:
+        """
+        registra actividad y reprograma la descarga por inactividad
+        """
+        with self._lock:
+            self._last_used = time.monotonic()
+            if self.idle_ttl_seconds <= 0 or self._active:
+                return
+            self._cancel_timer()
+            self._timer = threading.Timer(self.idle_ttl_seconds, self._on_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_idle(self) -> None:
+        with self._lock:
+            idle = time.monotonic() - self._last_used
+            if self._active or idle < self.idle_ttl_seconds:
+                return
+            self.unload_all()
+
+    def unload_all(self) -> None:
+        """
+        descarga todos los modelos registrados y libera las cachés
+        """
+        with self._lock:
+            rss_before = resident_memory_mb()
+            unloaded = []
+            for name, model in self._models.items():
+                with model.lock:
+                    if not model.is_loaded():
+                        continue
+                    model.unload()
+                    model.unloads += 1
+                unloaded.append(name)
+
+            if not unloaded:
+                return
+
+            release_allocator_caches()
+            logger.info(
+                f"modelos descargados por inactividad {', '.join(unloaded)} "
+                f"(rss {rss_before:.0f} MB -> {resident_memory_mb():.0f} MB)"
+            )
+
+    def metrics(self) -> dict:
+        """
+        devuelve las métricas de residencia
+
+        returns:
+            diccionario con la memoria residente y el estado de cada modelo
+        """
+        return {
+            "rss_mb": round(resident_memory_mb(), 1),
+            "idle_seconds": round(time.monotonic() - self._last_used, 1),
+            "models": {
+                name: {
+                    "loaded": model.is_loaded(),
+                    "loads": model.loads,
+                    "unloads": model.unloads,
+                    "last_load_seconds": (
+                        round(model.last_load_seconds, 3) if model.last_load_seconds is not None else None
+                    ),
+                }
+                for name, model in self._models.items()
+            },
+        }
@@ -0,0 +1,84 @@
+"""
+módulo que implementa el enrutador de modelos de WHISPER por duración
+
+la mayoría de los dictados duran unos pocos segundos y no necesitan la
+precisión (ni el coste de decodificación) del modelo grande el `modelrouter`
+elige un nivel de una lista configurada (ej `base` `small` `large-v3-turbo`)
+según la duración de voz que dejó el VAD y la carga actual del servicio
+
+los niveles se recorren en orden y gana el primero cuyo límite cubre la
+duración de voz el último nivel es siempre el modelo principal de
+`whisper.model` y no tiene límite
+"""
+
+from typing import List, Sequence, Tuple
+
+class ModelTier:
+    """nivel del enrutador"""
+    def __init__(self, model: str, max_speech_seconds: float = 0.0) -> None:
+        """
+        args:
+            model: nombre o ruta del modelo de `faster-whisper`
+            max_speech_seconds: duración máxima de voz que atiende este nivel (0 sin límite)
+        """
+        self.model = model
+        self.max_speech_seconds = max_speech_seconds
+
+    def accepts(self, speech_seconds: float) -> bool:
+        return self.max_speech_seconds <= 0 or speech_seconds <= self.max_speech_seconds
+
+class ModelRouter:
+    """
+    elige el modelo de WHISPER para cada transcripción
+    """
+    def __init__(self, tiers: Sequence[ModelTier], default_model: str, busy_downgrade: bool = True) -> None:
+        """
+        args:
+            tiers: niveles ordenados de menor a mayor límite de duración
+            default_model: modelo principal que atiende todo lo que no cubren los niveles
+            busy_downgrade: si hay otras transcripciones en curso baja un nivel
+        """
+        self.tiers: List[ModelTier] = [t for t in tiers if t.model != default_model]
+        self.tiers.append(ModelTier(default_model))
+        self.busy_downgrade = busy_downgrade
+
+    @classmethod
+    def from_config(cls, router_config, default_model: str) -> "ModelRouter":
+        """
+        construye el enrutador a partir de `[whisper.router]`
+
+        args:
+            router_config: instancia de `routerconfig`
+            default_model: `whisper.model`
+
+        returns:
+            el enrutador configurado
+        """
+        tiers = [ModelTier(t.model, t.max_speech_seconds) for t in router_config.tiers]
+        return cls(tiers, default_model, busy_downgrade=router_config.busy_downgrade)
+
+    @property
+    def default_model(self) -> str:
+        return self.tiers[-1].model
+
+    def select(self, speech_seconds: float, in_flight: int = 0) -> Tuple[str, str]:
+        """
+        elige el modelo para una transcripción
+
+        args:
+            speech_seconds: duración de voz tras el VAD
+            in_flight: otras transcripciones en curso en el servicio
+
+        returns:
+            tupla (modelo motivo) el motivo se usa en los logs
+        """
+        index = next(i for i, tier in enumerate(self.tiers) if tier.accepts(speech_seconds))
+        reason = f"{speech_seconds:.2f}s de voz"
+        if self.tiers[index].max_speech_seconds > 0:
+            reason += f" <= {self.tiers[index].max_speech_seconds:.1f}s"
+
+        if self.busy_downgrade and in_flight > 0 and index > 0:
+            index -= 1
+            reason += f" con {in_flight} transcripciones en curso (baja un nivel)"
+
+        return self.tiers[index].model, reason
@@ -0,0 +1,203 @@
+"""
+módulo que implementa el almacén local de modelos de WHISPER
+
+`WhisperModel("large-v3-turbo")` resuelve el nombre contra el hub de hugging
+face en cada arranque del daemon lo que añade comprobaciones de red puede
+bloquearse con una conexión inestable y falla sin red el `modelstore` guarda
+cada modelo en un directorio propio junto a un manifiesto con el sha256 de sus
+archivos y el cargador recibe la ruta local por lo que no toca la red
+
+un modelo que falta se descarga una sola vez salvo en modo `offline` donde
+se pide ejecutar `python -m v2m.models prefetch` explícitamente
+"""
+
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+from v2m.core.logging import logger
+from v2m.domain.errors import TranscriptionError
+
+MANIFEST_NAME = "v2m-manifest.json"
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ModelStore:
+    """
+    directorio de modelos con descarga explícita verificación y poda
+    """
+    def __init__(self, root: Path, offline: bool = False) -> None:
+        """
+        args:
+            root: directorio del almacén
+            offline: no descargar nunca los modelos que falten
+        """
+        self.root = Path(root).expanduser()
+        self.offline = offline
+
+    def path_for(self, name: str) -> Path:
+        """
+        directorio del almacén para un nombre de modelo
+
+        args:
+            name: tamaño (ej `large-v3-turbo`) o id del hub (ej `Systran/faster-whisper-small`)
+
+        returns:
+            la ruta del directorio (exista o no)
+        """
+        return self.root / name.replace("/", "--")
+
+    def has(self, name: str) -> bool:
+        """indica si el modelo está completo en el almacén"""
+        path = self.path_for(name)
+        return (path / MANIFEST_NAME).is_file() and (path / "model.bin").is_file()
+
+    def resolve(self, name: str) -> str:
+        """
+        convierte un nombre de modelo en una ruta local para `WhisperModel`
+
+        una ruta existente se devuelve tal cual un nombre se busca en el
+        almacén y si falta se descarga (salvo en modo offline)
+
+        args:
+            name: nombre ruta o id del hub del modelo
+
+        returns:
+            la ruta local del modelo
+
+        raises:
+            transcriptionerror: si el modelo no está y el almacén es offline
+        """
+        if Path(name).expanduser().is_dir():
+            return str(Path(name).expanduser())
+        if self.has(name):
+            return str(self.path_for(name))
+        if self.offline:
+            raise TranscriptionError(
+                f"el modelo {name} no está en {self.root} ejecuta `python -m v2m.models prefetch {name}`"
+            )
+        logger.warning(f"el modelo {name} no está en el almacén local se descarga una única vez")
+        return str(self.prefetch(name))
+
+    def prefetch(self, name: str) -> Path:
+        """
+        descarga un modelo al almacén y escribe su manifiesto
+
+        args:
+            name: tamaño o id del hub del modelo
+
+        returns:
+            el directorio del modelo
+        """
+        from faster_whisper.utils import download_model
+
+        path = self.path_for(name)
+        path.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        download_model(name, output_dir=str(path))
+        # la caché interna de hugging face no forma parte del modelo
+        shutil.rmtree(path / ".cache", ignore_errors=True)
+
+        files = {
+            str(file.relative_to(path)): _sha256(file)
+            for file in sorted(path.rglob("*"))
+            if file.is_file() and file.name != MANIFEST_NAME
+        }
+        manifest = {"name": name, "fetched_at": time.time(), "files": files}
+        with open(path / MANIFEST_NAME, "w") as f:
+            json.dump(manifest, f, indent=2)
+        logger.info(f"modelo {name} guardado en {path} en {time.perf_counter() - started:.1f}s")
+        return path
+
+    def verify(self, name: str) -> List[str]:
+        """
+        comprueba los archivos de un modelo contra su manifiesto
+
+        args:
+            name: nombre del modelo en el almacén
+
+        returns:
+            lista de problemas encontrados (vacía si el modelo es íntegro)
+        """
+        path = self.path_for(name)
+        try:
+            with open(path / MANIFEST_NAME, "r") as f:
+                files: Dict[str, str] = json.load(f)["files"]
+        except (OSError, ValueError, KeyError):
+            return [f"{name} sin manifiesto válido"]
+
+        problems = []
+        for relative, expected in files.items():
+            file = path / relative
+            if not file.is_file():
+                problems.append(f"{relative} falta")
+            elif _sha256(file) != expected:
+                problems.append(f"{relative} checksum distinto")
+        return problems
+
+    def installed(self) -> Dict[str, int]:
+        """
+        modelos presentes en el almacén
+
+        returns:
+            diccionario nombre -> bytes ocupados
+        """
+        models = {}
+        if not self.root.is_dir():
+            return models
+        for manifest in sorted(self.root.glob(f"*/{MANIFEST_NAME}")):
+            try:
+                with open(manifest, "r") as f:
+                    name = json.load(f)["name"]
+            except (OSError, ValueError, KeyError):
+                continue
+            models[name] = sum(p.stat().st_size for p in manifest.parent.rglob("*") if p.is_file())
+        return models
+
+    def prune(self, keep: Iterable[str], dry_run: bool = False) -> List[str]:
+        """
+        elimina los modelos que no están en `keep`
+
+        args:
+            keep: nombres de los modelos que se conservan
+            dry_run: solo informa sin borrar
+
+        returns:
+            los nombres de los modelos eliminados (o que se eliminarían)
+        """
+        keep_dirs = {self.path_for(name) for name in keep}
+        removed = []
+        for name in self.installed():
+            path = self.path_for(name)
+            if path in keep_dirs:
+                continue
+            removed.append(name)
+            if not dry_run:
+                shutil.rmtree(path)
+                logger.info(f"modelo {name} eliminado del almacén")
+        return removed
+
+def configured_models(whisper_config) -> List[str]:
+    """
+    modelos que usa la configuración actual
+
+    args:
+        whisper_config: instancia de `whisperconfig`
+
+    returns:
+        el modelo principal y los de los niveles del enrutador y del borrador si están activos
+    """
+    models = [whisper_config.model]
+    if whisper_config.router.enabled:
+        models += [tier.model for tier in whisper_config.router.tiers]
+    if whisper_config.speculative.enabled:
+        models.append(whisper_config.speculative.draft_model)
+    return list(dict.fromkeys(models))
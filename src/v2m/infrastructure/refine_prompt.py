@@ -0,0 +1,21 @@
+"""
+módulo que carga el system prompt del refinado compartido por los backends de LLM
+"""
+
+from v2m.config import BASE_DIR
+from v2m.core.logging import logger
+
+def load_system_prompt() -> str:
+    """
+    lee `prompts/refine_system.txt`
+
+    returns:
+        el contenido del prompt o uno mínimo si el archivo no existe
+    """
+    prompt_path = BASE_DIR / "prompts" / "refine_system.txt"
+    try:
+        with open(prompt_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        logger.warning("system prompt no encontrado usando default")
+        return "eres un editor de texto experto"
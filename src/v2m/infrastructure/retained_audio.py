@@ -0,0 +1,110 @@
+"""
+módulo que conserva en memoria las últimas grabaciones ya pasadas por el VAD
+
+cuando una transcripción sale mal la única salida era volver a dictar
+`retainedrecordings` guarda los últimos buffers con sus intervalos de voz
+recortados al tramo con voz para que `RETRANSCRIBE` vuelva a ejecutar WHISPER
+con otros parámetros sin repetir la captura ni el VAD
+
+la memoria está acotada por número de grabaciones y por segundos totales
+(un minuto de audio a 16 kHz ocupa unos 3.8 MB) una grabación que por sí sola
+supera el límite no se conserva copiarla entera al proceso anularía el diario
+mapeado en disco
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional
+import numpy as np
+from v2m.core.logging import logger
+
+class RetainedRecording:
+    """audio conservado con sus intervalos de voz"""
+    def __init__(self, audio: np.ndarray, clip_timestamps: Optional[List[float]], analyzed: bool, text: str = "") -> None:
+        """
+        args:
+            audio: audio float32 mono a 16 kHz
+            clip_timestamps: intervalos de voz relativos a `audio` o none sin VAD
+            analyzed: false si el VAD aún no se ejecutó sobre el audio (modo streaming)
+            text: la última transcripción del audio
+        """
+        self.audio = audio
+        self.clip_timestamps = clip_timestamps
+        self.analyzed = analyzed
+        self.text = text
+        self.created_at = time.time()
+
+class RetainedRecordings:
+    """
+    caché acotada de las últimas grabaciones (la más reciente es el índice 0)
+    """
+    def __init__(self, capacity: int = 3, max_seconds: float = 300.0, sample_rate: int = 16000, pad_seconds: float = 0.2) -> None:
+        """
+        args:
+            capacity: número máximo de grabaciones conservadas
+            max_seconds: segundos de audio totales a partir de los que se descartan las más antiguas
+            sample_rate: frecuencia de muestreo del audio
+            pad_seconds: margen que se conserva antes de la primera voz y después de la última
+        """
+        self.max_seconds = max_seconds
+        self.sample_rate = sample_rate
+        self.pad_seconds = pad_seconds
+        self._recordings: Deque[RetainedRecording] = deque(maxlen=max(1, capacity))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._recordings)
+
+    def add(self, audio: np.ndarray, clip_timestamps: Optional[List[float]] = None, analyzed: bool = True) -> Optional[RetainedRecording]:
+        """
+        conserva una grabación recortada al tramo con voz
+
+        args:
+            audio: audio float32 mono a 16 kHz
+            clip_timestamps: intervalos de voz del VAD lista vacía si solo hay silencio o none sin VAD
+            analyzed: false si el VAD no se ejecutó todavía
+
+        returns:
+            la entrada creada (su `text` se rellena al terminar la transcripción)
+            o none si la grabación supera `max_seconds`
+        """
+        if clip_timestamps:
+            # el silencio antes y después de la voz no aporta nada a una segunda pasada
+            start = max(0.0, clip_timestamps[0] - self.pad_seconds)
+            end = min(audio.size / self.sample_rate, clip_timestamps[-1] + self.pad_seconds)
+            audio = audio[int(start * self.sample_rate):int(end * self.sample_rate)]
+            clip_timestamps = [round(t - start, 3) for t in clip_timestamps]
+        if audio.size / self.sample_rate > self.max_seconds:
+            # se comprueba antes de copiar una sesión larga del diario no pasa a la RAM
+            logger.info(f"grabación de {audio.size / self.sample_rate:.0f}s supera retention.max_seconds no se conserva")
+            return None
+        # copia propia el buffer original puede ser un archivo mapeado que se borra
+        entry = RetainedRecording(np.array(audio, dtype=np.float32), clip_timestamps, analyzed)
+
+        with self._lock:
+            self._recordings.appendleft(entry)
+            total = sum(r.audio.size for r in self._recordings) / self.sample_rate
+            while total > self.max_seconds:
+                total -= self._recordings.pop().audio.size / self.sample_rate
+        return entry
+
+    def get(self, index: int = 0) -> Optional[RetainedRecording]:
+        """
+        devuelve una grabación conservada
+
+        args:
+            index: 0 la más reciente 1 la anterior
+
+        returns:
+            la grabación o none si no existe
+        """
+        with self._lock:
+            if 0 <= index < len(self._recordings):
+                return self._recordings[index]
+            return None
+
+    def clear(self) -> None:
+        """descarta todas las grabaciones"""
+        with self._lock:
+            self._recordings.clear()
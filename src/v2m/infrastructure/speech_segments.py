@@ -0,0 +1,170 @@
+"""
+módulo que define el índice compacto de segmentos de voz devuelto por el VAD
+
+en lugar de recortar y concatenar el audio `speechsegments` guarda solo un
+array int32 de forma (n 2) con el inicio y el fin (exclusivo) de cada
+segmento en muestras los consumidores iteran vistas sobre el buffer original
+y solo se materializa una copia cuando alguien la pide explícitamente
+"""
+
+from typing import Iterator, List
+import numpy as np
+
+class SpeechSegments:
+    """
+    índice de intervalos de voz sobre un buffer de audio
+    """
+    def __init__(self, bounds: np.ndarray, sample_rate: int = 16000) -> None:
+        """
+        args:
+            bounds: array int32 de forma (n 2) con pares [inicio fin) en muestras
+            sample_rate: frecuencia de muestreo del audio indexado
+        """
+        self.bounds = np.asarray(bounds, dtype=np.int32).reshape(-1, 2)
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_timestamps(
+        cls,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        length: int,
+        sample_rate: int = 16000,
+        pad_samples: int = 0,
+        merge_gap_samples: int = 0,
+    ) -> "SpeechSegments":
+        """
+        construye el índice añadiendo margen y fusionando segmentos cercanos
+
+        el margen evita cortar el inicio y el final de las palabras y la fusión
+        une segmentos separados por pausas cortas para que WHISPER vea frases
+        completas en lugar de trozos sueltos todo se hace de forma vectorizada
+
+        args:
+            starts: inicios de los segmentos en muestras (ordenados)
+            ends: finales de los segmentos en muestras
+            length: longitud total del audio para recortar el margen
+            sample_rate: frecuencia de muestreo del audio
+            pad_samples: margen añadido a cada lado de cada segmento
+            merge_gap_samples: pausas de hasta este tamaño (tras el margen) se fusionan
+
+        returns:
+            el índice de segmentos resultante
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if starts.size == 0:
+            return cls(np.empty((0, 2), dtype=np.int32), sample_rate)
+
+        starts = np.maximum(starts - pad_samples, 0)
+        ends = np.minimum(ends + pad_samples, length)
+
+        # un hueco menor o igual que merge_gap (o un solapamiento por el margen) une segmentos
+        gaps = starts[1:] - ends[:-1]
+        breaks = np.flatnonzero(gaps > merge_gap_samples)
+        first = np.concatenate(([0], breaks + 1))
+
+        bounds = np.empty((first.size, 2), dtype=np.int32)
+        bounds[:, 0] = starts[first]
+        # con solapamientos el final de un grupo es el máximo de sus finales
+        bounds[:, 1] = np.maximum.reduceat(ends, first)
+        return cls(bounds, sample_rate)
+
+    def __len__(self) -> int:
+        return self.bounds.shape[0]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @property
+    def num_samples(self) -> int:
+        """número total de muestras de voz"""
+        return int((self.bounds[:, 1] - self.bounds[:, 0]).sum())
+
+    @property
+    def duration(self) -> float:
+        """duración total de voz en segundos"""
+        return self.num_samples / self.sample_rate
+
+    def views(self, audio: np.ndarray) -> Iterator[np.ndarray]:
+        """
+        itera vistas sin copia del audio para cada segmento
+
+        args:
+            audio: el buffer original sobre el que se calculó el índice
+
+        yields:
+            un slice de `audio` por segmento
+        """
+        for start, end in self.bounds:
+            yield audio[start:end]
+
+    def materialize(self, audio: np.ndarray) -> np.ndarray:
+        """
+        copia los segmentos de voz en un único array contiguo
+
+        solo debe usarse cuando el consumidor necesita realmente un buffer
+        compacto con `views` o `to_clip_timestamps` no se copia nada
+
+        args:
+            audio: el buffer original sobre el que se calculó el índice
+
+        returns:
+            un nuevo array con los segmentos concatenados
+        """
+        if not self:
+            return np.array([], dtype=audio.dtype)
+        result = np.empty(self.num_samples, dtype=audio.dtype)
+        offset = 0
+        for view in self.views(audio):
+            result[offset:offset + view.size] = view
+            offset += view.size
+        return result
+
+    def to_clip_timestamps(self) -> List[float]:
+        """
+        convierte el índice al formato `clip_timestamps` de `faster-whisper`
+
+        returns:
+            lista plana [inicio fin inicio fin ...] en segundos
+        """
+        return (self.bounds.reshape(-1) / self.sample_rate).tolist()
+
+    def to_dicts(self) -> List[dict]:
+        """
+        convierte el índice al formato de silero (lista de `start` `end`)
+
+        returns:
+            lista de diccionarios con los límites en muestras
+        """
+        return [{"start": int(start), "end": int(end)} for start, end in self.bounds]
+
+def coalesce_clip_timestamps(clip_timestamps: List[float], max_seconds: float, max_gap_seconds: float = 2.0) -> List[float]:
+    """
+    agrupa intervalos consecutivos en clips de como mucho `max_seconds`
+
+    `faster-whisper` rellena cada clip hasta una ventana completa y lo codifica
+    por separado pasar cada intervalo del VAD como su propio clip cuesta una
+    pasada del encoder por pausa agrupados el coste vuelve a ser del orden de
+    la voz entre la duración de la ventana y cada intervalo se decodifica con
+    sus vecinos como contexto un intervalo más largo que la ventana queda solo
+
+    solo se unen intervalos separados por pausas cortas una pausa larga
+    dentro del clip volvería a pasar silencio al encoder (coste y
+    alucinaciones) que el VAD ya había quitado
+
+    args:
+        clip_timestamps: lista plana [inicio fin inicio fin ...] en segundos ordenada
+        max_seconds: duración máxima de un clip agrupado (la ventana del modelo)
+        max_gap_seconds: pausa máxima entre dos intervalos para unirlos
+
+    returns:
+        lista plana con los clips agrupados
+    """
+    merged: List[float] = []
+    for start, end in zip(clip_timestamps[0::2], clip_timestamps[1::2]):
+        if merged and start - merged[-1] <= max_gap_seconds and end - merged[-2] <= max_seconds:
+            merged[-1] = end
+        else:
+            merged += [start, end]
+    return merged
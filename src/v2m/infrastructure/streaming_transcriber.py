@@ -0,0 +1,176 @@
+"""
+módulo que implementa la transcripción en streaming mientras el usuario habla
+
+en lugar de esperar a `stop_and_transcribe` para empezar a decodificar el
+`streamingtranscriber` lee ventanas completas del buffer de `audiorecorder` en
+un hilo de fondo y las transcribe a medida que se completan cada ventana recibe
+como prompt el final del texto ya decodificado para mantener la coherencia
+
+al detener la grabación solo queda pendiente la cola sin procesar de modo que
+la latencia tras soltar la tecla es casi constante sin importar la duración
+"""
+
+import threading
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence
+import numpy as np
+from v2m.core.logging import logger
+
+if TYPE_CHECKING:
+    # solo se usan `sample_rate` `channels` `current_samples` y `peek` así el
+    # módulo no arrastra sounddevice al importarse
+    from v2m.infrastructure.audio.recorder import AudioRecorder
+
+# función que transcribe un array de audio con un prompt y devuelve los segmentos
+# decodificados (objetos con atributos `start` `end` y `text` en segundos)
+TranscribeFn = Callable[[np.ndarray, Optional[str]], Sequence]
+
+class StreamingTranscriber:
+    """
+    transcribe en segundo plano las ventanas ya completas de una grabación activa
+    """
+    def __init__(
+        self,
+        recorder: "AudioRecorder",
+        transcribe_fn: TranscribeFn,
+        on_segment: Optional[Callable[[str], None]] = None,
+        window_seconds: float = 10.0,
+        prompt_chars: int = 200,
+        base_prompt: Optional[str] = None,
+        poll_interval: float = 0.25,
+    ) -> None:
+        """
+        inicializa el transcriptor en streaming
+
+        args:
+            recorder: grabador del que se leen las ventanas sin copiar el audio
+            transcribe_fn: función que ejecuta WHISPER sobre una ventana
+            on_segment: recibe el texto de cada segmento confirmado
+            window_seconds: duración de cada ventana que se procesa en segundo plano
+            prompt_chars: cuántos caracteres del texto previo se pasan como contexto
+            base_prompt: prompt fijo que precede al contexto (ej el prompt bilingüe)
+            poll_interval: cada cuánto se comprueba si hay una ventana completa
+        """
+        self.recorder = recorder
+        self.transcribe_fn = transcribe_fn
+        self.on_segment = on_segment
+        self.window_samples = int(window_seconds * recorder.sample_rate)
+        self.prompt_chars = prompt_chars
+        self.base_prompt = base_prompt
+        self.poll_interval = poll_interval
+
+        # ventanas decodificadas durante la grabación (0 si el dictado fue más corto que una)
+        self.windows = 0
+        self._texts: List[str] = []
+        self._committed = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        inicia el hilo de fondo que consume las ventanas completas
+        """
+        self.windows = 0
+        self._texts = []
+        self._committed = 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info("transcripción en streaming iniciada")
+
+    def finish(self, audio: np.ndarray) -> str:
+        """
+        detiene el hilo de fondo y decodifica solo la cola pendiente
+
+        args:
+            audio: el audio completo devuelto por `audiorecorder.stop`
+
+        returns:
+            el texto de todas las ventanas más el de la cola final
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            # si hay una ventana en curso se espera a que termine para no
+            # ejecutar dos decodificaciones a la vez sobre el mismo modelo
+            self._thread.join()
+            self._thread = None
+
+        tail = audio[self._committed * self.recorder.channels:]
+        if tail.size > 0:
+            logger.info(f"transcribiendo cola final de {tail.size / self.recorder.sample_rate:.2f}s")
+            self._consume(tail, final=True)
+
+        return " ".join(t for t in self._texts if t)
+
+    def cancel(self) -> None:
+        """
+        detiene el hilo de fondo descartando lo decodificado
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._texts = []
+
+    def _prompt(self) -> Optional[str]:
+        """
+        construye el prompt con el final del texto ya decodificado
+        """
+        context = " ".join(self._texts)[-self.prompt_chars:] if self.prompt_chars > 0 else ""
+        parts = [p for p in (self.base_prompt, context.strip()) if p]
+        return " ".join(parts) or None
+
+    def _run(self) -> None:
+        """
+        bucle del hilo de fondo procesa ventanas mientras la grabación sigue activa
+        """
+        while not self._stop_event.wait(self.poll_interval):
+            if self.recorder.current_samples - self._committed < self.window_samples:
+                continue
+
+            window = self.recorder.peek(self._committed, self._committed + self.window_samples)
+            self.windows += 1
+            try:
+                self._consume(window, final=False)
+            except Exception as e:
+                # la cola final volverá a cubrir este audio al detener
+                logger.error(f"fallo en la transcripción en streaming {e}")
+                return
+
+    def _consume(self, window: np.ndarray, final: bool) -> None:
+        """
+        transcribe una ventana y confirma el audio correspondiente
+
+        salvo en la cola final el último segmento de la ventana no se confirma
+        porque puede estar cortado a mitad de palabra se vuelve a decodificar
+        al comienzo de la siguiente ventana
+
+        args:
+            window: vista del audio a transcribir
+            final: si es la cola final se confirman todos los segmentos
+        """
+        segments = list(self.transcribe_fn(window, self._prompt()))
+        frames = window.size // self.recorder.channels
+
+        if final or len(segments) <= 1:
+            self._commit(segments)
+            self._committed += frames
+            return
+
+        kept = segments[:-1]
+        self._commit(kept)
+        committed = int(kept[-1].end * self.recorder.sample_rate)
+        # nunca retroceder ni pasarse de la ventana por redondeos del modelo
+        self._committed += min(max(committed, 1), frames)
+
+    def _commit(self, segments: Sequence) -> None:
+        """
+        confirma el texto de los segmentos y lo publica
+
+        el último segmento de una ventana no confirmado se vuelve a
+        decodificar así que solo se publica lo confirmado para no repetirlo
+        """
+        for segment in segments:
+            text = segment.text.strip()
+            self._texts.append(text)
+            if self.on_segment is not None and text:
+                self.on_segment(text)
@@ -0,0 +1,134 @@
+"""
+módulo que divide textos largos para refinarlos por partes
+
+un dictado largo enviado en una sola solicitud al LLM tarda proporcional a su
+longitud y puede superar `max_tokens` `split_text` lo corta en fragmentos de
+como mucho `max_chars` respetando párrafos y después frases y recuerda el
+separador original para volver a unir los resultados en orden
+"""
+
+import asyncio
+import re
+from typing import Awaitable, Callable, List, Optional, Tuple
+from v2m.core.logging import logger
+from v2m.core.segment_stream import SegmentStream
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"(?<=[.!?…;:])\s+")
+
+def _pieces(text: str, max_chars: int) -> List[Tuple[str, str]]:
+    """trocea un párrafo en frases y una frase demasiado larga por palabras"""
+    pieces = []
+    for sentence in _SENTENCE.split(text):
+        if len(sentence) <= max_chars:
+            pieces.append((sentence, " "))
+            continue
+        words = sentence.split()
+        current = ""
+        for word in words:
+            if current and len(current) + 1 + len(word) > max_chars:
+                pieces.append((current, " "))
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            pieces.append((current, " "))
+    return pieces
+
+def split_text(text: str, max_chars: int) -> List[Tuple[str, str]]:
+    """
+    divide un texto en fragmentos de como mucho `max_chars` caracteres
+
+    args:
+        text: texto a dividir
+        max_chars: longitud máxima de cada fragmento (una palabra más larga se deja entera)
+
+    returns:
+        lista de tuplas (fragmento separador que lo seguía en el original)
+        el último separador es cadena vacía
+    """
+    text = text.strip()
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [(text, "")]
+
+    pieces: List[Tuple[str, str]] = []
+    for paragraph in _PARAGRAPH.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append((paragraph, "\n\n"))
+        else:
+            pieces.extend(_pieces(paragraph, max_chars))
+            pieces[-1] = (pieces[-1][0], "\n\n")
+
+    # se agrupan frases y párrafos consecutivos hasta llenar cada fragmento
+    chunks: List[Tuple[str, str]] = []
+    current, current_sep = "", ""
+    for piece, sep in pieces:
+        if current and len(current) + len(current_sep) + len(piece) > max_chars:
+            chunks.append((current, current_sep))
+            current = piece
+        else:
+            current = f"{current}{current_sep}{piece}" if current else piece
+        current_sep = sep
+    chunks.append((current, ""))
+    return chunks
+
+def join_chunks(chunks: List[Tuple[str, str]]) -> str:
+    """
+    vuelve a unir fragmentos con sus separadores originales
+
+    args:
+        chunks: tuplas (texto separador) en orden
+
+    returns:
+        el texto completo
+    """
+    return "".join(f"{text}{sep}" for text, sep in chunks).strip()
+
+async def refine_chunks(
+    chunks: List[Tuple[str, str]],
+    refine: Callable[[str], Awaitable[str]],
+    max_concurrent: int,
+    partial_stream: Optional[SegmentStream] = None,
+) -> str:
+    """
+    refina los fragmentos en paralelo con concurrencia acotada
+
+    los parciales se publican en orden cada fragmento en cuanto él y todos
+    los anteriores están listos
+
+    args:
+        chunks: tuplas (fragmento separador) de `split_text`
+        refine: corrutina que refina un fragmento
+        max_concurrent: solicitudes simultáneas como máximo
+        partial_stream: difusor de los fragmentos refinados y del texto final
+
+    returns:
+        el texto refinado completo
+    """
+    logger.info(f"texto de {sum(len(c) for c, _ in chunks)} caracteres dividido en {len(chunks)} fragmentos")
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def bounded(chunk: str) -> str:
+        async with semaphore:
+            return await refine(chunk)
+
+    tasks = [asyncio.ensure_future(bounded(chunk)) for chunk, _ in chunks]
+    refined = []
+    try:
+        for task, (_, sep) in zip(tasks, chunks):
+            result = await task
+            refined.append((result, sep))
+            if partial_stream is not None:
+                partial_stream.publish(f"{result}{sep}")
+    finally:
+        # si un fragmento falla los demás no tienen sentido
+        for task in tasks:
+            task.cancel()
+
+    text = join_chunks(refined)
+    if partial_stream is not None:
+        partial_stream.complete(text)
+    return text
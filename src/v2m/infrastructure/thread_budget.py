@@ -0,0 +1,159 @@
+"""
+módulo que reparte los núcleos de CPU entre las librerías del daemon
+
+el daemon carga en un mismo proceso CTranslate2 (WHISPER) torch u onnxruntime
+(silero vad) y numpy/BLAS cada una dimensiona su propio pool de hilos según
+el número de núcleos sin coordinarse lo que sobresuscribe la CPU e infla la
+latencia de cola en máquinas compartidas
+
+`threadbudget` calcula un reparto a partir de `[threads]` en `config.toml` y
+lo aplica al arrancar el contenedor de DI
+-   numpy/BLAS/OpenMP mediante variables de entorno (para librerías que aún no
+    se han cargado) y `threadpoolctl` si está instalado (para las ya cargadas)
+-   torch con `torch.set_num_threads` solo si ya está importado para no
+    cargarlo innecesariamente el backend torch de VAD lo aplica al importarlo
+-   onnxruntime (backend onnx de VAD) con `intra_op_num_threads` de su sesión
+-   CTranslate2 con el parámetro `cpu_threads` de `WhisperModel`
+"""
+
+import math
+import os
+import sys
+from typing import Optional
+from v2m.core.logging import logger
+
+# variables que leen OpenMP y las distintas implementaciones de BLAS al cargarse
+BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+def available_cpus() -> int:
+    """
+    núcleos que este proceso puede usar realmente
+
+    `os.cpu_count` devuelve los de la máquina en una máquina compartida el
+    proceso suele estar limitado por afinidad (`taskset` cpusets) o por la
+    cuota de CPU del cgroup (contenedores `systemd` `CPUQuota`) se toma el
+    menor de ambos límites
+
+    returns:
+        el número de núcleos disponibles (al menos 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2 `cpu.max` contiene "<cuota> <periodo>" o "max <periodo>" sin límite
+    try:
+        with open("/sys/fs/cgroup/cpu.max", "r") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+class ThreadBudget:
+    """
+    reparto de hilos de CPU entre WHISPER VAD y numpy/BLAS
+    """
+    def __init__(self, total: int = 0, whisper: int = 0, vad: int = 1, numpy: int = 1, num_workers: int = 1) -> None:
+        """
+        calcula el reparto efectivo
+
+        args:
+            total: núcleos disponibles para el daemon (0 usa los que permiten la afinidad y el cgroup)
+            whisper: hilos para CTranslate2 (0 asigna lo que sobra tras vad y numpy)
+            vad: hilos para torch/onnxruntime del VAD
+            numpy: hilos para numpy/BLAS/OpenMP
+            num_workers: réplicas de CTranslate2 entre las que se divide el presupuesto de WHISPER
+        """
+        self.total = total if total > 0 else available_cpus()
+        self.vad = max(1, vad)
+        self.numpy = max(1, numpy)
+        self.whisper = whisper if whisper > 0 else max(1, self.total - self.vad - self.numpy)
+        self.num_workers = max(1, num_workers)
+
+    @classmethod
+    def from_config(cls, threads_config, num_workers: int = 1) -> "ThreadBudget":
+        """
+        construye el reparto a partir de la sección `[threads]`
+
+        args:
+            threads_config: instancia de `threadsconfig`
+            num_workers: `whisper.num_workers`
+
+        returns:
+            el reparto calculado
+        """
+        return cls(
+            total=threads_config.total,
+            whisper=threads_config.whisper,
+            vad=threads_config.vad,
+            numpy=threads_config.numpy,
+            num_workers=num_workers,
+        )
+
+    @property
+    def whisper_cpu_threads(self) -> int:
+        """
+        hilos por réplica de CTranslate2 (`cpu_threads` de `WhisperModel`)
+
+        cada uno de los `num_workers` usa `cpu_threads` hilos así que el
+        presupuesto de WHISPER se divide entre ellos
+        """
+        return max(1, self.whisper // self.num_workers)
+
+    def apply(self) -> None:
+        """
+        aplica el reparto a las librerías y registra los valores efectivos
+        """
+        for var in BLAS_ENV_VARS:
+            os.environ[var] = str(self.numpy)
+
+        blas_effective = self._limit_loaded_pools()
+        torch_effective = self.apply_torch()
+
+        logger.info(
+            "presupuesto de hilos aplicado "
+            f"total={self.total} whisper={self.whisper} "
+            f"(cpu_threads={self.whisper_cpu_threads} x num_workers={self.num_workers}) "
+            f"vad={self.vad} numpy={self.numpy} "
+            f"blas_efectivo={blas_effective if blas_effective is not None else 'env'} "
+            f"torch_efectivo={torch_effective if torch_effective is not None else 'no cargado'}"
+        )
+
+    def _limit_loaded_pools(self) -> Optional[int]:
+        """
+        limita los pools de BLAS/OpenMP ya cargados en el proceso
+
+        returns:
+            el máximo de hilos efectivo tras limitar o none si `threadpoolctl`
+            no está instalado (solo quedan las variables de entorno)
+        """
+        try:
+            from threadpoolctl import threadpool_limits, threadpool_info
+        except ImportError:
+            return None
+
+        threadpool_limits(limits=self.numpy)
+        info = threadpool_info()
+        return max((pool.get("num_threads", 0) for pool in info), default=self.numpy)
+
+    def apply_torch(self) -> Optional[int]:
+        """
+        limita los hilos de torch si ya está importado
+
+        returns:
+            los hilos efectivos de torch o none si torch no está cargado
+        """
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return None
+        torch.set_num_threads(self.vad)
+        return torch.get_num_threads()
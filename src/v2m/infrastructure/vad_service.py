@@ -1,8 +1,72 @@
-import torch
+import glob
+import os
+import types
 import numpy as np
-from typing import List, Optional
+from typing import Callable, List, Optional
 import threading
 from v2m.core.logging import logger
+from v2m.infrastructure.speech_segments import SpeechSegments
+from v2m.infrastructure.energy_gate import EnergyGate
+
+VAD_BACKENDS = ("torch", "onnx")
+
+def _onnx_speech_timestamps(
+    audio: np.ndarray,
+    model,
+    sampling_rate: int = 16000,
+    threshold: float = 0.5,
+    min_speech_duration_ms: int = 250,
+    min_silence_duration_ms: int = 100,
+    speech_pad_ms: int = 30,
+) -> List[dict]:
+    """
+    adapta `faster_whisper.vad.get_speech_timestamps` a la firma de silero (torch)
+
+    los valores por defecto son los de `silero_vad.get_speech_timestamps` para
+    que ambos backends recorten el audio de la misma forma la inferencia usa
+    `model` (la sesión del servicio) y no la de la caché de `get_vad_model`
+    """
+    from faster_whisper.vad import VadOptions
+
+    options = VadOptions(
+        threshold=threshold,
+        min_speech_duration_ms=min_speech_duration_ms,
+        min_silence_duration_ms=min_silence_duration_ms,
+        speech_pad_ms=speech_pad_ms,
+    )
+    return _timestamps_with_model(model)(audio, options, sampling_rate=sampling_rate)
+
+def _timestamps_with_model(model) -> Callable:
+    """
+    `get_speech_timestamps` de `faster-whisper` ligado a un modelo propio
+
+    la función toma el modelo de la caché global `get_vad_model` se crea
+    una copia con su propio espacio de nombres donde `get_vad_model` devuelve
+    `model` así el algoritmo es el de la versión instalada y la caché
+    compartida del proceso no se toca
+    """
+    from faster_whisper import vad
+
+    fn = vad.get_speech_timestamps
+    bound = types.FunctionType(
+        fn.__code__, {**fn.__globals__, "get_vad_model": lambda: model}, fn.__name__, fn.__defaults__, fn.__closure__
+    )
+    bound.__kwdefaults__ = fn.__kwdefaults__
+    return bound
+
+def _silero_onnx_path() -> str:
+    """
+    ruta del modelo silero onnx incluido en `faster-whisper`
+
+    raises:
+        filenotfounderror: si la instalación no trae el modelo
+    """
+    from faster_whisper.utils import get_assets_path
+
+    paths = sorted(glob.glob(os.path.join(get_assets_path(), "silero_vad*.onnx")))
+    if not paths:
+        raise FileNotFoundError(f"no hay modelo silero onnx en {get_assets_path()}")
+    return paths[-1]
 
 class VADService:
     """
@@ -10,8 +74,35 @@ class VADService:
 
     permite truncar los silencios del audio antes de enviarlo a WHISPER
     mejorando la eficiencia y reduciendo el tiempo de inferencia
+
+    admite dos backends
+    -   `torch` descarga silero vad con `torch.hub` (requiere torch y red la primera vez)
+    -   `onnx` usa el modelo silero onnx incluido en `faster-whisper` con onnxruntime
+        carga desde disco en milisegundos y no importa torch
     """
-    def __init__(self):
+    def __init__(
+        self,
+        backend: str = "torch",
+        load_timeout: float = 10.0,
+        parameters: Optional[dict] = None,
+        energy_gate: Optional[EnergyGate] = None,
+        num_threads: int = 0,
+    ):
+        if backend not in VAD_BACKENDS:
+            raise ValueError(f"backend de VAD desconocido {backend} (opciones {', '.join(VAD_BACKENDS)})")
+        self.backend = backend
+        self.load_timeout = load_timeout
+        # parámetros de silero (threshold min_speech_duration_ms min_silence_duration_ms)
+        # el margen y la fusión de huecos se aplican aquí de forma vectorizada
+        # para que ambos backends produzcan exactamente los mismos segmentos
+        parameters = dict(parameters) if parameters is not None else {"threshold": 0.5}
+        self.speech_pad_ms = parameters.pop("speech_pad_ms", 30)
+        self.merge_gap_ms = parameters.pop("merge_gap_ms", 0)
+        self.parameters = parameters
+        # puerta de energía opcional que descarta silencio antes de cargar silero
+        self.energy_gate = energy_gate
+        # hilos de torch asignados por el presupuesto de hilos (0 no se toca)
+        self.num_threads = num_threads
         self.model = None
         self.utils = None
         self.get_speech_timestamps = None
@@ -23,18 +114,26 @@ class VADService:
 
         para evitar bloqueos por descargas de internet, se aplica un timeout. si
         vence el tiempo, se deshabilita VAD para esta sesión y se continúa sin VAD.
+        el backend onnx lee el modelo desde disco y no necesita timeout
         """
         if self.disabled:
             return
         if self.model is not None:
             return
 
+        if self.backend == "onnx":
+            self._load_onnx_model()
+            return
+
         logger.info("cargando modelo silero vad...")
 
         exc_holder: list[Exception] = []
 
         def _do_load():
             try:
+                import torch
+                if self.num_threads > 0:
+                    torch.set_num_threads(self.num_threads)
                 self.model, self.utils = torch.hub.load(
                     repo_or_dir='snakers4/silero-vad',
                     model='silero_vad',
@@ -62,64 +161,178 @@ class VADService:
         (self.get_speech_timestamps, _, _, _, _) = self.utils
         logger.info("modelo silero vad cargado")
 
-    def process(self, audio: np.ndarray, sample_rate: int = 16000) -> np.ndarray:
+    def unload_model(self):
         """
-        procesa el audio y elimina los segmentos de silencio
+        suelta las referencias al modelo para que pueda liberarse
+
+        la siguiente llamada a `process` o `segments` lo vuelve a cargar
+        """
+        self.model = None
+        self.utils = None
+        self.get_speech_timestamps = None
+
+    def _load_onnx_model(self):
+        """
+        carga el modelo silero onnx incluido en `faster-whisper`
+
+        el servicio crea su propia sesión con los hilos del presupuesto la de
+        `get_vad_model` es global al proceso y la comparten otros usuarios
+        (ej `vad_filter` de WHISPER)
+
+        raises:
+            exception: si onnxruntime o el modelo no están disponibles
+        """
+        logger.info("cargando modelo silero vad (onnx)...")
+        try:
+            from faster_whisper.vad import SileroVADModel
+            path = _silero_onnx_path()
+            model = SileroVADModel(path)
+            if self.num_threads > 0:
+                model.session = self._onnx_session(path)
+        except Exception as e:
+            self.disabled = True
+            logger.error(f"error al cargar silero vad onnx {e}")
+            raise
+        self.model = model
+        self.get_speech_timestamps = _onnx_speech_timestamps
+        logger.info("modelo silero vad (onnx) cargado")
+
+    def _onnx_session(self, path: str):
+        """
+        sesión onnxruntime de silero con `num_threads` hilos intra-op
+
+        args:
+            path: ruta del modelo onnx
+
+        returns:
+            la sesión de inferencia
+        """
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.inter_op_num_threads = 1
+        options.intra_op_num_threads = self.num_threads
+        options.enable_cpu_mem_arena = False
+        options.log_severity_level = 4
+        logger.info(f"silero vad (onnx) con {self.num_threads} hilos")
+        return onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"], sess_options=options)
+
+    def segments(self, audio: np.ndarray, sample_rate: int = 16000, gate: bool = True) -> Optional[SpeechSegments]:
+        """
+        calcula una única vez el índice compacto de segmentos de voz del audio
+
+        el índice (int32 de forma (n 2)) ya incluye el margen `speech_pad_ms` y
+        la fusión de pausas de hasta `merge_gap_ms` los consumidores iteran
+        vistas sobre el buffer original o lo pasan a WHISPER como
+        `clip_timestamps` sin concatenar el audio
 
         args:
             audio: array de numpy con el audio (float32)
             sample_rate: frecuencia de muestreo (debe ser 8000 o 16000 para silero)
+            gate: aplica la puerta de energía (el calentamiento la omite para no
+                contaminar la estimación del ruido de fondo)
 
         returns:
-            un nuevo array de numpy que contiene solo los segmentos de voz concatenados
-            si no se detecta voz devuelve un array vacío
+            el índice de segmentos (vacío si no hay voz) o none si el VAD no
+            está disponible (usar el audio completo)
         """
+        empty = SpeechSegments(np.empty((0, 2), dtype=np.int32), sample_rate)
+
         # si el audio está vacío, retornar de inmediato
         if audio.size == 0:
-            return np.array([], dtype=np.float32)
+            return empty
+
+        # puerta de energía: una pulsación accidental se descarta sin cargar el
+        # modelo y el silencio inicial y final no llega a la inferencia neuronal
+        offset = 0
+        gated = audio
+        if self.energy_gate is not None and gate:
+            gated, offset = self.energy_gate.apply(audio)
+            if gated.size == 0:
+                return empty
 
         try:
-            self.load_model()
+            self.load_model(self.load_timeout)
         except Exception:
             # si falla la carga del modelo, continuar con el audio original
             logger.warning("VAD no disponible, se usará audio sin truncar")
-            return audio
+            return None
 
         if self.disabled or self.model is None or self.get_speech_timestamps is None:
             # VAD deshabilitado o no disponible
-            return audio
+            return None
 
-        # convertir numpy array a tensor de torch
-        # silero espera un tensor de forma (1 N) o (N)
-        audio_tensor = torch.from_numpy(audio)
+        if self.backend == "torch":
+            import torch
+            # convertir numpy array a tensor de torch
+            # silero espera un tensor de forma (1 N) o (N)
+            audio_input = torch.from_numpy(gated)
+        else:
+            audio_input = gated
 
-        # obtener timestamps de voz
-        # threshold umbral de probabilidad de voz (0.5 es default)
+        # obtener timestamps de voz con los parámetros de `whisper.vad_parameters`
         timestamps = self.get_speech_timestamps(
-            audio_tensor,
+            audio_input,
             self.model,
             sampling_rate=sample_rate,
-            threshold=0.5
+            speech_pad_ms=0,
+            **self.parameters
         )
 
         if not timestamps:
             logger.info("VAD no se detectó voz")
-            return np.array([], dtype=np.float32)
 
-        # concatenar los chunks de voz
-        speech_chunks = []
-        for ts in timestamps:
-            start = int(ts['start'])
-            end = int(ts['end'])
-            speech_chunks.append(audio[start:end])
+        # los timestamps son relativos a la vista recortada por la puerta
+        return SpeechSegments.from_timestamps(
+            np.fromiter((ts["start"] for ts in timestamps), dtype=np.int64, count=len(timestamps)) + offset,
+            np.fromiter((ts["end"] for ts in timestamps), dtype=np.int64, count=len(timestamps)) + offset,
+            length=audio.shape[0],
+            sample_rate=sample_rate,
+            pad_samples=int(sample_rate * self.speech_pad_ms / 1000),
+            merge_gap_samples=int(sample_rate * self.merge_gap_ms / 1000),
+        )
+
+    def speech_timestamps(self, audio: np.ndarray, sample_rate: int = 16000) -> Optional[List[dict]]:
+        """
+        devuelve los segmentos de voz en el formato de silero
+
+        args:
+            audio: array de numpy con el audio (float32)
+            sample_rate: frecuencia de muestreo (debe ser 8000 o 16000 para silero)
+
+        returns:
+            lista de diccionarios `start` `end` en muestras lista vacía si no hay
+            voz o none si el VAD no está disponible (usar el audio completo)
+        """
+        segments = self.segments(audio, sample_rate)
+        return None if segments is None else segments.to_dicts()
+
+    def process(self, audio: np.ndarray, sample_rate: int = 16000) -> np.ndarray:
+        """
+        procesa el audio y elimina los segmentos de silencio
+
+        materializa una copia compacta para los consumidores que la necesitan
+        quien pueda trabajar sobre el buffer original debe usar `segments`
+
+        args:
+            audio: array de numpy con el audio (float32)
+            sample_rate: frecuencia de muestreo (debe ser 8000 o 16000 para silero)
+
+        returns:
+            un nuevo array de numpy que contiene solo los segmentos de voz concatenados
+            si no se detecta voz devuelve un array vacío
+        """
+        segments = self.segments(audio, sample_rate)
+
+        if segments is None:
+            return audio
 
-        if not speech_chunks:
+        if not segments:
             return np.array([], dtype=np.float32)
 
-        result = np.concatenate(speech_chunks)
+        result = segments.materialize(audio)
 
         original_duration = len(audio) / sample_rate
-        new_duration = len(result) / sample_rate
-        logger.info(f"VAD audio truncado de {original_duration:.2f}s a {new_duration:.2f}s")
+        logger.info(f"VAD audio truncado de {original_duration:.2f}s a {segments.duration:.2f}s")
 
         return result
@@ -6,22 +6,50 @@ de la lógica de bajo nivel para
 -   gestionar el proceso de grabación de audio usando `audiorecorder`
 -   cargar el modelo de WHISPER
 -   realizar la transcripción del audio grabado directamente desde la memoria
+-   opcionalmente transcribir en streaming mientras el usuario sigue hablando
 """
 
-from typing import Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
 from faster_whisper import WhisperModel
 from v2m.application.transcription_service import TranscriptionService
 from v2m.config import config
-from v2m.domain.errors import RecordingError
+from v2m.domain.errors import RecordingError, TranscriptionError
 from v2m.core.logging import logger
+from v2m.core.segment_stream import SegmentStream
 from v2m.infrastructure.audio.recorder import AudioRecorder
+from v2m.infrastructure.audio.endpointer import SilenceEndpointer
 from v2m.infrastructure.vad_service import VADService
+from v2m.infrastructure.streaming_transcriber import StreamingTranscriber
+from v2m.infrastructure.thread_budget import ThreadBudget
+from v2m.infrastructure.model_residency import ModelResidencyManager
+from v2m.infrastructure.model_router import ModelRouter
+from v2m.infrastructure.model_store import ModelStore
+from v2m.infrastructure.language_prior import LanguagePrior
+from v2m.infrastructure.calibration import load_calibration, synthetic_clip
+from v2m.infrastructure.retained_audio import RetainedRecording, RetainedRecordings
+from v2m.infrastructure.speech_segments import coalesce_clip_timestamps
+
+# prompt inicial (optimización bilingüe)
+# esto le dice al modelo "oye el audio será en español o inglés"
+# ayuda mucho con audios cortos que podrían confundirse
+BILINGUAL_PROMPT = "esta es una transcripción en español this is also in english"
 
 class WhisperTranscriptionService(TranscriptionService):
     """
     implementación del `transcriptionservice` que usa `faster-whisper` y `audiorecorder`
     """
-    def __init__(self, vad_service: Optional[VADService] = None) -> None:
+    def __init__(
+        self,
+        vad_service: Optional[VADService] = None,
+        thread_budget: Optional[ThreadBudget] = None,
+        residency: Optional[ModelResidencyManager] = None,
+        segment_stream: Optional[SegmentStream] = None,
+        model_store: Optional[ModelStore] = None,
+    ) -> None:
         """
         inicializa el servicio de transcripción
 
@@ -29,10 +57,63 @@ class WhisperTranscriptionService(TranscriptionService):
 
         args:
             vad_service: servicio opcional para truncado de silencios
+            thread_budget: reparto de hilos de CPU (define `cpu_threads` de CTranslate2)
+            residency: gestor que descarga los modelos por inactividad y los precarga al grabar
+            segment_stream: difusor al que se publica cada segmento en cuanto se decodifica
+            model_store: almacén local del que se cargan los modelos sin consultar el hub
         """
         self._model: Optional[WhisperModel] = None
-        self.recorder = AudioRecorder()
+        # modelos de los niveles del enrutador distintos del principal (carga perezosa)
+        self._tier_models: Dict[str, WhisperModel] = {}
+        self._model_lock = threading.Lock()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        endpointing_config = config.whisper.endpointing
+        endpointer = None
+        if endpointing_config.enabled:
+            endpointer = SilenceEndpointer(
+                silence_ms=endpointing_config.silence_ms,
+                min_speech_ms=endpointing_config.min_speech_ms,
+                energy_threshold=endpointing_config.energy_threshold,
+            )
+        audio_config = config.audio
+        self.recorder = AudioRecorder(
+            endpointer=endpointer,
+            warm_stream=audio_config.warm_stream,
+            preroll_ms=audio_config.preroll_ms,
+            idle_close_seconds=audio_config.idle_close_seconds,
+            max_seconds=(audio_config.journal_max_minutes if audio_config.journal else audio_config.max_minutes) * 60,
+            journal_path=config.paths.recording_journal if audio_config.journal else None,
+        )
         self.vad_service = vad_service
+        self.thread_budget = thread_budget
+        self.residency = residency
+        self.model_store = model_store
+        self.segment_stream = segment_stream
+        router_config = config.whisper.router
+        self.router = ModelRouter.from_config(router_config, config.whisper.model) if router_config.enabled else None
+        prior_config = config.whisper.language_prior
+        self.language_prior: Optional[LanguagePrior] = None
+        if prior_config.enabled:
+            self.language_prior = LanguagePrior(
+                history=prior_config.history,
+                min_probability=prior_config.min_probability,
+                min_avg_logprob=prior_config.min_avg_logprob,
+            )
+        retention_config = config.whisper.retention
+        self.retained: Optional[RetainedRecordings] = None
+        if retention_config.enabled:
+            self.retained = RetainedRecordings(
+                capacity=retention_config.recordings,
+                max_seconds=retention_config.max_seconds,
+                sample_rate=self.recorder.sample_rate,
+            )
+        self._streamer: Optional[StreamingTranscriber] = None
+
+    @property
+    def _cpu_threads(self) -> int:
+        """hilos por réplica de CTranslate2 (0 deja que la librería decida)"""
+        return self.thread_budget.whisper_cpu_threads if self.thread_budget else 0
 
     @property
     def model(self) -> WhisperModel:
@@ -46,38 +127,256 @@ class WhisperTranscriptionService(TranscriptionService):
         returns:
             la instancia del modelo de WHISPER cargado
         """
-        if self._model == None:
-            logger.info("cargando modelo de WHISPER...")
-            whisper_config = config.whisper
-
-            try:
-                self._model = WhisperModel(
-                    whisper_config.model,
-                    device=whisper_config.device,
-                    compute_type=whisper_config.compute_type,
-                    device_index=whisper_config.device_index,
-                    num_workers=whisper_config.num_workers
-                )
-                logger.info(f"modelo de WHISPER cargado en {whisper_config.device}")
-            except Exception as e:
-                logger.error(f"Error cargando modelo en {whisper_config.device}: {e}")
-                if whisper_config.device == "cuda":
-                    logger.warning("Intentando fallback a CPU...")
-                    try:
-                        self._model = WhisperModel(
-                            whisper_config.model,
-                            device="cpu",
-                            compute_type="int8", # CPU suele requerir int8 para velocidad
-                            num_workers=whisper_config.num_workers
-                        )
-                        logger.info("modelo de WHISPER cargado en CPU (Fallback)")
-                    except Exception as e2:
-                        logger.critical(f"Fallo crítico: No se pudo cargar el modelo ni en CPU: {e2}")
-                        raise e2
-                else:
-                    raise e
-
-        return self._model
+        with self._model_lock:
+            if self._model is None:
+                self._model = self._load_model()
+            return self._model
+
+    @property
+    def is_model_loaded(self) -> bool:
+        """indica si el modelo de WHISPER está en memoria"""
+        return self._model is not None
+
+    @property
+    def draft_model(self) -> WhisperModel:
+        """
+        modelo de borrador de `whisper.speculative` cargándolo si hace falta
+
+        se registra en la residencia para precargarlo así el primer borrador
+        no paga la carga del modelo
+
+        returns:
+            la instancia del modelo de borrador
+        """
+        return self._tier_model(config.whisper.speculative.draft_model)
+
+    @property
+    def is_draft_model_loaded(self) -> bool:
+        """indica si el modelo de borrador está en memoria"""
+        return self.is_tier_model_loaded(config.whisper.speculative.draft_model)
+
+    def is_tier_model_loaded(self, model_name: str) -> bool:
+        """indica si un modelo de nivel (del enrutador o el borrador) está en memoria"""
+        return self.is_model_loaded if model_name == config.whisper.model else model_name in self._tier_models
+
+    def unload_model(self) -> None:
+        """
+        suelta la referencia al modelo de WHISPER para liberar su memoria
+
+        el siguiente acceso a `model` lo vuelve a cargar también suelta los
+        modelos de los niveles del enrutador
+        """
+        with self._model_lock:
+            self._model = None
+            self._tier_models.clear()
+
+    def unload_draft_model(self) -> None:
+        """
+        suelta solo el modelo de borrador de `whisper.speculative`
+
+        el modelo principal sigue en memoria si el borrador es el mismo
+        modelo no se suelta nada
+        """
+        self.unload_tier_model(config.whisper.speculative.draft_model)
+
+    def load_tier_model(self, model_name: str) -> None:
+        """
+        carga un modelo de nivel para que la residencia lo precargue
+
+        args:
+            model_name: nombre del modelo de un nivel de `whisper.router`
+        """
+        self._tier_model(model_name)
+
+    def unload_tier_model(self, model_name: str) -> None:
+        """suelta un modelo de nivel sin tocar el principal"""
+        if model_name == config.whisper.model:
+            return
+        with self._model_lock:
+            self._tier_models.pop(model_name, None)
+
+    def _tier_model(self, model_name: str) -> WhisperModel:
+        """
+        devuelve el modelo de un nivel del enrutador cargándolo si hace falta
+
+        args:
+            model_name: nombre del modelo elegido por el enrutador
+
+        returns:
+            la instancia del modelo
+        """
+        if model_name == config.whisper.model:
+            return self.model
+        with self._model_lock:
+            if model_name not in self._tier_models:
+                self._tier_models[model_name] = self._load_model(model_name)
+            return self._tier_models[model_name]
+
+    def _select_model(self, audio_data: np.ndarray, clip_timestamps: Optional[List[float]]) -> WhisperModel:
+        """
+        elige el modelo según la duración de voz y la carga del servicio
+
+        args:
+            audio_data: audio que se va a transcribir
+            clip_timestamps: intervalos de voz del VAD o none si no hubo VAD
+
+        returns:
+            el modelo que atenderá la transcripción
+        """
+        if self.router is None:
+            return self.model
+
+        speech_seconds = self._speech_seconds(audio_data, clip_timestamps)
+        model_name, reason = self.router.select(speech_seconds, in_flight=self._in_flight - 1)
+        logger.info(f"enrutador de modelos eligió {model_name} ({reason})")
+        return self._tier_model(model_name)
+
+    @contextmanager
+    def _models_in_use(self) -> Iterator[None]:
+        """
+        marca un tramo de uso de los modelos para que no se descarguen a mitad
+        """
+        if self.residency is None:
+            yield
+            return
+        with self.residency.active():
+            yield
+
+    def _load_settings(self, model_name: str, device: str, default_compute_type: Optional[str] = None) -> dict:
+        """
+        parámetros de carga de `whispermodel` para un dispositivo
+
+        si `whisper.calibration` está activo y hay una calibración guardada
+        para esta máquina y modelo se usan sus valores en lugar de los de
+        `config.toml`
+
+        args:
+            model_name: modelo a cargar
+            device: dispositivo de CTranslate2
+            default_compute_type: tipo a usar sin calibración (por defecto `whisper.compute_type`)
+
+        returns:
+            diccionario con `compute_type` `cpu_threads` y `num_workers`
+        """
+        whisper_config = config.whisper
+        settings = {
+            "compute_type": default_compute_type or whisper_config.compute_type,
+            "cpu_threads": self._cpu_threads,
+            "num_workers": whisper_config.num_workers,
+        }
+        calibration_config = whisper_config.calibration
+        if calibration_config.enabled:
+            calibrated = load_calibration(calibration_config.cache_file, model_name, device)
+            if calibrated:
+                settings.update({k: calibrated[k] for k in settings if k in calibrated})
+                logger.info(f"usando calibración guardada para {model_name} en {device} {settings}")
+        return settings
+
+    def _load_model(self, model_name: Optional[str] = None) -> WhisperModel:
+        """
+        construye el modelo de WHISPER con fallback a CPU
+
+        args:
+            model_name: modelo a cargar (por defecto `whisper.model`)
+
+        returns:
+            la instancia del modelo cargado
+        """
+        whisper_config = config.whisper
+        model_name = model_name or whisper_config.model
+        logger.info(f"cargando modelo de WHISPER {model_name}...")
+        # con almacén se pasa la ruta local y `faster-whisper` no toca la red
+        source = self.model_store.resolve(model_name) if self.model_store else model_name
+
+        try:
+            model = WhisperModel(
+                source,
+                device=whisper_config.device,
+                device_index=whisper_config.device_index,
+                **self._load_settings(model_name, whisper_config.device)
+            )
+            logger.info(f"modelo de WHISPER {model_name} cargado en {whisper_config.device}")
+        except Exception as e:
+            logger.error(f"Error cargando modelo en {whisper_config.device}: {e}")
+            if whisper_config.device == "cuda":
+                logger.warning("Intentando fallback a CPU...")
+                try:
+                    # sin calibración de CPU int8 suele ser lo más rápido
+                    model = WhisperModel(
+                        source,
+                        device="cpu",
+                        **self._load_settings(model_name, "cpu", default_compute_type="int8")
+                    )
+                    logger.info("modelo de WHISPER cargado en CPU (Fallback)")
+                except Exception as e2:
+                    logger.critical(f"Fallo crítico: No se pudo cargar el modelo ni en CPU: {e2}")
+                    raise e2
+            else:
+                raise e
+
+        return model
+
+    def warm_up(self) -> None:
+        """
+        ejecuta inferencias de calentamiento por la ruta VAD -> WHISPER
+
+        construir `WhisperModel` no basta la primera llamada real a
+        `transcribe` paga el crecimiento de los asignadores la preparación de
+        kernels y la inicialización de silero el calentamiento decodifica dos
+        veces un clip corto (sintético o el de `whisper.warmup.clip_path`) y
+        registra la latencia en frío y en caliente
+        """
+        warmup_config = config.whisper.warmup
+        sample_rate = self.recorder.sample_rate
+        if warmup_config.clip_path:
+            from faster_whisper import decode_audio
+            audio = decode_audio(str(warmup_config.clip_path), sampling_rate=sample_rate)
+        else:
+            audio = synthetic_clip(warmup_config.clip_seconds, sample_rate)
+
+        logger.info(f"calentando la ruta de transcripción con {audio.size / sample_rate:.1f}s de audio...")
+        with self._transcription_slot():
+            cold = self._warm_up_pass(audio)
+            warm = self._warm_up_pass(audio)
+        logger.info(f"calentamiento completado primera inferencia {cold:.2f}s siguiente {warm:.2f}s")
+
+    def _warm_up_pass(self, audio_data: np.ndarray) -> float:
+        """
+        una pasada de calentamiento
+
+        returns:
+            la duración de la pasada en segundos
+        """
+        whisper_config = config.whisper
+        started = time.perf_counter()
+        if self.vad_service:
+            self.vad_service.segments(audio_data, self.recorder.sample_rate, gate=False)
+
+        # sin vad_filter para que el decodificador procese el clip aunque silero no vea voz
+        segments, _ = self.model.transcribe(
+            audio_data,
+            language=None if whisper_config.language == "auto" else whisper_config.language,
+            task="transcribe",
+            initial_prompt=BILINGUAL_PROMPT,
+            beam_size=whisper_config.beam_size,
+            best_of=whisper_config.best_of,
+            temperature=whisper_config.temperature,
+            vad_filter=False,
+        )
+        list(segments)
+        return time.perf_counter() - started
+
+    def set_auto_stop_callback(self, callback: Optional[Callable[[], None]]) -> None:
+        """
+        registra la función que se invoca cuando el endpointer detecta silencio final
+
+        el callback se ejecuta en el hilo de audio de portaudio así que solo
+        debe programar la parada (ej `loop.call_soon_threadsafe`)
+
+        args:
+            callback: función no bloqueante o none para desactivarlo
+        """
+        self.recorder.on_endpoint = callback
 
     def start_recording(self) -> None:
         """
@@ -95,15 +394,33 @@ class WhisperTranscriptionService(TranscriptionService):
             logger.error(f"error al iniciar grabación {e}")
             raise e
 
+        # si los modelos se descargaron por inactividad se recargan mientras el usuario habla
+        if self.residency is not None:
+            self.residency.prefetch()
+
+        streaming_config = config.whisper.streaming
+        if streaming_config.enabled:
+            streamer = StreamingTranscriber(
+                self.recorder,
+                lambda audio_data, initial_prompt: self._transcribe_window(streamer, audio_data, initial_prompt),
+                on_segment=self._segment_callback,
+                window_seconds=streaming_config.window_seconds,
+                prompt_chars=streaming_config.prompt_chars,
+                base_prompt=BILINGUAL_PROMPT,
+            )
+            self._streamer = streamer
+            streamer.start()
+
     def stop_and_transcribe(self) -> str:
         """
         detiene la grabación y transcribe el audio
 
         realiza los siguientes pasos
         1.  detiene el `audiorecorder` y obtiene los datos de audio en memoria (numpy array)
-        2.  aplica vad (smart truncation) si está disponible
-        3.  verifica que se haya grabado audio válido
-        4.  utiliza el modelo de WHISPER para transcribir el audio directamente desde memoria
+        2.  si el streaming está activo solo decodifica la cola pendiente
+        3.  si no aplica vad (smart truncation) si está disponible
+        4.  verifica que se haya grabado audio válido
+        5.  utiliza el modelo de WHISPER para transcribir el audio directamente desde memoria
 
         returns:
             el texto transcrito
@@ -111,59 +428,512 @@ class WhisperTranscriptionService(TranscriptionService):
         raises:
             recordingerror: si no hay una grabación activa o si el audio es inválido
         """
+        streamer, self._streamer = self._streamer, None
+        return self._transcribe_stopped(self._stop_recorder(streamer), streamer)
+
+    def stop_recording(self) -> Callable[[], Tuple[str, Optional[Callable[[], str]]]]:
+        """
+        detiene el micrófono en el acto y devuelve la transcripción diferida
+
+        el handler encola solo la función devuelta así el micrófono no sigue
+        grabando mientras los trabajadores están ocupados
+
+        returns:
+            función bloqueante con el resultado de `stop_and_transcribe_speculative`
+
+        raises:
+            recordingerror: si no hay una grabación activa o si el audio es inválido
+        """
+        streamer, self._streamer = self._streamer, None
+        audio_data = self._stop_recorder(streamer)
+        if streamer is not None or not config.whisper.speculative.enabled:
+            return lambda: (self._transcribe_stopped(audio_data, streamer), None)
+        return lambda: self._transcribe_speculative(audio_data)
+
+    def stop_and_transcribe_speculative(self) -> Tuple[str, Optional[Callable[[], str]]]:
+        """
+        detiene la grabación y devuelve un borrador rápido y su refinado diferido
+
+        en dictados largos decodifica primero con el modelo pequeño de
+        `whisper.speculative` (beam 1) y devuelve una función que ejecuta la
+        pasada completa sobre el mismo audio y los mismos intervalos del VAD
+        los dictados cortos o el modo streaming se transcriben en una sola pasada
+
+        returns:
+            tupla (texto refinado) donde refinado es none si no hay segunda pasada
+
+        raises:
+            recordingerror: si no hay una grabación activa o si el audio es inválido
+        """
+        return self.stop_recording()()
+
+    def _transcribe_stopped(self, audio_data: np.ndarray, streamer: Optional[StreamingTranscriber]) -> str:
+        """
+        transcribe una grabación ya detenida en una sola pasada
+
+        args:
+            audio_data: el audio devuelto por `audiorecorder.stop`
+            streamer: transcriptor en streaming del dictado o none
+
+        returns:
+            el texto transcrito
+        """
+        # --- streaming: las ventanas completas ya se decodificaron durante la grabación ---
+        # solo queda la cola pendiente
+        if streamer:
+            text = streamer.finish(audio_data)
+            # el VAD del audio completo se deja para cuando se pida retranscribir
+            entry = self._retain(audio_data, None, analyzed=False)
+            if entry is not None:
+                entry.text = text
+            self._complete(text)
+            logger.info("transcripción completada")
+        else:
+            text = self._transcribe_audio(audio_data, retain=True)
+
+        # el diario solo se conserva hasta que su audio queda transcrito
+        self.recorder.discard_journal()
+        return text
+
+    def _transcribe_speculative(self, audio_data: np.ndarray) -> Tuple[str, Optional[Callable[[], str]]]:
+        """
+        decodifica el borrador de una grabación ya detenida
+
+        returns:
+            tupla (texto refinado) como `stop_and_transcribe_speculative`
+        """
+        speculative_config = config.whisper.speculative
+        logger.info("transcribiendo audio...")
+        with self._transcription_slot():
+            clip_timestamps = self._clip_timestamps(audio_data)
+            entry = self._retain(audio_data, clip_timestamps)
+            speech_seconds = self._speech_seconds(audio_data, clip_timestamps)
+            draft = speech_seconds >= speculative_config.min_speech_seconds
+            segments = self._decode(
+                audio_data, BILINGUAL_PROMPT, clip_timestamps,
+                draft=draft, on_segment=None if draft else self._segment_callback,
+            )
+            text = self._segments_text(segments)
+        self.recorder.discard_journal()
+        if entry is not None:
+            entry.text = text
+
+        if not draft or not text.strip():
+            self._complete(text)
+            logger.info("transcripción completada")
+            return text, None
+
+        logger.info(f"borrador de {speech_seconds:.2f}s de voz listo refinando en segundo plano")
+
+        def refine() -> str:
+            with self._transcription_slot():
+                # sin publicar segmentos el sumidero del portapapeles pisaría el
+                # borrador y el handler ya no podría sustituirlo
+                segments = self._decode(audio_data, BILINGUAL_PROMPT, clip_timestamps)
+                final = self._segments_text(segments)
+            if entry is not None:
+                entry.text = final
+            self._complete(final)
+            logger.info("transcripción refinada completada")
+            return final
+
+        return text, refine
+
+    def _stop_recorder(self, streamer: Optional[StreamingTranscriber] = None) -> np.ndarray:
+        """
+        detiene el `audiorecorder` y valida el audio capturado
+
+        args:
+            streamer: transcriptor en curso que se cancela si la parada falla
+
+        returns:
+            el audio grabado
+
+        raises:
+            recordingerror: si no hay una grabación activa o si el audio está vacío
+        """
         try:
             # detener grabación y obtener audio (sin guardar a disco)
             audio_data = self.recorder.stop()
         except RecordingError as e:
+            if streamer:
+                streamer.cancel()
             logger.error(f"error al detener grabación {e}")
             raise e
 
         if audio_data.size == 0:
+            if streamer:
+                streamer.cancel()
             raise RecordingError("no se grabó audio o el buffer está vacío")
 
-        # --- aplicar vad (smart truncation) ---
-        if self.vad_service:
-            try:
-                audio_data = self.vad_service.process(audio_data)
-                if audio_data.size == 0:
-                    logger.warning("VAD eliminó todo el audio (solo silencio detectado)")
-                    # podríamos lanzar error o retornar string vacío
-                    return ""
-            except Exception as e:
-                logger.error(f"fallo en VAD usando audio original {e}")
-
-        # --- transcripción con WHISPER ---
+        return audio_data
+
+    def has_recoverable_recording(self) -> bool:
+        """
+        indica si quedó un diario de grabación de una sesión interrumpida
+
+        returns:
+            true si hay audio recuperable en `paths.recording_journal`
+        """
+        return self.recorder.recover_journal() is not None
+
+    def transcribe_recovered(self) -> str:
+        """
+        transcribe el diario de grabación dejado por una sesión interrumpida
+
+        el audio se lee directamente del archivo mapeado sin copiarlo a memoria
+
+        returns:
+            el texto transcrito
+
+        raises:
+            recordingerror: si no hay un diario recuperable
+        """
+        audio_data = self.recorder.recover_journal()
+        if audio_data is None:
+            raise RecordingError("no hay una grabación interrumpida que recuperar")
+
+        logger.info(f"recuperando grabación interrumpida de {audio_data.size / self.recorder.sample_rate:.2f}s")
+        text = self._transcribe_audio(audio_data, retain=True)
+        self.recorder.discard_journal()
+        return text
+
+    def transcribe_file(self, path: str) -> str:
+        """
+        transcribe un archivo de audio decodificándolo a 16 kHz mono
+
+        args:
+            path: ruta del archivo (cualquier formato que decodifique `av`)
+
+        returns:
+            el texto transcrito
+
+        raises:
+            transcriptionerror: si el archivo no existe o no se puede decodificar
+        """
+        from faster_whisper import decode_audio
+        try:
+            audio_data = decode_audio(path, sampling_rate=self.recorder.sample_rate)
+        except Exception as e:
+            raise TranscriptionError(f"no se pudo leer el audio de {path} {e}") from e
+
+        logger.info(f"transcribiendo archivo {path} ({audio_data.size / self.recorder.sample_rate:.2f}s)")
+        # un trabajo de fondo no publica nada en `segment_stream` (es del dictado)
+        return self._transcribe_audio(audio_data, publish=False)
+
+    def _transcribe_audio(self, audio_data: np.ndarray, retain: bool = False, publish: bool = True) -> str:
+        """
+        transcribe un buffer completo con WHISPER
+
+        args:
+            audio_data: audio float32 mono a 16 kHz
+            retain: conserva el audio tras el VAD para `retranscribe`
+            publish: difunde los segmentos y el texto final en `segment_stream`
+
+        returns:
+            el texto transcrito o cadena vacía si solo había silencio
+        """
+        # --- transcripción con WHISPER (vad incluido en una sola pasada) ---
         logger.info("transcribiendo audio...")
+        with self._transcription_slot():
+            clip_timestamps = self._clip_timestamps(audio_data)
+            entry = self._retain(audio_data, clip_timestamps) if retain else None
+            segments = self._decode(
+                audio_data, BILINGUAL_PROMPT, clip_timestamps,
+                on_segment=self._segment_callback if publish else None,
+            )
+
+        text = self._segments_text(segments)
+        if entry is not None:
+            entry.text = text
+        if publish:
+            self._complete(text)
+        logger.info("transcripción completada")
+
+        return text
+
+    def _retain(self, audio_data: np.ndarray, clip_timestamps: Optional[List[float]], analyzed: bool = True) -> Optional[RetainedRecording]:
+        """
+        conserva una grabación para `retranscribe` si la retención está activa
+
+        returns:
+            la entrada conservada o none
+        """
+        if self.retained is None or (analyzed and clip_timestamps is not None and not clip_timestamps):
+            # una grabación sin voz no tiene nada que retranscribir
+            return None
+        return self.retained.add(audio_data, clip_timestamps, analyzed=analyzed)
+
+    def retranscribe(
+        self,
+        index: int = 0,
+        beam_size: Optional[int] = None,
+        language: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        """
+        vuelve a ejecutar WHISPER sobre una grabación conservada
+
+        reutiliza el audio y los intervalos del VAD ya calculados solo se
+        repite la decodificación con los parámetros indicados
+
+        args:
+            index: 0 la última grabación 1 la anterior
+            beam_size: ancho de búsqueda (por defecto `whisper.beam_size`)
+            language: idioma forzado sin detección (por defecto `whisper.language`)
+            model: modelo a usar (por defecto el que elija el enrutador)
+
+        returns:
+            el texto transcrito
+
+        raises:
+            transcriptionerror: si no hay una grabación conservada con ese índice
+        """
+        entry = self.retained.get(index) if self.retained is not None else None
+        if entry is None:
+            raise TranscriptionError(f"no hay una grabación conservada con índice {index}")
+
+        logger.info(
+            f"retranscribiendo grabación {index} ({entry.audio.size / self.recorder.sample_rate:.2f}s) "
+            f"beam {beam_size or 'config'} idioma {language or 'config'} modelo {model or 'config'}"
+        )
+        # el resultado lo copia el handler publicarlo se mezclaría con un dictado en curso
+        with self._transcription_slot():
+            if not entry.analyzed:
+                entry.clip_timestamps = self._clip_timestamps(entry.audio)
+                entry.analyzed = True
+            segments = self._decode(
+                entry.audio, BILINGUAL_PROMPT, entry.clip_timestamps,
+                beam_size=beam_size, language=language, model_name=model,
+            )
+
+        text = self._segments_text(segments)
+        entry.text = text
+        logger.info("retranscripción completada")
+        return text
+
+    @property
+    def _segment_callback(self) -> Optional[Callable[[str], None]]:
+        """
+        publica cada segmento en `segment_stream` si hay suscriptores
+
+        solo lo usa el dictado interactivo los trabajos de fondo y la pasada
+        de refinado no publican segmentos
+        """
+        if self.segment_stream is None or not self.segment_stream.has_subscribers:
+            return None
+        return self.segment_stream.publish
+
+    def _complete(self, text: str) -> None:
+        """publica el texto final de la transcripción"""
+        if self.segment_stream is not None:
+            self.segment_stream.complete(text)
+
+    @staticmethod
+    def _segments_text(segments: List) -> str:
+        """une el texto de los segmentos decodificados"""
+        return " ".join([segment.text.strip() for segment in segments])
+
+    def _speech_seconds(self, audio_data: np.ndarray, clip_timestamps: Optional[List[float]]) -> float:
+        """
+        duración de voz según los intervalos del VAD o del audio completo sin VAD
+        """
+        if clip_timestamps is None:
+            return audio_data.size / self.recorder.sample_rate
+        return float(sum(clip_timestamps[1::2]) - sum(clip_timestamps[0::2]))
+
+    def _clip_timestamps(self, audio_data: np.ndarray) -> Optional[List[float]]:
+        """
+        ejecuta el VAD una única vez y convierte su índice a `clip_timestamps`
+
+        args:
+            audio_data: audio float32 mono a 16 kHz
+
+        returns:
+            lista plana [inicio fin inicio fin ...] en segundos lista vacía si
+            solo hay silencio o none si no hay VAD (WHISPER usará `vad_filter`)
+        """
+        if not self.vad_service:
+            return None
+
+        sample_rate = self.recorder.sample_rate
+        try:
+            segments = self.vad_service.segments(audio_data, sample_rate)
+        except Exception as e:
+            logger.error(f"fallo en VAD usando audio original {e}")
+            return None
+
+        if segments is None:
+            return None
+        if not segments:
+            logger.warning("VAD eliminó todo el audio (solo silencio detectado)")
+            return []
+
+        logger.info(f"VAD {len(segments)} segmentos de voz {segments.duration:.2f}s de {audio_data.size / sample_rate:.2f}s")
+        return segments.to_clip_timestamps()
+
+    def _transcribe_window(self, streamer: StreamingTranscriber, audio_data: np.ndarray, initial_prompt: Optional[str]) -> List:
+        """
+        ejecuta WHISPER sobre una ventana o la cola final de un dictado en streaming
+
+        el VAD se ejecuta una sola vez sus intervalos agrupados en ventanas se
+        pasan como `clip_timestamps` sobre el buffer original sin concatenar audio y con
+        el filtro vad interno de `faster-whisper` desactivado los tiempos de
+        los segmentos siguen siendo relativos al audio original
+
+        el modelo se decide una vez por dictado la duración de una ventana no
+        es la del dictado y el enrutador la mandaría siempre a un nivel pequeño
+        si ya se decodificó alguna ventana durante la grabación el dictado es
+        largo y todas usan el modelo principal solo un dictado más corto que
+        una ventana (que se decodifica entero al parar) pasa por el enrutador
+
+        args:
+            streamer: transcriptor del dictado al que pertenece la ventana
+            audio_data: audio float32 mono a 16 kHz
+            initial_prompt: contexto que se inyecta al decodificador
+
+        returns:
+            la lista de segmentos de `faster-whisper` (con `start` `end` y `text`)
+        """
+        model_name = self.router.default_model if self.router is not None and streamer.windows else None
+        with self._transcription_slot():
+            return self._decode(audio_data, initial_prompt, self._clip_timestamps(audio_data), model_name=model_name)
+
+    @contextmanager
+    def _transcription_slot(self) -> Iterator[None]:
+        """
+        cuenta la transcripción en curso para el enrutador y fija los modelos en memoria
+        """
+        with self._in_flight_lock:
+            self._in_flight += 1
+        try:
+            with self._models_in_use():
+                yield
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+
+    def _decode(
+        self,
+        audio_data: np.ndarray,
+        initial_prompt: Optional[str],
+        clip_timestamps: Optional[List[float]],
+        draft: bool = False,
+        on_segment: Optional[Callable[[str], None]] = None,
+        beam_size: Optional[int] = None,
+        language: Optional[str] = None,
+        model_name: Optional[str] = None,
+    ) -> List:
+        """
+        decodifica el audio con los intervalos del VAD ya calculados
+
+        args:
+            audio_data: audio float32 mono a 16 kHz
+            initial_prompt: contexto que se inyecta al decodificador
+            clip_timestamps: intervalos de voz lista vacía si solo hay silencio o none sin VAD
+            draft: usa el modelo de borrador de `whisper.speculative` con búsqueda voraz
+            on_segment: recibe el texto de cada segmento en cuanto el generador lo produce
+            beam_size: ancho de búsqueda en lugar de `whisper.beam_size` (y `best_of`)
+            language: idioma forzado en lugar de `whisper.language`
+            model_name: modelo en lugar del que elija el enrutador
+
+        returns:
+            la lista de segmentos decodificados
+        """
         whisper_config = config.whisper
 
+        if clip_timestamps is not None and not clip_timestamps:
+            return []
+
+        if draft:
+            model = self.draft_model
+            beam_size = best_of = 1
+        else:
+            model = self._tier_model(model_name) if model_name else self._select_model(audio_data, clip_timestamps)
+            if beam_size:
+                best_of = beam_size
+            else:
+                beam_size, best_of = whisper_config.beam_size, whisper_config.best_of
+
+        clips = "0"
+        if clip_timestamps is not None:
+            # un clip por intervalo costaría una pasada del encoder por pausa
+            window = getattr(getattr(model, "feature_extractor", None), "chunk_length", 30)
+            clips = coalesce_clip_timestamps(clip_timestamps, window)
+
+        def run(lang: Optional[str]):
+            # faster-whisper acepta numpy array directamente
+            return model.transcribe(
+                audio_data,
+                language=lang,
+                task="transcribe",  # <--- bloquea la traducción
+                initial_prompt=initial_prompt,  # <--- inyección de contexto
+                beam_size=beam_size,
+                best_of=best_of,
+                temperature=whisper_config.temperature,
+                # sin VAD propio se recurre al filtro de faster-whisper como única pasada
+                vad_filter=whisper_config.vad_filter if clip_timestamps is None else False,
+                vad_parameters=whisper_config.vad_parameters.model_dump(exclude={"merge_gap_ms"}),
+                clip_timestamps=clips
+            )
+
         # 1 lógica para auto-detección
-        lang = whisper_config.language
+        lang = language or whisper_config.language
+        prior = None
         if lang == "auto":
             lang = None  # none activa la detección automática en faster-whisper
+            if self.language_prior is not None:
+                prior = self.language_prior.likely()
+                lang = prior or self._detect_language(model, audio_data, clip_timestamps)
 
-        # 2 prompt inicial (optimización bilingüe)
-        # esto le dice al modelo "oye el audio será en español o inglés"
-        # ayuda mucho con audios cortos que podrían confundirse
-        bilingual_prompt = "esta es una transcripción en español this is also in english"
+        segments, info = run(lang)
+        segments = iter(segments)
+        first = next(segments, None)
 
-        # faster-whisper acepta numpy array directamente
-        segments, info = self.model.transcribe(
-            audio_data,
-            language=lang,
-            task="transcribe",  # <--- bloquea la traducción
-            initial_prompt=bilingual_prompt,  # <--- inyección de contexto
-            beam_size=whisper_config.beam_size,
-            best_of=whisper_config.best_of,
-            temperature=whisper_config.temperature,
-            vad_filter=whisper_config.vad_filter,
-            vad_parameters=whisper_config.vad_parameters.model_dump()
-        )
+        if prior is not None:
+            if first is None or self.language_prior.accepts(first):
+                self.language_prior.hit()
+            else:
+                # el idioma forzado no encaja solo se pierde un segmento de decodificación
+                self.language_prior.reject(prior)
+                segments, info = run(self._detect_language(model, audio_data, clip_timestamps))
+                segments = iter(segments)
+                first = next(segments, None)
+            self.language_prior.log_stats()
 
         # si es detección automática podemos loguear qué idioma detectó
         if lang is None:
             logger.info(f"idioma detectado {info.language} (prob {info.language_probability:.2f})")
 
-        text = " ".join([segment.text.strip() for segment in segments])
-        logger.info("transcripción completada")
+        if first is None:
+            return []
 
-        return text
+        decoded = [first]
+        if on_segment is not None:
+            on_segment(first.text.strip())
+        for segment in segments:
+            decoded.append(segment)
+            if on_segment is not None:
+                on_segment(segment.text.strip())
+        return decoded
+
+    def _detect_language(self, model: WhisperModel, audio_data: np.ndarray, clip_timestamps: Optional[List[float]]) -> str:
+        """
+        detecta el idioma desde el inicio de la voz y lo registra en el prior
+
+        args:
+            model: el modelo que hará la transcripción
+            audio_data: audio float32 mono a 16 kHz
+            clip_timestamps: intervalos de voz del VAD o none
+
+        returns:
+            el código de idioma detectado
+        """
+        # la ventana de 30 s de la detección empieza en la voz y no en el silencio inicial
+        start = int(clip_timestamps[0] * self.recorder.sample_rate) if clip_timestamps else 0
+        started = time.perf_counter()
+        language, probability, _ = model.detect_language(audio_data[start:])
+        seconds = time.perf_counter() - started
+        self.language_prior.record(language, probability, seconds)
+        logger.info(f"idioma detectado {language} (prob {probability:.2f}) en {seconds:.3f}s")
+        return language
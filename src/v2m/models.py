@@ -0,0 +1,67 @@
+"""
+comando de gestión del almacén local de modelos de WHISPER
+
+`python -m v2m.models list` muestra los modelos configurados y los presentes
+`prefetch` los descarga una vez `verify` comprueba sus checksums y `prune`
+borra los que la configuración ya no usa después del `prefetch` el daemon
+arranca sin tocar la red con `[whisper.store] offline = true`
+"""
+
+import argparse
+import sys
+from v2m.config import config
+from v2m.infrastructure.model_store import ModelStore, configured_models
+
+def main() -> None:
+    store_config = config.whisper.store
+    configured = configured_models(config.whisper)
+
+    parser = argparse.ArgumentParser(description="Manage the local Whisper model store")
+    sub = parser.add_subparsers(dest="action", required=True)
+    sub.add_parser("list", help="Show configured and stored models")
+    prefetch = sub.add_parser("prefetch", help="Download models into the store")
+    prefetch.add_argument("models", nargs="*", help="Models to fetch (default: configured models)")
+    verify = sub.add_parser("verify", help="Check stored models against their manifests")
+    verify.add_argument("models", nargs="*", help="Models to verify (default: every stored model)")
+    prune = sub.add_parser("prune", help="Remove stored models the configuration does not use")
+    prune.add_argument("--keep", nargs="*", default=[], help="Extra models to keep")
+    prune.add_argument("--dry-run", action="store_true", help="Only list what would be removed")
+    args = parser.parse_args()
+
+    store = ModelStore(store_config.root)
+    print(f"Store: {store.root}")
+
+    if args.action == "list":
+        installed = store.installed()
+        for name in dict.fromkeys(configured + list(installed)):
+            size = f"{installed[name] / 1024 ** 2:.0f} MB" if name in installed else "missing"
+            used = "configured" if name in configured else "unused"
+            print(f"  {name:<40} {size:>10}  {used}")
+
+    elif args.action == "prefetch":
+        for name in args.models or configured:
+            if store.has(name):
+                print(f"  {name}: already stored")
+                continue
+            print(f"  {name}: downloading...")
+            print(f"  {name}: saved to {store.prefetch(name)}")
+
+    elif args.action == "verify":
+        failed = False
+        for name in args.models or list(store.installed()):
+            problems = store.verify(name)
+            print(f"  {name}: {'OK' if not problems else ', '.join(problems)}")
+            failed = failed or bool(problems)
+        if failed:
+            sys.exit(1)
+
+    elif args.action == "prune":
+        removed = store.prune(configured + args.keep, dry_run=args.dry_run)
+        verb = "Would remove" if args.dry_run else "Removed"
+        for name in removed:
+            print(f"  {verb}: {name}")
+        if not removed:
+            print("  Nothing to prune")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import threading
+import pytest
+from v2m.core.interfaces import SegmentSubscriber
+
+class FakeClipboard:
+    def __init__(self, paste_suffix=""):
+        self.content = ""
+        self.copies = []
+        # wl-paste sin -n añade un salto de línea a lo copiado
+        self.paste_suffix = paste_suffix
+
+    def copy(self, text):
+        self.content = text
+        self.copies.append(text)
+
+    def paste(self):
+        return self.content + self.paste_suffix
+
+@pytest.fixture
+def clipboard():
+    return FakeClipboard()
+
+@pytest.fixture
+def newline_clipboard():
+    return FakeClipboard(paste_suffix="\n")
+
+class SegmentRecorder(SegmentSubscriber):
+    def __init__(self):
+        self.partials = []
+        self.final = None
+        self.finals = []
+        self.error = None
+        self.resets = 0
+        self.done = threading.Event()
+
+    def on_segment(self, text):
+        self.partials.append(text)
+
+    def on_complete(self, text):
+        self.final = text
+        self.finals.append(text)
+        self.done.set()
+
+    def on_reset(self):
+        self.resets += 1
+        self.partials.clear()
+
+    def on_error(self, message):
+        self.error = message
+        self.done.set()
+
+@pytest.fixture
+def recorder():
+    return SegmentRecorder()
@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from v2m.infrastructure.audio.buffer import AudioBuffer, RingBuffer
+
+def test_buffer_write_and_view():
+    """Test that consecutive writes are returned as a single flat view."""
+    buffer = AudioBuffer(capacity=100)
+    buffer.write(np.ones((10, 1), dtype=np.float32))
+    buffer.write(np.full((5, 1), 2.0, dtype=np.float32))
+
+    audio = buffer.view()
+
+    assert audio.shape == (15,)
+    np.testing.assert_array_equal(audio[:10], 1.0)
+    np.testing.assert_array_equal(audio[10:], 2.0)
+
+def test_buffer_view_is_zero_copy():
+    """Test that the returned view shares memory with the preallocated buffer."""
+    buffer = AudioBuffer(capacity=100)
+    buffer.write(np.ones((10, 1), dtype=np.float32))
+
+    assert np.shares_memory(buffer.view(), buffer._data)
+
+def test_buffer_drops_samples_past_capacity():
+    """Test that writes beyond capacity are truncated instead of growing the buffer."""
+    buffer = AudioBuffer(capacity=8)
+
+    assert buffer.write(np.ones((5, 1), dtype=np.float32)) == 5
+    assert buffer.write(np.ones((5, 1), dtype=np.float32)) == 3
+    assert buffer.write(np.ones((5, 1), dtype=np.float32)) == 0
+    assert buffer.full
+    assert buffer.view().size == 8
+
+def test_buffer_interleaves_channels():
+    """Test that multichannel blocks are flattened frame by frame."""
+    buffer = AudioBuffer(capacity=4, channels=2)
+    buffer.write(np.array([[1, 2], [3, 4]], dtype=np.float32))
+
+    np.testing.assert_array_equal(buffer.view(), [1, 2, 3, 4])
+
+def test_buffer_rejects_invalid_capacity():
+    """Test that a non-positive capacity is rejected."""
+    with pytest.raises(ValueError):
+        AudioBuffer(capacity=0)
+
+def test_ring_buffer_keeps_latest_frames_in_order():
+    """Test that the ring buffer wraps around and returns frames chronologically."""
+    ring = RingBuffer(capacity=5)
+    ring.write(np.arange(3, dtype=np.float32).reshape(-1, 1))
+    ring.write(np.arange(3, 7, dtype=np.float32).reshape(-1, 1))
+
+    older, newer = ring.parts()
+
+    np.testing.assert_array_equal(np.concatenate([older, newer]).ravel(), [2, 3, 4, 5, 6])
+
+def test_ring_buffer_partial_fill():
+    """Test that a partially filled ring buffer returns only the written frames."""
+    ring = RingBuffer(capacity=5)
+    ring.write(np.array([[1.0], [2.0]], dtype=np.float32))
+
+    older, newer = ring.parts()
+
+    assert older.size == 0
+    np.testing.assert_array_equal(newer.ravel(), [1, 2])
+
+def test_ring_buffer_block_larger_than_capacity():
+    """Test that a block larger than the capacity keeps only its tail."""
+    ring = RingBuffer(capacity=3)
+    ring.write(np.arange(10, dtype=np.float32).reshape(-1, 1))
+
+    older, newer = ring.parts()
+
+    np.testing.assert_array_equal(np.concatenate([older, newer]).ravel(), [7, 8, 9])
+
+def test_preroll_copied_into_recording_buffer():
+    """Test that pre-roll parts can be appended to a recording buffer in order."""
+    ring = RingBuffer(capacity=4)
+    ring.write(np.arange(6, dtype=np.float32).reshape(-1, 1))
+    buffer = AudioBuffer(capacity=10)
+
+    for part in ring.parts():
+        buffer.write(part)
+    buffer.write(np.array([[9.0]], dtype=np.float32))
+
+    np.testing.assert_array_equal(buffer.view(), [2, 3, 4, 5, 9])
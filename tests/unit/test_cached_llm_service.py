@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import pytest
+from v2m.application.llm_service import LLMService
+from v2m.core.segment_stream import SegmentStream
+from v2m.infrastructure.cached_llm_service import CachedLLMService
+
+class FakeLLM(LLMService):
+    def __init__(self, identity="fake|model|0.3"):
+        self.identity = identity
+        self.calls = 0
+
+    async def process_text(self, text):
+        self.calls += 1
+        return text.upper()
+
+    def cache_identity(self):
+        return self.identity
+
+@pytest.fixture
+def inner():
+    return FakeLLM()
+
+def make_cache(inner, tmp_path, **kwargs):
+    return CachedLLMService(inner, tmp_path / "cache.sqlite3", **kwargs)
+
+def test_repeated_text_is_served_from_memory(inner, tmp_path):
+    """Test that the same text (modulo whitespace) reaches the LLM only once."""
+    cache = make_cache(inner, tmp_path)
+
+    assert asyncio.run(cache.process_text("hola  mundo")) == "HOLA  MUNDO"
+    assert asyncio.run(cache.process_text(" hola\nmundo ")) == "HOLA  MUNDO"
+
+    assert inner.calls == 1
+    assert cache.metrics()["cache"]["memory_hits"] == 1
+
+def test_entries_survive_restart(inner, tmp_path):
+    """Test that a new instance reads responses persisted by a previous one."""
+    asyncio.run(make_cache(inner, tmp_path).process_text("hola"))
+
+    restarted = make_cache(inner, tmp_path)
+    assert asyncio.run(restarted.process_text("hola")) == "HOLA"
+    assert inner.calls == 1
+    assert restarted.metrics()["cache"]["disk_hits"] == 1
+
+def test_identity_change_misses(inner, tmp_path):
+    """Test that a different prompt/model/temperature does not reuse old responses."""
+    cache = make_cache(inner, tmp_path)
+    asyncio.run(cache.process_text("hola"))
+
+    inner.identity = "fake|model|0.9"
+    asyncio.run(cache.process_text("hola"))
+    assert inner.calls == 2
+
+def test_ttl_expires_entries(inner, tmp_path):
+    """Test that expired entries are fetched again."""
+    cache = make_cache(inner, tmp_path, ttl_seconds=0)
+    asyncio.run(cache.process_text("hola"))
+    asyncio.run(cache.process_text("hola"))
+    assert inner.calls == 2
+
+def test_size_limits(inner, tmp_path):
+    """Test that memory and disk entries are bounded, evicting the least recently used."""
+    cache = make_cache(inner, tmp_path, memory_entries=1, max_entries=2)
+    for text in ("a", "b", "c"):
+        asyncio.run(cache.process_text(text))
+
+    metrics = cache.metrics()["cache"]
+    assert metrics["memory_entries"] == 1
+    assert metrics["disk_entries"] == 2
+    assert cache.lookup(cache.key("a")) is None
+    assert cache.lookup(cache.key("c")) == "C"
+
+def test_failures_are_not_cached(tmp_path):
+    """Test that an LLM error propagates and leaves no entry behind."""
+    class Failing(FakeLLM):
+        async def process_text(self, text):
+            self.calls += 1
+            raise RuntimeError("boom")
+
+    failing = Failing()
+    cache = make_cache(failing, tmp_path)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(cache.process_text("hola"))
+    assert failing.calls == 2
+
+def test_cache_hit_publishes_final_text(inner, tmp_path, recorder):
+    """Test that a cached response still reaches SUBSCRIBE clients as the final refined text."""
+    stream = SegmentStream()
+    stream.subscribe(recorder)
+    cache = make_cache(inner, tmp_path, partial_stream=stream)
+    asyncio.run(cache.process_text("hola"))
+
+    assert asyncio.run(cache.process_text("hola")) == "HOLA"
+    assert recorder.done.wait(2)
+    assert recorder.final == "HOLA"
+
+def test_disk_access_runs_off_the_event_loop(inner, tmp_path):
+    """Test that SQLite lookups and writes run in a worker thread, not on the loop thread."""
+    cache = make_cache(inner, tmp_path)
+    threads = []
+    for name in ("_lookup_disk", "_store_disk"):
+        method = getattr(cache, name)
+
+        def spy(*args, _method=method):
+            threads.append(threading.current_thread())
+            return _method(*args)
+        setattr(cache, name, spy)
+
+    asyncio.run(cache.process_text("hola"))
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
@@ -0,0 +1,80 @@
+import time
+import numpy as np
+import pytest
+from v2m.infrastructure.calibration import (
+    Calibrator,
+    candidate_settings,
+    load_calibration,
+    save_calibration,
+    synthetic_clip,
+)
+
+class FakeModel:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def transcribe(self, audio, **kwargs):
+        time.sleep(self.delay)
+        return iter([]), None
+
+def test_candidates_filtered_by_supported_types():
+    """Test that unsupported compute types are skipped and threads split per worker."""
+    candidates = candidate_settings("cpu", 8, supported={"int8", "float32"})
+
+    assert {c["compute_type"] for c in candidates} == {"int8", "float32"}
+    assert {"compute_type": "int8", "cpu_threads": 4, "num_workers": 2} in candidates
+    assert all(c["cpu_threads"] >= 1 for c in candidates)
+
+def test_calibration_cache_roundtrip(tmp_path):
+    """Test that results are stored per model and device without clobbering others."""
+    cache = tmp_path / "calibration.json"
+    save_calibration(cache, "base", "cpu", {"compute_type": "int8", "cpu_threads": 4, "num_workers": 1})
+    save_calibration(cache, "small", "cpu", {"compute_type": "float32", "cpu_threads": 8, "num_workers": 1})
+
+    assert load_calibration(cache, "base", "cpu")["compute_type"] == "int8"
+    assert load_calibration(cache, "small", "cpu")["compute_type"] == "float32"
+    assert load_calibration(cache, "base", "cuda") is None
+    assert load_calibration(tmp_path / "missing.json", "base", "cpu") is None
+
+def test_calibrator_picks_fastest_and_skips_failures():
+    """Test that the fastest loadable candidate wins."""
+    delays = {"slow": 0.03, "fast": 0.0}
+
+    def build_model(settings):
+        if settings["compute_type"] == "broken":
+            raise RuntimeError("unsupported")
+        return FakeModel(delays[settings["compute_type"]])
+
+    candidates = [
+        {"compute_type": "slow", "cpu_threads": 1, "num_workers": 1},
+        {"compute_type": "broken", "cpu_threads": 1, "num_workers": 1},
+        {"compute_type": "fast", "cpu_threads": 1, "num_workers": 1},
+    ]
+    best = Calibrator(build_model, repeats=1, concurrency=2).run(candidates, synthetic_clip(0.5))
+
+    assert best["compute_type"] == "fast"
+    assert "seconds" in best
+
+class FailingModel:
+    def transcribe(self, audio, **kwargs):
+        raise RuntimeError("CUDA out of memory")
+
+def test_calibrator_rejects_candidate_failing_at_decode():
+    """Test that a candidate whose decode raises in a worker thread cannot win."""
+    def build_model(settings):
+        return FailingModel() if settings["compute_type"] == "oom" else FakeModel(0.02)
+
+    candidates = [
+        {"compute_type": "oom", "cpu_threads": 1, "num_workers": 1},
+        {"compute_type": "ok", "cpu_threads": 1, "num_workers": 1},
+    ]
+    best = Calibrator(build_model, repeats=1, concurrency=2).run(candidates, synthetic_clip(0.5))
+
+    assert best["compute_type"] == "ok"
+
+def test_synthetic_clip_shape():
+    """Test the reference clip length, dtype and range."""
+    clip = synthetic_clip(1.0, 16000)
+    assert clip.dtype == np.float32
+    assert clip.shape == (16000,)
+    assert np.abs(clip).max() < 1.0
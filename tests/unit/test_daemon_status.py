@@ -0,0 +1,50 @@
+import asyncio
+import importlib
+import sys
+import threading
+import types
+from unittest.mock import MagicMock
+import pytest
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def daemon_module(monkeypatch):
+    # a stand-in container so importing the daemon does not build the real one
+    fake = types.ModuleType("v2m.core.di.container")
+    fake.container = types.SimpleNamespace(ready=threading.Event(), get_command_bus=MagicMock())
+    monkeypatch.setitem(sys.modules, "v2m.core.di.container", fake)
+    monkeypatch.delitem(sys.modules, "v2m.daemon", raising=False)
+    module = importlib.import_module("v2m.daemon")
+    yield module, fake.container
+    sys.modules.pop("v2m.daemon", None)
+
+def _status(daemon):
+    async def request():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"STATUS")
+        reader.feed_eof()
+        writer = FakeWriter()
+        await daemon.handle_client(reader, writer)
+        return writer.data.decode()
+    return asyncio.run(request())
+
+def test_status_reports_warming_up_then_ready(daemon_module):
+    """Test that STATUS answers WARMING_UP until the readiness event is set, then READY."""
+    module, container = daemon_module
+    daemon = module.Daemon()
+
+    assert _status(daemon) == "WARMING_UP"
+    container.ready.set()
+    assert _status(daemon) == "READY"
@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+from v2m.infrastructure.audio.endpointer import SilenceEndpointer
+
+BLOCK = 160  # 10 ms a 16 kHz
+
+def _speech(n_blocks):
+    return [np.full((BLOCK, 1), 0.1, dtype=np.float32)] * n_blocks
+
+def _silence(n_blocks):
+    return [np.zeros((BLOCK, 1), dtype=np.float32)] * n_blocks
+
+@pytest.fixture
+def endpointer():
+    return SilenceEndpointer(sample_rate=16000, silence_ms=100, min_speech_ms=50, energy_threshold=0.01)
+
+def _feed(endpointer, blocks):
+    return [endpointer.process(b) for b in blocks]
+
+def test_endpoint_fires_after_trailing_silence(endpointer):
+    """Test that speech followed by enough silence fires exactly once."""
+    results = _feed(endpointer, _speech(10) + _silence(15))
+
+    assert results.count(True) == 1
+    # 10 bloques de voz + 10 bloques de silencio (100 ms)
+    assert results.index(True) == 19
+
+def test_endpoint_ignores_leading_silence(endpointer):
+    """Test that silence before any speech never fires."""
+    assert not any(_feed(endpointer, _silence(100)))
+    assert not endpointer.speech_detected
+
+def test_endpoint_ignores_short_clicks(endpointer):
+    """Test that bursts shorter than min_speech_ms do not arm the detector."""
+    assert not any(_feed(endpointer, _speech(2) + _silence(20)))
+
+def test_endpoint_reset(endpointer):
+    """Test that reset allows the detector to fire again on a new recording."""
+    _feed(endpointer, _speech(10) + _silence(15))
+    endpointer.reset()
+
+    assert _feed(endpointer, _speech(10) + _silence(15)).count(True) == 1
@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+from v2m.infrastructure.energy_gate import EnergyGate
+from v2m.infrastructure.vad_service import VADService
+
+SR = 16000
+
+def _noise(seconds, level=1e-4, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * SR)) * level).astype(np.float32)
+
+def _tone(seconds, level=0.1):
+    t = np.arange(int(seconds * SR)) / SR
+    return (level * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+@pytest.fixture
+def gate():
+    return EnergyGate(sample_rate=SR, pad_ms=0)
+
+def test_gate_rejects_silence(gate):
+    """Test that a recording with only background noise is rejected."""
+    view, offset = gate.apply(_noise(2.0))
+
+    assert view.size == 0
+    assert gate.noise_floor is not None
+
+def test_gate_trims_leading_and_trailing_silence(gate):
+    """Test that silence around the active region is trimmed as a zero-copy view."""
+    audio = np.concatenate([_noise(1.0), _tone(0.5), _noise(1.0, seed=1)])
+
+    view, offset = gate.apply(audio)
+
+    assert np.shares_memory(view, audio)
+    assert offset == pytest.approx(SR, abs=gate.frame_samples)
+    assert view.size == pytest.approx(SR // 2, abs=2 * gate.frame_samples)
+
+def test_gate_keeps_speech_only_recordings(gate):
+    """Test that a recording made only of speech is not mistaken for noise."""
+    audio = _tone(1.0)
+
+    view, offset = gate.apply(audio)
+
+    assert offset == 0
+    assert view.size == audio.size
+
+def test_vad_skips_model_when_gate_rejects():
+    """Test that the neural VAD is never loaded for a silent recording."""
+    vad_service = VADService(backend="onnx", energy_gate=EnergyGate(sample_rate=SR))
+    vad_service.load_model = MagicMock()
+
+    segments = vad_service.segments(_noise(2.0))
+
+    assert not segments
+    vad_service.load_model.assert_not_called()
+
+def test_vad_offsets_timestamps_after_trim():
+    """Test that timestamps computed on the trimmed view map back to the original buffer."""
+    vad_service = VADService(backend="onnx", parameters={"speech_pad_ms": 0}, energy_gate=EnergyGate(sample_rate=SR, pad_ms=0))
+    vad_service.load_model = MagicMock()
+    vad_service.model = MagicMock()
+    vad_service.get_speech_timestamps = MagicMock(return_value=[{'start': 0, 'end': 100}])
+    audio = np.concatenate([_noise(1.0), _tone(0.5), _noise(1.0, seed=1)])
+
+    segments = vad_service.segments(audio)
+
+    start, end = segments.bounds[0]
+    assert start == pytest.approx(SR, abs=320)
+    assert end - start == 100
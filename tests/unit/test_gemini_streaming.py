@@ -0,0 +1,190 @@
+import asyncio
+import functools
+import pytest
+from tenacity import stop_after_attempt, wait_none
+from v2m.core.segment_stream import SegmentStream
+from v2m.domain.errors import LLMError
+from v2m.infrastructure.gemini_llm_service import GeminiLLMService
+from v2m.infrastructure.llm_latency import LLMLatencyStats
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+class FakeModels:
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+
+    async def generate_content_stream(self, **kwargs):
+        async def stream():
+            for chunk in self.chunks:
+                await asyncio.sleep(self.delay)
+                yield Chunk(chunk)
+        return stream()
+
+class FakeClient:
+    def __init__(self, models):
+        self.aio = type("Aio", (), {"models": models})()
+
+def make_service(models, partial_stream=None):
+    # bypass __init__ so no API key or network client is needed
+    service = GeminiLLMService.__new__(GeminiLLMService)
+    service.client = FakeClient(models)
+    service.model = "fake"
+    service.temperature = 0.0
+    service.max_tokens = 64
+    service.system_instruction = ""
+    service.stream = True
+    service.max_input_chars = 6000
+    service.request_timeout = 30
+    service.max_concurrent_chunks = 4
+    service.partial_stream = partial_stream
+    service.latency = LLMLatencyStats()
+    return service
+
+def test_streaming_accumulates_and_publishes_partials(recorder):
+    """Test that chunks are joined, pushed to subscribers and the final text is completed."""
+    stream = SegmentStream()
+    stream.subscribe(recorder)
+    service = make_service(FakeModels(["Hola ", None, "mundo", "\n"], delay=0.01), stream)
+
+    result = asyncio.run(service.process_text("hola mundo"))
+
+    assert result == "Hola mundo"
+    assert recorder.done.wait(2)
+    assert recorder.partials == ["Hola ", "mundo", "\n"]
+    assert recorder.final == "Hola mundo"
+
+def test_first_token_and_total_latency_recorded_separately():
+    """Test that time-to-first-token is lower than the total and both are reported."""
+    service = make_service(FakeModels(["a", "b", "c"], delay=0.02))
+
+    asyncio.run(service.process_text("abc"))
+    metrics = service.metrics()
+
+    assert metrics["requests"] == 1
+    first, total = metrics["first_token_seconds"]["last"], metrics["total_seconds"]["last"]
+    assert 0 < first < total
+
+def test_empty_stream_is_an_error():
+    """Test that a stream without text raises LLMError and counts as a failure."""
+    service = make_service(FakeModels([None, ""]))
+
+    with pytest.raises(LLMError):
+        # a single attempt keeps the test from waiting on the retry backoff
+        single_attempt = GeminiLLMService._refine.retry_with(stop=stop_after_attempt(1), reraise=True)
+        asyncio.run(single_attempt(service, "x"))
+    assert service.latency.failures == 1
+
+class EchoModels:
+    """Streams back the request text upper-cased, tracking request concurrency."""
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def generate_content_stream(self, contents, **kwargs):
+        text = contents[0].parts[0].text
+
+        async def stream():
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            # longer chunks take longer so completion order differs from input order
+            await asyncio.sleep(self.delay * len(text) / 10)
+            self.active -= 1
+            yield Chunk(text.upper())
+        return stream()
+
+def test_long_input_is_refined_in_parallel_chunks_in_order(recorder):
+    """Test that oversized input is split, refined concurrently within the limit and reassembled in order."""
+    stream = SegmentStream()
+    stream.subscribe(recorder)
+    models = EchoModels()
+    service = make_service(models, stream)
+    service.max_input_chars = 32
+    service.max_concurrent_chunks = 2
+    text = "Primer párrafo largo de prueba.\n\nDos. Tres frases cortas aquí. Y una más para cerrar."
+
+    result = asyncio.run(service.process_text(text))
+
+    assert result == text.upper()
+    assert models.peak == 2
+    assert recorder.done.wait(2)
+    assert "".join(recorder.partials).strip() == text.upper()
+    assert service.metrics()["requests"] == 3
+
+class FlakyModels:
+    """Fails mid-stream for the first `failures` requests, then streams normally."""
+    def __init__(self, chunks, failures):
+        self.chunks = chunks
+        self.failures = failures
+
+    async def generate_content_stream(self, **kwargs):
+        fail = self.failures > 0
+        self.failures -= 1
+
+        async def stream():
+            yield Chunk(self.chunks[0])
+            if fail:
+                raise ConnectionError("stream cut")
+            for chunk in self.chunks[1:]:
+                yield Chunk(chunk)
+        return stream()
+
+def _fast_retries(service, attempts):
+    retrying = GeminiLLMService._refine.retry_with(stop=stop_after_attempt(attempts), wait=wait_none())
+    service._refine = functools.partial(retrying, service)
+
+def test_retry_resets_partials_of_failed_attempt(recorder):
+    """Test that a retried stream resets subscribers so deltas of the failed attempt are not kept."""
+    stream = SegmentStream()
+    stream.subscribe(recorder)
+    service = make_service(FlakyModels(["Hola ", "mundo"], failures=1), stream)
+    _fast_retries(service, 2)
+
+    assert asyncio.run(service.process_text("hola mundo")) == "Hola mundo"
+    assert recorder.done.wait(2)
+    assert recorder.resets == 1
+    assert recorder.partials == ["Hola ", "mundo"]
+    assert recorder.final == "Hola mundo"
+
+def test_final_failure_emits_terminal_error(recorder):
+    """Test that subscribers get an error event when every attempt fails."""
+    stream = SegmentStream()
+    stream.subscribe(recorder)
+    service = make_service(FlakyModels(["Hola "], failures=5), stream)
+    _fast_retries(service, 2)
+
+    with pytest.raises(Exception):
+        asyncio.run(service.process_text("hola mundo"))
+    assert recorder.done.wait(2)
+    assert recorder.error
+    assert recorder.final is None
+    assert recorder.partials == []
+
+class EmptyThenModels:
+    """Streams an empty response for the first request and real text afterwards."""
+    def __init__(self):
+        self.requests = 0
+
+    async def generate_content_stream(self, **kwargs):
+        self.requests += 1
+        chunks = ["  "] if self.requests == 1 else ["Hola"]
+
+        async def stream():
+            for chunk in chunks:
+                yield Chunk(chunk)
+        return stream()
+
+def test_empty_attempt_publishes_no_final_result(recorder):
+    """Test that an empty response that is retried does not publish a spurious final text."""
+    stream = SegmentStream()
+    stream.subscribe(recorder)
+    service = make_service(EmptyThenModels(), stream)
+    _fast_retries(service, 2)
+
+    assert asyncio.run(service.process_text("hola")) == "Hola"
+    assert recorder.done.wait(2)
+    assert recorder.finals == ["Hola"]
+    assert recorder.partials == ["Hola"]
@@ -0,0 +1,47 @@
+import pytest
+from types import SimpleNamespace
+from v2m.infrastructure.language_prior import LanguagePrior
+
+@pytest.fixture
+def prior():
+    return LanguagePrior(history=4, min_probability=0.8, min_avg_logprob=-1.0)
+
+def test_no_prior_without_history(prior):
+    """Test that detection is required until something has been detected."""
+    assert prior.likely() is None
+
+def test_confident_detection_becomes_prior(prior):
+    """Test that a high-confidence detection is proposed for the next call."""
+    prior.record("es", 0.95, 0.2)
+    assert prior.likely() == "es"
+
+def test_mixed_history_falls_back_to_detection(prior):
+    """Test that an ambiguous recent history does not produce a prior."""
+    prior.record("es", 0.9, 0.2)
+    prior.record("en", 0.9, 0.2)
+    assert prior.likely() is None
+
+def test_low_confidence_is_not_used(prior):
+    """Test that low-probability detections never short-circuit detection."""
+    prior.record("es", 0.6, 0.2)
+    assert prior.likely() is None
+
+def test_cheap_check_uses_avg_logprob(prior):
+    """Test the first-segment plausibility check."""
+    assert prior.accepts(SimpleNamespace(avg_logprob=-0.3))
+    assert not prior.accepts(SimpleNamespace(avg_logprob=-1.7))
+
+def test_reject_clears_history_and_metrics(prior):
+    """Test that a rejected prior forces detection and is counted in metrics."""
+    prior.record("es", 0.95, 0.5)
+    prior.hit()
+    prior.hit()
+    prior.reject("es")
+
+    assert prior.likely() is None
+    metrics = prior.metrics()
+    assert metrics["hits"] == 2
+    assert metrics["detections"] == 1
+    assert metrics["rejections"] == 1
+    assert metrics["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+    assert metrics["saved_seconds"] == pytest.approx(1.0)
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from v2m.core.segment_stream import SegmentStream
+from v2m.domain.errors import LLMError
+from v2m.infrastructure.local_llm_service import LocalLLMService
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /v1/chat/completions that upper-cases the user message."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        self.server.clients.add(self.client_address)
+        if self.path != "/v1/chat/completions":
+            self.send_error(404)
+            return
+        answer = "" if self.server.empty else body["messages"][-1]["content"].upper()
+
+        if body.get("stream"):
+            events = [{"choices": [{"delta": {"role": "assistant"}}]}]
+            events += [{"choices": [{"delta": {"content": word + " "}}]} for word in answer.split()]
+            payload = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+            content_type = "text/event-stream"
+        else:
+            payload = json.dumps({"choices": [{"message": {"role": "assistant", "content": answer}}]})
+            content_type = "application/json"
+
+        data = payload.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.requests = []
+    httpd.clients = set()
+    httpd.empty = False
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def make_service(server, **kwargs):
+    return LocalLLMService(f"http://127.0.0.1:{server.server_address[1]}/v1", model="stub", **kwargs)
+
+def run(service, *texts):
+    async def go():
+        try:
+            return [await service.process_text(text) for text in texts]
+        finally:
+            await service.aclose()
+    return asyncio.run(go())
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_refines_through_chat_completions(server, stream):
+    """Test streamed and non-streamed responses against a local stub server."""
+    service = make_service(server, stream=stream)
+
+    assert run(service, "hola mundo") == ["HOLA MUNDO"]
+
+    request = server.requests[0]
+    assert request["model"] == "stub"
+    assert request["stream"] is stream
+    assert request["messages"][0]["role"] == "system"
+    assert (service.metrics()["first_token_seconds"]["last"] > 0) is stream
+
+def test_connection_is_reused(server):
+    """Test that consecutive requests share a keep-alive connection."""
+    service = make_service(server)
+
+    assert run(service, "uno", "dos", "tres") == ["UNO", "DOS", "TRES"]
+    assert len(server.requests) == 3
+    assert len(server.clients) == 1
+
+def test_long_input_is_chunked(server):
+    """Test that oversized input is split into several requests and reassembled."""
+    service = make_service(server, max_input_chars=20, max_concurrent_chunks=2)
+
+    assert run(service, "Primera frase aquí. Segunda frase aquí.") == ["PRIMERA FRASE AQUÍ. SEGUNDA FRASE AQUÍ."]
+    assert len(server.requests) == 2
+
+def test_empty_response_raises(server):
+    """Test that an empty completion surfaces as LLMError."""
+    server.empty = True
+    service = make_service(server)
+
+    with pytest.raises(LLMError):
+        run(service, "hola")
+    assert service.metrics()["failures"] == 1
+
+def test_empty_response_publishes_error_not_final(server, recorder):
+    """Test that an empty completion ends the stream with an error and no empty final text."""
+    server.empty = True
+    stream = SegmentStream()
+    stream.subscribe(recorder)
+    service = make_service(server, partial_stream=stream)
+
+    with pytest.raises(LLMError):
+        run(service, "hola")
+    assert recorder.done.wait(2)
+    assert recorder.finals == []
+    assert recorder.error
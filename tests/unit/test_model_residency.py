@@ -0,0 +1,94 @@
+import time
+import pytest
+import threading
+from v2m.infrastructure.model_residency import ModelResidencyManager, warm_up_in_background
+
+class FakeModel:
+    def __init__(self):
+        self.instance = None
+
+    def load(self):
+        self.instance = object()
+
+    def unload(self):
+        self.instance = None
+
+    def is_loaded(self):
+        return self.instance is not None
+
+@pytest.fixture
+def fake_model():
+    return FakeModel()
+
+def _register(manager, model, name="whisper"):
+    manager.register(name, load=model.load, unload=model.unload, is_loaded=model.is_loaded)
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+def test_prefetch_loads_in_background(fake_model):
+    """Test that prefetch loads pending models and records load metrics."""
+    manager = ModelResidencyManager()
+    _register(manager, fake_model)
+
+    manager.prefetch()
+
+    assert _wait_for(fake_model.is_loaded)
+    assert _wait_for(lambda: manager.metrics()["models"]["whisper"]["loads"] == 1)
+
+def test_idle_ttl_unloads_models(fake_model):
+    """Test that models are unloaded once the idle TTL elapses."""
+    fake_model.load()
+    manager = ModelResidencyManager(idle_ttl_seconds=0.05)
+    _register(manager, fake_model)
+
+    manager.touch()
+
+    assert _wait_for(lambda: not fake_model.is_loaded())
+    assert manager.metrics()["models"]["whisper"]["unloads"] == 1
+
+def test_active_section_prevents_unload(fake_model):
+    """Test that models stay resident while in use."""
+    fake_model.load()
+    manager = ModelResidencyManager(idle_ttl_seconds=0.05)
+    _register(manager, fake_model)
+
+    with manager.active():
+        time.sleep(0.15)
+        assert fake_model.is_loaded()
+
+    assert _wait_for(lambda: not fake_model.is_loaded())
+
+def test_zero_ttl_never_unloads(fake_model):
+    """Test that a zero TTL keeps models resident indefinitely."""
+    fake_model.load()
+    manager = ModelResidencyManager(idle_ttl_seconds=0)
+    _register(manager, fake_model)
+
+    manager.touch()
+    time.sleep(0.05)
+
+    assert fake_model.is_loaded()
+    assert manager.metrics()["models"]["whisper"]["unloads"] == 0
+
+def test_warm_up_sets_ready_when_done():
+    """Test that the readiness event is set only after the warm-up finishes."""
+    release = threading.Event()
+    ready = warm_up_in_background(lambda: release.wait(2))
+
+    assert not ready.wait(0.05)
+    release.set()
+    assert ready.wait(2)
+
+def test_failed_warm_up_still_sets_ready():
+    """Test that a warm-up error does not leave the daemon reporting WARMING_UP forever."""
+    def warm_up():
+        raise RuntimeError("cuda init failed")
+
+    assert warm_up_in_background(warm_up).wait(2)
+    assert warm_up_in_background(None).wait(2)
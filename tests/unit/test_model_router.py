@@ -0,0 +1,41 @@
+import pytest
+from v2m.infrastructure.model_router import ModelRouter, ModelTier
+
+@pytest.fixture
+def router():
+    return ModelRouter(
+        [ModelTier("base", 5.0), ModelTier("small", 15.0)],
+        default_model="large-v3-turbo",
+    )
+
+@pytest.mark.parametrize("speech_seconds, expected", [
+    (0.8, "base"),
+    (5.0, "base"),
+    (9.0, "small"),
+    (60.0, "large-v3-turbo"),
+])
+def test_select_by_speech_duration(router, speech_seconds, expected):
+    """Test that the first tier whose limit covers the speech duration wins."""
+    model, reason = router.select(speech_seconds)
+    assert model == expected
+    assert f"{speech_seconds:.2f}s" in reason
+
+def test_busy_downgrades_one_tier(router):
+    """Test that concurrent load moves the request one tier down."""
+    model, reason = router.select(60.0, in_flight=1)
+    assert model == "small"
+    assert "en curso" in reason
+
+    assert router.select(2.0, in_flight=3)[0] == "base"
+
+def test_busy_downgrade_disabled():
+    """Test that the load signal is ignored when busy_downgrade is off."""
+    router = ModelRouter([ModelTier("base", 5.0)], "large-v3-turbo", busy_downgrade=False)
+    assert router.select(60.0, in_flight=2)[0] == "large-v3-turbo"
+
+def test_default_model_is_always_last_tier():
+    """Test that a tier naming the default model is folded into the catch-all tier."""
+    router = ModelRouter([ModelTier("large-v3-turbo", 5.0), ModelTier("base", 2.0)], "large-v3-turbo")
+    assert [t.model for t in router.tiers] == ["base", "large-v3-turbo"]
+    assert router.default_model == "large-v3-turbo"
+    assert router.select(10.0)[0] == "large-v3-turbo"
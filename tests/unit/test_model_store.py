@@ -0,0 +1,58 @@
+import pytest
+import faster_whisper.utils
+from v2m.domain.errors import TranscriptionError
+from v2m.infrastructure.model_store import ModelStore
+
+def fake_download(size_or_id, output_dir, **kwargs):
+    for name, content in (("model.bin", b"weights"), ("config.json", b"{}"), ("tokenizer.json", b"{}")):
+        with open(f"{output_dir}/{name}", "wb") as f:
+            f.write(content)
+    return output_dir
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(faster_whisper.utils, "download_model", fake_download)
+    return ModelStore(tmp_path / "models")
+
+def test_resolve_fetches_once_then_stays_local(store, monkeypatch):
+    """Test that a missing model is fetched into the store and later loads skip the download."""
+    path = store.resolve("Systran/faster-whisper-base")
+
+    assert path == str(store.path_for("Systran/faster-whisper-base"))
+    assert store.has("Systran/faster-whisper-base")
+
+    monkeypatch.setattr(faster_whisper.utils, "download_model", lambda *a, **k: pytest.fail("downloaded again"))
+    assert store.resolve("Systran/faster-whisper-base") == path
+
+def test_offline_store_refuses_to_download(store):
+    """Test that an offline store raises instead of reaching the hub for missing models."""
+    store.offline = True
+    with pytest.raises(TranscriptionError):
+        store.resolve("base")
+
+def test_resolve_passes_local_directories_through(store, tmp_path):
+    """Test that a configured path is used as-is."""
+    assert store.resolve(str(tmp_path)) == str(tmp_path)
+
+def test_verify_detects_corruption(store):
+    """Test that checksum verification reports modified and missing files."""
+    path = store.prefetch("base")
+    assert store.verify("base") == []
+
+    (path / "model.bin").write_bytes(b"truncated")
+    (path / "config.json").unlink()
+
+    problems = store.verify("base")
+    assert "model.bin checksum distinto" in problems
+    assert "config.json falta" in problems
+
+def test_prune_keeps_configured_models(store):
+    """Test that prune removes only models outside the keep list."""
+    store.prefetch("base")
+    store.prefetch("small")
+
+    assert store.prune(["base"], dry_run=True) == ["small"]
+    assert store.has("small")
+
+    assert store.prune(["base"]) == ["small"]
+    assert set(store.installed()) == {"base"}
@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import MagicMock
+from v2m.application.commands import ProcessTextCommand
+from v2m.application.command_handlers import ProcessTextHandler
+from v2m.application.llm_service import LLMService
+
+class SlowLLM(LLMService):
+    def __init__(self, delay, result="Hola mundo.", error=None):
+        self.delay = delay
+        self.result = result
+        self.error = error
+        self.cancelled = False
+
+    async def process_text(self, text):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+def _run(handler, during_late=None):
+    async def scenario():
+        await handler.handle(ProcessTextCommand("hola mundo"))
+        if during_late is not None:
+            during_late()
+        await asyncio.gather(*handler._late_tasks)
+        await asyncio.sleep(0.1)
+    asyncio.run(scenario())
+
+def test_fast_result_within_deadline(clipboard):
+    """Test that a refinement inside the budget is copied directly."""
+    handler = ProcessTextHandler(SlowLLM(0.01), MagicMock(), clipboard, deadline_seconds=1.0)
+    _run(handler)
+    assert clipboard.copies == ["Hola mundo."]
+
+def test_deadline_copies_raw_then_replaces_late(clipboard):
+    """Test that the raw text is copied at the deadline and the late result replaces it."""
+    handler = ProcessTextHandler(SlowLLM(0.2), MagicMock(), clipboard, deadline_seconds=0.05, late_replace=True)
+    _run(handler)
+    assert clipboard.copies == ["hola mundo", "Hola mundo."]
+
+def test_late_result_replaces_raw_when_paste_adds_newline(newline_clipboard):
+    """Test that a trailing newline from the paste backend does not block the late replacement."""
+    handler = ProcessTextHandler(SlowLLM(0.2), MagicMock(), newline_clipboard, deadline_seconds=0.05, late_replace=True)
+    _run(handler)
+    assert newline_clipboard.copies == ["hola mundo", "Hola mundo."]
+
+def test_late_result_does_not_overwrite_changed_clipboard(clipboard):
+    """Test that the late result is dropped when the user copied something else."""
+    handler = ProcessTextHandler(SlowLLM(0.2), MagicMock(), clipboard, deadline_seconds=0.05, late_replace=True)
+    _run(handler, during_late=lambda: clipboard.copy("otra cosa"))
+    assert clipboard.content == "otra cosa"
+    assert "Hola mundo." not in clipboard.copies
+
+def test_deadline_without_late_replace_cancels(clipboard):
+    """Test that without late replacement the pending refinement is cancelled."""
+    llm = SlowLLM(0.2)
+    handler = ProcessTextHandler(llm, MagicMock(), clipboard, deadline_seconds=0.05)
+    _run(handler)
+    assert clipboard.copies == ["hola mundo"]
+    assert llm.cancelled
+
+def test_failure_falls_back_to_raw(clipboard):
+    """Test that an LLM error before the deadline copies the raw text."""
+    handler = ProcessTextHandler(SlowLLM(0.01, error=RuntimeError("boom")), MagicMock(), clipboard, deadline_seconds=1.0)
+    _run(handler)
+    assert clipboard.copies == ["hola mundo"]
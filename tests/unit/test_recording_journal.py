@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+from v2m.infrastructure.audio.journal import RecordingJournal
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "recording.journal"
+
+def test_journal_view_is_memmap(journal_path):
+    """Test that the journal returns a zero-copy memmap view of the written audio."""
+    journal = RecordingJournal(journal_path, capacity=1000, sample_rate=16000)
+    journal.write(np.full((100, 1), 0.5, dtype=np.float32))
+
+    audio = journal.view()
+
+    assert isinstance(audio, np.memmap)
+    assert audio.size == 100
+    np.testing.assert_array_equal(audio, 0.5)
+
+def test_journal_recover_after_crash(journal_path):
+    """Test that a journal left behind can be recovered with the frames written so far."""
+    journal = RecordingJournal(journal_path, capacity=1000, sample_rate=16000)
+    journal.write(np.arange(10, dtype=np.float32).reshape(-1, 1))
+    journal.write(np.arange(10, 15, dtype=np.float32).reshape(-1, 1))
+    del journal  # simula la caída del daemon sin limpieza
+
+    recovered = RecordingJournal.recover(journal_path)
+
+    np.testing.assert_array_equal(recovered, np.arange(15, dtype=np.float32))
+
+def test_journal_recover_missing_or_empty(journal_path):
+    """Test that missing or empty journals are not offered for recovery."""
+    assert RecordingJournal.recover(journal_path) is None
+
+    RecordingJournal(journal_path, capacity=1000, sample_rate=16000)
+    assert RecordingJournal.recover(journal_path) is None
+
+def test_journal_recreate_keeps_previous_view_valid(journal_path):
+    """Test that starting a new journal does not invalidate the previous recording's view."""
+    first = RecordingJournal(journal_path, capacity=1000, sample_rate=16000)
+    first.write(np.ones((10, 1), dtype=np.float32))
+    previous = first.view()
+
+    second = RecordingJournal(journal_path, capacity=1000, sample_rate=16000)
+    second.write(np.zeros((10, 1), dtype=np.float32))
+
+    np.testing.assert_array_equal(previous, 1.0)
+
+def test_journal_discard(journal_path):
+    """Test that discarding removes the journal file."""
+    journal = RecordingJournal(journal_path, capacity=1000, sample_rate=16000)
+    journal.write(np.ones((10, 1), dtype=np.float32))
+
+    RecordingJournal.discard(journal_path)
+
+    assert not journal_path.exists()
+    assert RecordingJournal.recover(journal_path) is None
+
+def test_journal_expands_home(tmp_path, monkeypatch):
+    """Test that a journal path under ~ is created and recovered in the home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    path = "~/.local/state/v2m/recording.journal"
+    journal = RecordingJournal(path, capacity=100, sample_rate=16000)
+    journal.write(np.full((10, 1), 0.25, dtype=np.float32))
+
+    assert journal.path == tmp_path / ".local" / "state" / "v2m" / "recording.journal"
+    assert RecordingJournal.recover(path).size == 10
+    RecordingJournal.discard(path)
+    assert not journal.path.exists()
@@ -0,0 +1,56 @@
+import numpy as np
+from v2m.infrastructure.retained_audio import RetainedRecordings
+
+SR = 16000
+
+def test_trims_to_speech_and_shifts_timestamps():
+    """Test that leading/trailing silence is dropped and timestamps stay aligned with the audio."""
+    retained = RetainedRecordings(sample_rate=SR, pad_seconds=0.5)
+    audio = np.arange(10 * SR, dtype=np.float32)
+
+    entry = retained.add(audio, [2.0, 3.0, 5.0, 6.0])
+
+    assert entry.audio.size == 5 * SR
+    assert entry.clip_timestamps == [0.5, 1.5, 3.5, 4.5]
+    assert entry.audio[int(0.5 * SR)] == audio[2 * SR]
+
+def test_most_recent_first_and_capacity_bound():
+    """Test that index 0 is the latest recording and old ones are evicted."""
+    retained = RetainedRecordings(capacity=2, sample_rate=SR)
+    first = retained.add(np.zeros(SR, dtype=np.float32))
+    second = retained.add(np.zeros(SR, dtype=np.float32))
+    third = retained.add(np.zeros(SR, dtype=np.float32))
+
+    assert retained.get(0) is third
+    assert retained.get(1) is second
+    assert retained.get(2) is None
+    assert first not in (retained.get(0), retained.get(1))
+
+def test_total_seconds_bound_keeps_latest():
+    """Test that the seconds budget evicts older recordings but never the newest one."""
+    retained = RetainedRecordings(capacity=5, max_seconds=3.0, sample_rate=SR)
+    first = retained.add(np.zeros(2 * SR, dtype=np.float32))
+    second = retained.add(np.zeros(2 * SR, dtype=np.float32))
+
+    assert len(retained) == 1
+    assert retained.get(0) is second
+    assert first is not second
+
+def test_recording_over_budget_is_not_retained():
+    """Test that a recording longer than max_seconds on its own is skipped instead of copied."""
+    retained = RetainedRecordings(capacity=5, max_seconds=3.0, sample_rate=SR)
+    kept = retained.add(np.zeros(2 * SR, dtype=np.float32))
+
+    assert retained.add(np.zeros(10 * SR, dtype=np.float32)) is None
+    assert len(retained) == 1
+    assert retained.get(0) is kept
+
+def test_copies_the_buffer():
+    """Test that the retained audio does not alias the caller's buffer."""
+    retained = RetainedRecordings(sample_rate=SR)
+    audio = np.ones(SR, dtype=np.float32)
+    entry = retained.add(audio, None, analyzed=False)
+    audio[:] = 0
+
+    assert entry.audio.sum() == SR
+    assert entry.analyzed is False
@@ -0,0 +1,73 @@
+import threading
+import pytest
+from v2m.core.interfaces import SegmentSubscriber
+from v2m.core.segment_stream import SegmentStream
+from v2m.application.segment_sinks import ClipboardSegmentSink
+
+class RecordingSubscriber(SegmentSubscriber):
+    def __init__(self):
+        self.events = []
+        self.done = threading.Event()
+
+    def on_segment(self, text):
+        self.events.append(("segment", text))
+
+    def on_complete(self, text):
+        self.events.append(("complete", text))
+        self.done.set()
+
+class FailingSubscriber(SegmentSubscriber):
+    def on_segment(self, text):
+        raise RuntimeError("boom")
+
+@pytest.fixture
+def stream():
+    return SegmentStream()
+
+def test_segments_delivered_in_order(stream):
+    """Test that segments and the final text reach subscribers in order."""
+    subscriber = RecordingSubscriber()
+    stream.subscribe(subscriber)
+
+    stream.publish("hola")
+    stream.publish("mundo")
+    stream.complete("hola mundo")
+
+    assert subscriber.done.wait(2)
+    assert subscriber.events == [("segment", "hola"), ("segment", "mundo"), ("complete", "hola mundo")]
+
+def test_failing_subscriber_does_not_break_others(stream):
+    """Test that an exception in one subscriber does not stop delivery to others."""
+    subscriber = RecordingSubscriber()
+    stream.subscribe(FailingSubscriber())
+    stream.subscribe(subscriber)
+
+    stream.publish("hola")
+    stream.complete("hola")
+
+    assert subscriber.done.wait(2)
+    assert subscriber.events[0] == ("segment", "hola")
+
+def test_unsubscribed_receives_nothing(stream):
+    """Test that publishing without subscribers is a no-op."""
+    subscriber = RecordingSubscriber()
+    stream.subscribe(subscriber)
+    stream.unsubscribe(subscriber)
+
+    stream.publish("hola")
+
+    assert not stream.has_subscribers
+    assert subscriber.events == []
+
+def test_clipboard_sink_copies_accumulated_text():
+    """Test that the clipboard sink copies the text decoded so far."""
+    copies = []
+    clipboard = type("Clipboard", (), {"copy": lambda self, text: copies.append(text)})()
+    sink = ClipboardSegmentSink(clipboard)
+
+    sink.on_segment("hola")
+    sink.on_segment("mundo")
+    sink.on_complete("hola mundo")
+    sink.on_segment("otra")
+
+    assert copies == ["hola", "hola mundo", "otra"]
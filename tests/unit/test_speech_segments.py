@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+from v2m.infrastructure.speech_segments import SpeechSegments, coalesce_clip_timestamps
+
+def test_segments_padding_is_clipped_to_audio():
+    """Test that padding never extends past the audio boundaries."""
+    segments = SpeechSegments.from_timestamps([10, 500], [100, 990], length=1000, pad_samples=50)
+
+    np.testing.assert_array_equal(segments.bounds, [[0, 150], [450, 1000]])
+    assert segments.bounds.dtype == np.int32
+
+def test_segments_merge_short_gaps():
+    """Test that segments separated by gaps up to merge_gap are merged."""
+    segments = SpeechSegments.from_timestamps(
+        [0, 120, 500], [100, 200, 600], length=1000, merge_gap_samples=20
+    )
+
+    np.testing.assert_array_equal(segments.bounds, [[0, 200], [500, 600]])
+
+def test_segments_merge_overlapping_padding():
+    """Test that padded segments that overlap collapse into one."""
+    segments = SpeechSegments.from_timestamps([100, 150], [140, 300], length=1000, pad_samples=20)
+
+    np.testing.assert_array_equal(segments.bounds, [[80, 320]])
+
+def test_segments_views_share_memory():
+    """Test that segment views are zero-copy slices of the original buffer."""
+    audio = np.arange(1000, dtype=np.float32)
+    segments = SpeechSegments.from_timestamps([10, 500], [20, 510], length=audio.size)
+
+    views = list(segments.views(audio))
+
+    assert all(np.shares_memory(v, audio) for v in views)
+    np.testing.assert_array_equal(views[1], audio[500:510])
+
+def test_segments_materialize_and_clip_timestamps():
+    """Test materialised copies and conversion to faster-whisper clip timestamps."""
+    audio = np.arange(32000, dtype=np.float32)
+    segments = SpeechSegments.from_timestamps([0, 16000], [8000, 24000], length=audio.size, sample_rate=16000)
+
+    materialized = segments.materialize(audio)
+
+    np.testing.assert_array_equal(materialized, np.concatenate([audio[:8000], audio[16000:24000]]))
+    assert segments.duration == 1.0
+    assert segments.to_clip_timestamps() == [0.0, 0.5, 1.0, 1.5]
+
+def test_segments_empty():
+    """Test the empty index."""
+    segments = SpeechSegments.from_timestamps([], [], length=1000)
+
+    assert not segments
+    assert segments.materialize(np.zeros(1000, dtype=np.float32)).size == 0
+
+def test_coalesce_many_short_intervals_into_windows():
+    """Test that 60 one-second intervals over 120 s become ceil(120/30) clips, not 60."""
+    clips = []
+    for i in range(60):
+        clips += [i * 2.0, i * 2.0 + 1.0]
+
+    merged = coalesce_clip_timestamps(clips, 30)
+
+    assert len(merged) // 2 == 4
+    assert merged[0] == 0.0 and merged[-1] == clips[-1]
+    assert all(end - start <= 30 for start, end in zip(merged[0::2], merged[1::2]))
+
+def test_coalesce_keeps_long_interval_alone():
+    """Test that an interval longer than the window is not merged with its neighbours."""
+    assert coalesce_clip_timestamps([0.0, 1.0, 2.0, 40.0, 41.0, 42.0], 30) == [0.0, 1.0, 2.0, 40.0, 41.0, 42.0]
+    assert coalesce_clip_timestamps([], 30) == []
+
+def test_coalesce_does_not_bridge_long_silence():
+    """Test that intervals separated by a long pause stay in separate clips even if they fit one window."""
+    assert coalesce_clip_timestamps([0.0, 1.0, 26.0, 27.0], 30) == [0.0, 1.0, 26.0, 27.0]
+    assert coalesce_clip_timestamps([0.0, 1.0, 2.5, 3.0], 30, max_gap_seconds=2.0) == [0.0, 3.0]
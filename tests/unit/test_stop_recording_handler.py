@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import MagicMock
+from v2m.application.commands import StopRecordingCommand
+from v2m.application.command_handlers import StopRecordingHandler
+
+def _run(handler):
+    async def scenario():
+        await handler.handle(StopRecordingCommand())
+        # background tasks may spawn the LLM hand-off
+        while handler._refine_tasks:
+            await asyncio.gather(*list(handler._refine_tasks))
+    asyncio.run(scenario())
+
+def _handler(clipboard, draft, refine, dispatch=None, scheduler=None):
+    service = MagicMock()
+    service.stop_recording.return_value = lambda: (draft, refine)
+    return StopRecordingHandler(service, MagicMock(), clipboard, scheduler=scheduler, dispatch=dispatch)
+
+class FakeBus:
+    def __init__(self, clipboard):
+        self.clipboard = clipboard
+        self.sent = []
+
+    async def dispatch(self, command):
+        # record what the clipboard held when the LLM was asked to refine
+        self.sent.append((command.text, self.clipboard.content))
+        self.clipboard.copy(command.text.upper())
+
+def test_single_pass_copies_final_text(clipboard):
+    """Test that without a refinement pass the text is copied once."""
+    _run(_handler(clipboard, "hola mundo", None))
+    assert clipboard.copies == ["hola mundo"]
+
+def test_draft_is_replaced_by_refined_text(clipboard):
+    """Test that the refined transcription replaces an untouched draft."""
+    _run(_handler(clipboard, "ola mundo", lambda: "hola mundo"))
+    assert clipboard.copies == ["ola mundo", "hola mundo"]
+
+def test_draft_is_replaced_when_paste_adds_newline(newline_clipboard):
+    """Test that a trailing newline from the paste backend does not block the replacement."""
+    _run(_handler(newline_clipboard, "ola mundo", lambda: "hola mundo"))
+    assert newline_clipboard.copies == ["ola mundo", "hola mundo"]
+
+def test_changed_clipboard_is_not_overwritten(clipboard):
+    """Test that the refined text is dropped when the clipboard changed meanwhile."""
+    def refine():
+        clipboard.content = "otra cosa"
+        return "hola mundo"
+
+    _run(_handler(clipboard, "ola mundo", refine))
+    assert clipboard.content == "otra cosa"
+    assert clipboard.copies == ["ola mundo"]
+
+def test_failed_refinement_keeps_draft(clipboard):
+    """Test that an error in the refinement pass leaves the draft in place."""
+    def refine():
+        raise RuntimeError("gpu perdida")
+
+    _run(_handler(clipboard, "ola mundo", refine))
+    assert clipboard.copies == ["ola mundo"]
+
+def test_llm_hand_off_happens_after_raw_copy(clipboard):
+    """Test that the LLM is dispatched only after the raw text is copied, so its result is not overwritten."""
+    bus = FakeBus(clipboard)
+    _run(_handler(clipboard, "hola mundo", None, dispatch=bus.dispatch))
+
+    assert bus.sent == [("hola mundo", "hola mundo")]
+    assert clipboard.content == "HOLA MUNDO"
+
+def test_llm_hand_off_uses_refined_transcription(clipboard):
+    """Test that with a draft the LLM receives the final transcription after it replaced the draft."""
+    bus = FakeBus(clipboard)
+    _run(_handler(clipboard, "ola mundo", lambda: "hola mundo", dispatch=bus.dispatch))
+
+    assert bus.sent == [("hola mundo", "hola mundo")]
+    assert clipboard.copies == ["ola mundo", "hola mundo", "HOLA MUNDO"]
+
+class BusyScheduler:
+    def __init__(self):
+        self.service = None
+        self.stopped_when_queued = []
+
+    async def submit(self, fn, *args, priority=None, bounded=True):
+        # the microphone must already be stopped when the job waits for a worker
+        self.stopped_when_queued.append(self.service.stop_recording.called)
+        return fn(*args)
+
+def test_recorder_stops_before_decode_is_queued(clipboard):
+    """Test that the microphone is stopped before the decode job is submitted to the scheduler."""
+    scheduler = BusyScheduler()
+    handler = _handler(clipboard, "hola mundo", None, scheduler=scheduler)
+    scheduler.service = handler.transcription_service
+    _run(handler)
+
+    assert scheduler.stopped_when_queued == [True]
+    assert clipboard.copies == ["hola mundo"]
@@ -0,0 +1,126 @@
+import threading
+import numpy as np
+from v2m.infrastructure.streaming_transcriber import StreamingTranscriber
+
+class Segment:
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+
+class FakeRecorder:
+    sample_rate = 10
+    channels = 1
+
+    def __init__(self, audio):
+        self.audio = audio
+        self.current_samples = 0
+
+    def peek(self, start=0, end=None):
+        return self.audio[start:end]
+
+def test_window_commits_all_but_last_segment():
+    """Test that a window keeps its last segment uncommitted and re-decodes it with the next window."""
+    recorder = FakeRecorder(np.arange(100, dtype=np.float32))
+    calls = []
+
+    def transcribe(window, prompt):
+        calls.append((window[0], window.size, prompt))
+        return [Segment(0.0, 0.4, " uno "), Segment(0.4, 1.0, "dos")]
+
+    streamer = StreamingTranscriber(recorder, transcribe, window_seconds=1.0, base_prompt="base")
+    streamer._consume(recorder.peek(0, 10), final=False)
+
+    assert streamer._texts == ["uno"]
+    assert streamer._committed == 4
+    assert calls == [(0.0, 10, "base")]
+    assert streamer._prompt() == "base uno"
+
+def test_single_segment_window_is_committed_whole():
+    """Test that a window with at most one segment commits the full window."""
+    recorder = FakeRecorder(np.zeros(100, dtype=np.float32))
+    streamer = StreamingTranscriber(recorder, lambda w, p: [Segment(0.0, 0.3, "hola")], window_seconds=1.0)
+
+    streamer._consume(recorder.peek(0, 10), final=False)
+    streamer._consume(recorder.peek(10, 20), final=False)
+
+    assert streamer._texts == ["hola", "hola"]
+    assert streamer._committed == 20
+
+def test_background_windows_then_finish_decodes_only_tail():
+    """Test that finish() decodes only the audio after the committed windows."""
+    audio = np.arange(25, dtype=np.float32)
+    recorder = FakeRecorder(audio)
+    windows = []
+    decoded_window = threading.Event()
+
+    def transcribe(window, prompt):
+        windows.append((int(window[0]), window.size))
+        if len(windows) == 2:
+            decoded_window.set()
+        return [Segment(0.0, window.size / 10, f"w{len(windows)}")]
+
+    streamer = StreamingTranscriber(recorder, transcribe, window_seconds=1.0, poll_interval=0.01)
+    streamer.start()
+    recorder.current_samples = 25
+    assert decoded_window.wait(2)
+
+    text = streamer.finish(audio)
+
+    assert windows == [(0, 10), (10, 10), (20, 5)]
+    assert text == "w1 w2 w3"
+    assert streamer.windows == 2
+
+def test_cancel_joins_thread_and_discards_text():
+    """Test that cancel() waits for an in-flight window and drops decoded text."""
+    recorder = FakeRecorder(np.zeros(100, dtype=np.float32))
+    started = threading.Event()
+    release = threading.Event()
+
+    def transcribe(window, prompt):
+        started.set()
+        release.wait(2)
+        return [Segment(0.0, 1.0, "hola")]
+
+    streamer = StreamingTranscriber(recorder, transcribe, window_seconds=1.0, poll_interval=0.01)
+    streamer.start()
+    recorder.current_samples = 10
+    assert started.wait(2)
+    thread = streamer._thread
+
+    threading.Timer(0.05, release.set).start()
+    streamer.cancel()
+
+    assert not thread.is_alive()
+    assert streamer._thread is None
+    assert streamer._texts == []
+
+def test_only_committed_segments_are_published():
+    """Test that the uncommitted last segment of a window is not published until it is re-decoded."""
+    recorder = FakeRecorder(np.arange(100, dtype=np.float32))
+    published = []
+    results = iter([
+        [Segment(0.0, 0.4, "uno"), Segment(0.4, 1.0, "do")],
+        [Segment(0.0, 0.6, "dos")],
+    ])
+
+    def transcribe(window, prompt):
+        return next(results)
+
+    streamer = StreamingTranscriber(recorder, transcribe, on_segment=published.append, window_seconds=1.0)
+    streamer._consume(recorder.peek(0, 10), final=False)
+    assert published == ["uno"]
+
+    streamer._consume(recorder.peek(4, 10), final=True)
+    assert published == ["uno", "dos"]
+
+def test_utterance_shorter_than_a_window_counts_no_windows():
+    """Test that an utterance decoded only at finish reports no recording-time windows."""
+    audio = np.zeros(5, dtype=np.float32)
+    recorder = FakeRecorder(audio)
+    streamer = StreamingTranscriber(recorder, lambda w, p: [Segment(0.0, 0.5, "hola")], window_seconds=1.0, poll_interval=0.01)
+    streamer.start()
+    recorder.current_samples = 5
+
+    assert streamer.finish(audio) == "hola"
+    assert streamer.windows == 0
@@ -0,0 +1,29 @@
+from v2m.infrastructure.text_chunking import join_chunks, split_text
+
+def test_short_text_is_a_single_chunk():
+    """Test that text under the limit is left untouched."""
+    assert split_text("  hola mundo  ", 100) == [("hola mundo", "")]
+
+def test_splits_on_paragraphs_then_sentences():
+    """Test that chunks respect the limit and break at paragraph or sentence boundaries."""
+    text = "Uno dos tres. Cuatro cinco seis.\n\nSiete ocho nueve. Diez once doce."
+    chunks = split_text(text, 20)
+
+    assert [c for c, _ in chunks] == ["Uno dos tres.", "Cuatro cinco seis.", "Siete ocho nueve.", "Diez once doce."]
+    assert [s for _, s in chunks] == [" ", "\n\n", " ", ""]
+    assert join_chunks(chunks) == text
+
+def test_packs_small_pieces_together():
+    """Test that consecutive sentences share a chunk while they fit."""
+    chunks = split_text("A b. C d. E f. G h.", 10)
+
+    assert [c for c, _ in chunks] == ["A b. C d.", "E f. G h."]
+    assert all(len(c) <= 10 for c, _ in chunks)
+
+def test_long_sentence_falls_back_to_words():
+    """Test that a sentence longer than the limit is cut between words."""
+    text = " ".join(["palabra"] * 20)
+    chunks = split_text(text, 30)
+
+    assert all(len(c) <= 30 for c, _ in chunks)
+    assert join_chunks(chunks) == text
@@ -0,0 +1,37 @@
+import pytest
+import os
+from v2m.infrastructure.thread_budget import ThreadBudget, available_cpus
+
+def test_budget_assigns_remaining_cores_to_whisper():
+    """Test that whisper gets the cores left after vad and numpy."""
+    budget = ThreadBudget(total=8, vad=1, numpy=1)
+
+    assert budget.whisper == 6
+    assert budget.whisper_cpu_threads == 6
+
+def test_budget_splits_whisper_threads_between_workers():
+    """Test that CTranslate2 cpu_threads is divided among num_workers replicas."""
+    budget = ThreadBudget(total=8, vad=1, numpy=1, num_workers=2)
+
+    assert budget.whisper_cpu_threads == 3
+
+def test_budget_never_goes_below_one_thread():
+    """Test that tiny machines still get at least one thread per stage."""
+    budget = ThreadBudget(total=1, vad=1, numpy=1, num_workers=4)
+
+    assert budget.whisper == 1
+    assert budget.whisper_cpu_threads == 1
+
+def test_budget_explicit_whisper_threads():
+    """Test that an explicit whisper budget overrides the remainder."""
+    budget = ThreadBudget(total=16, whisper=4)
+
+    assert budget.whisper == 4
+
+def test_default_total_follows_cpu_affinity(monkeypatch):
+    """Test that the default budget uses the affinity mask instead of the machine core count."""
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1}, raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 64)
+
+    assert available_cpus() <= 2
+    assert ThreadBudget().total == available_cpus()
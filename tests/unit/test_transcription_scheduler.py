@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import pytest
+from v2m.application.transcription_scheduler import Priority, TranscriptionScheduler
+from v2m.domain.errors import TranscriptionQueueFullError
+
+def test_submit_returns_result():
+    """Test that an awaited job returns the function result."""
+    scheduler = TranscriptionScheduler(workers=1)
+    assert asyncio.run(scheduler.submit(lambda a, b: a + b, 2, 3)) == 5
+
+def test_exceptions_propagate():
+    """Test that a failing job re-raises in the caller."""
+    scheduler = TranscriptionScheduler(workers=1)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        scheduler.submit_nowait(fail).result(timeout=2)
+
+def test_interactive_jumps_ahead_of_background():
+    """Test that queued interactive work runs before earlier background work."""
+    scheduler = TranscriptionScheduler(workers=1)
+    gate = threading.Event()
+    order = []
+
+    blocker = scheduler.submit_nowait(gate.wait, priority=Priority.BACKGROUND)
+    background = scheduler.submit_nowait(lambda: order.append("background"), priority=Priority.BACKGROUND)
+    interactive = scheduler.submit_nowait(lambda: order.append("interactive"))
+    gate.set()
+
+    for future in (blocker, background, interactive):
+        future.result(timeout=2)
+    assert order == ["interactive", "background"]
+
+def test_reserved_worker_serves_interactive_while_background_runs():
+    """Test that a long background job does not delay dictation with a reserved worker."""
+    scheduler = TranscriptionScheduler(workers=2, reserve_interactive=True)
+    gate = threading.Event()
+
+    background = scheduler.submit_nowait(gate.wait, priority=Priority.BACKGROUND)
+    assert scheduler.submit_nowait(lambda: "dictado").result(timeout=2) == "dictado"
+
+    gate.set()
+    background.result(timeout=2)
+    metrics = scheduler.metrics()
+    assert metrics["wait"]["interactive"]["jobs"] == 1
+    assert metrics["wait"]["background"]["jobs"] == 1
+
+def test_bounded_queue_rejects_overflow():
+    """Test that submissions beyond max_queue are rejected."""
+    scheduler = TranscriptionScheduler(workers=1, max_queue=1)
+    gate = threading.Event()
+
+    running = scheduler.submit_nowait(gate.wait)
+    # wait for the first job to leave the queue
+    for _ in range(100):
+        if scheduler.depth == 0:
+            break
+        threading.Event().wait(0.01)
+    queued = scheduler.submit_nowait(lambda: None)
+
+    with pytest.raises(TranscriptionQueueFullError):
+        scheduler.submit_nowait(lambda: None)
+    # the interactive stop must still release the microphone
+    stop = scheduler.submit_nowait(lambda: "stopped", bounded=False)
+
+    gate.set()
+    running.result(timeout=2)
+    queued.result(timeout=2)
+    assert stop.result(timeout=2) == "stopped"
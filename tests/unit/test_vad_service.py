@@ -48,3 +48,68 @@ def test_vad_process_with_speech(vad_service):
     # Verify content
     expected = np.concatenate([audio[1000:2000], audio[3000:4000]])
     np.testing.assert_array_equal(result, expected)
+
+def test_vad_rejects_unknown_backend():
+    """Test that an unknown backend name is rejected at construction."""
+    with pytest.raises(ValueError):
+        VADService(backend="tensorflow")
+
+def test_vad_onnx_backend_detects_no_speech_in_silence():
+    """Test the ONNX backend end to end on silence without importing torch."""
+    pytest.importorskip("faster_whisper")
+    vad_service = VADService(backend="onnx")
+
+    result = vad_service.process(np.zeros(16000, dtype=np.float32))
+
+    assert vad_service.model is not None
+    assert result.size == 0
+
+def test_vad_speech_timestamps_uses_configured_parameters():
+    """Test that timestamps are computed once with the configured parameters."""
+    vad_service = VADService(backend="onnx", parameters={"threshold": 0.3, "min_silence_duration_ms": 100, "speech_pad_ms": 0})
+    vad_service.model = MagicMock()
+    vad_service.get_speech_timestamps = MagicMock(return_value=[{'start': 10.0, 'end': 20.0}])
+
+    timestamps = vad_service.speech_timestamps(np.zeros(100, dtype=np.float32))
+
+    assert timestamps == [{'start': 10, 'end': 20}]
+    _, kwargs = vad_service.get_speech_timestamps.call_args
+    assert kwargs["threshold"] == 0.3
+    assert kwargs["min_silence_duration_ms"] == 100
+
+def test_vad_speech_timestamps_unavailable_returns_none():
+    """Test that a disabled VAD reports None so callers use the full audio."""
+    vad_service = VADService(backend="onnx")
+    vad_service.disabled = True
+
+    assert vad_service.speech_timestamps(np.zeros(100, dtype=np.float32)) is None
+
+def test_vad_onnx_backend_applies_thread_budget():
+    """Test that num_threads reaches the onnxruntime session of the ONNX backend."""
+    pytest.importorskip("faster_whisper")
+    from faster_whisper.vad import get_vad_model
+    get_vad_model.cache_clear()
+    vad_service = VADService(backend="onnx", num_threads=2)
+
+    vad_service.load_model()
+
+    assert vad_service.model.session.get_session_options().intra_op_num_threads == 2
+    # the process-wide session used by faster-whisper keeps its own settings
+    assert get_vad_model() is not vad_service.model
+    assert get_vad_model().session.get_session_options().intra_op_num_threads == 1
+    vad_service.unload_model()
+
+def test_vad_onnx_timestamps_use_the_service_model():
+    """Test that ONNX inference runs on the service's own model, not the shared cached one."""
+    pytest.importorskip("faster_whisper")
+    from faster_whisper.vad import get_vad_model
+    vad_service = VADService(backend="onnx", num_threads=2)
+    vad_service.load_model()
+    calls = []
+    model = vad_service.model
+    vad_service.model = lambda audio: calls.append(audio.size) or model(audio)
+
+    vad_service.segments(np.zeros(16000, dtype=np.float32), gate=False)
+
+    assert calls
+    assert get_vad_model() is not model
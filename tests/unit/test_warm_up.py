@@ -0,0 +1,53 @@
+import threading
+import types
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+
+try:
+    from v2m.infrastructure.whisper_transcription_service import WhisperTranscriptionService
+except OSError:
+    # sounddevice needs the PortAudio system library
+    pytest.skip("PortAudio is not available", allow_module_level=True)
+
+class FakeWhisperModel:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio.size, kwargs))
+        return iter([]), None
+
+def make_service(vad_service=None):
+    # bypass __init__ so no recorder or model is created
+    service = WhisperTranscriptionService.__new__(WhisperTranscriptionService)
+    service.recorder = types.SimpleNamespace(sample_rate=16000)
+    service.vad_service = vad_service
+    service.residency = None
+    service._model = FakeWhisperModel()
+    service._model_lock = threading.Lock()
+    service._in_flight = 0
+    service._in_flight_lock = threading.Lock()
+    return service
+
+def test_warm_up_runs_vad_and_two_decoder_passes():
+    """Test that warm-up exercises the VAD and decodes the clip twice without vad_filter."""
+    vad_service = MagicMock()
+    service = make_service(vad_service)
+
+    service.warm_up()
+
+    assert vad_service.segments.call_count == 2
+    assert vad_service.segments.call_args.kwargs == {"gate": False}
+    assert len(service._model.calls) == 2
+    assert all(kwargs["vad_filter"] is False for _, kwargs in service._model.calls)
+    assert service._in_flight == 0
+
+def test_warm_up_pass_returns_duration():
+    """Test that a single warm-up pass reports its wall time."""
+    service = make_service()
+
+    seconds = service._warm_up_pass(np.zeros(16000, dtype=np.float32))
+
+    assert seconds >= 0
+    assert service._model.calls[0][0] == 16000